@@ -0,0 +1,150 @@
+import zlib
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional; gzip is always available
+    brotli = None
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, honouring q-values."""
+    offered: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[token] = q
+
+    def quality(name: str) -> float:
+        return offered.get(name, offered.get("*", 0.0))
+
+    candidates: List[Tuple[float, str]] = []
+    if brotli is not None and quality("br") > 0:
+        candidates.append((quality("br"), "br"))
+    if quality("gzip") > 0:
+        candidates.append((quality("gzip"), "gzip"))
+    if not candidates:
+        return None
+    # Highest q wins; on ties prefer brotli (listed first, max keeps the first maximum)
+    return max(candidates, key=lambda c: c[0])[1]
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression for responses at or above ``minimum_size`` bytes.
+
+    Streaming responses are compressed chunk by chunk with a flush after each
+    chunk, so clients still receive data incrementally. Responses that already
+    carry a Content-Encoding, and bodiless statuses, pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Validators the client holds, so a 304 repeats the ETag form it was sent with the 200
+        held_etags = {tag.strip() for tag in request_headers.get("if-none-match", "").split(",")}
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                if message["status"] == 304:
+                    mutable = MutableHeaders(raw=message["headers"])
+                    mutable.add_vary_header("Accept-Encoding")
+                    etag = mutable.get("ETag")
+                    if etag and not etag.startswith("W/") and f"W/{etag}" in held_etags:
+                        mutable["ETag"] = f"W/{etag}"
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = Headers(raw=start_message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or start_message["status"] in (204, 304)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                payload = compressor.compress(body, final=not more_body)
+                mutable = MutableHeaders(raw=start_message["headers"])
+                mutable["Content-Encoding"] = encoding
+                mutable.add_vary_header("Accept-Encoding")
+                # The encoded bytes differ from the identity representation, so a strong
+                # validator would be wrong here; If-None-Match still matches weakly.
+                etag = mutable.get("ETag")
+                if etag and not etag.startswith("W/"):
+                    mutable["ETag"] = f"W/{etag}"
+                if more_body:
+                    del mutable["Content-Length"]
+                else:
+                    mutable["Content-Length"] = str(len(payload))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": payload, "more_body": more_body})
+                return
+
+            payload = compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -7,12 +7,95 @@ from pydantic import BaseSettings, Field
 
 class Settings(BaseSettings):
     database_url: str = Field("sqlite:///backend/bible_notes.db", env="DATABASE_URL")
+    # SQLite connection PRAGMA profile: "serve", "bulk-load" or "readonly"
+    sqlite_pragma_profile: str = Field("serve", env="SQLITE_PRAGMA_PROFILE")
+    # Per-PRAGMA overrides on top of the profile, e.g. "cache_size=-131072,mmap_size=0"
+    sqlite_pragmas: Optional[str] = Field(None, env="SQLITE_PRAGMAS")
+    # Pool of read-only connections used by GET endpoints
+    read_pool_size: int = Field(10, env="READ_POOL_SIZE")
+    read_pool_max_overflow: int = Field(20, env="READ_POOL_MAX_OVERFLOW")
+    # Connection pool for server databases such as PostgreSQL (SQLite uses the read pool above)
+    db_pool_size: int = Field(10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: int = Field(30, env="DB_POOL_TIMEOUT")
+    # Seconds before a pooled connection is recycled, so server-side idle timeouts never bite
+    db_pool_recycle: int = Field(1800, env="DB_POOL_RECYCLE")
+    # Serve chapter, notes-by-chapter, backlinks and concordance reads from async handlers
+    async_reads: bool = Field(False, env="ASYNC_READS")
+    # Concordance scans allowed to run at once on the async path; further searches wait
+    # without holding a connection or thread
+    async_search_concurrency: int = Field(4, env="ASYNC_SEARCH_CONCURRENCY")
+    # Debug mode adds X-DB-Queries / X-DB-Time headers to every response
+    debug: bool = Field(False, env="DEBUG")
+    # Requests slower than this are logged with their SQL statements; unset to disable
+    slow_request_ms: Optional[int] = Field(1000, env="SLOW_REQUEST_MS")
+    slow_request_max_statements: int = Field(50, env="SLOW_REQUEST_MAX_STATEMENTS")
+    # Per-request profiling: "?__profile=1" with this value in X-Profile-Token returns the
+    # request's folded stacks instead of its response; unset disables it
+    profile_token: Optional[str] = Field(None, env="PROFILE_TOKEN")
+    # Fraction of requests profiled in the background, written to PROFILE_DIR (0 disables)
+    profile_sample_rate: float = Field(0.0, env="PROFILE_SAMPLE_RATE")
+    profile_dir: Path = Field(Path("profiles"), env="PROFILE_DIR")
+    profile_interval_ms: float = Field(1.0, env="PROFILE_INTERVAL_MS")
+    # Serve Prometheus text-format metrics at GET /metrics
+    metrics_enabled: bool = Field(True, env="METRICS_ENABLED")
+    # Seconds between refreshes of the (comparatively expensive) search index size gauges
+    metrics_index_size_ttl: int = Field(300, env="METRICS_INDEX_SIZE_TTL")
     jwt_secret: str = Field("change_me", env="JWT_SECRET")
     jwt_algorithm: str = Field("HS256", env="JWT_ALGORITHM")
     access_token_expire_minutes: int = Field(120, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    # Verified bearer tokens cached with a user snapshot, so repeat requests skip JWT
+    # decoding and the user lookup; entries expire after TOKEN_CACHE_TTL seconds
+    token_cache_size: int = Field(10000, env="TOKEN_CACHE_SIZE")
+    token_cache_ttl: int = Field(60, env="TOKEN_CACHE_TTL")
+    # bcrypt cost factor for new hashes; users hashed at another cost are rehashed on login
+    bcrypt_rounds: int = Field(12, env="BCRYPT_ROUNDS")
+    # Processes dedicated to bcrypt, and how many more hash/verify calls may wait for
+    # them before signup/login answer 429
+    password_hash_workers: int = Field(2, env="PASSWORD_HASH_WORKERS")
+    password_hash_queue_size: int = Field(16, env="PASSWORD_HASH_QUEUE_SIZE")
     bible_assets_path: Path = Field(Path("bibles"), env="BIBLE_ASSETS_PATH")
     manuscript_assets_path: Path = Field(Path("manuscripts"), env="MANUSCRIPT_ASSETS_PATH")
+    # Token-bucket limits (0 disables): note create/update per user, signup/login per client IP
     rate_limit_notes_per_minute: Optional[int] = Field(10, env="RATE_LIMIT_NOTES_PER_MINUTE")
+    rate_limit_auth_per_minute: Optional[int] = Field(20, env="RATE_LIMIT_AUTH_PER_MINUTE")
+    # "memory" keeps buckets per process; "sqlite" shares them between workers through a local file
+    rate_limit_backend: str = Field("memory", env="RATE_LIMIT_BACKEND")
+    rate_limit_sqlite_path: Path = Field(Path("backend/rate_limits.db"), env="RATE_LIMIT_SQLITE_PATH")
+    rate_limit_max_keys: int = Field(100000, env="RATE_LIMIT_MAX_KEYS")
+    # Bump when Bible/manuscript assets are re-seeded so cached responses are revalidated
+    content_version: str = Field("1", env="CONTENT_VERSION")
+    static_cache_max_age: int = Field(86400, env="STATIC_CACHE_MAX_AGE")
+    # Number of seeded chapters kept in memory for chapter and passage reads
+    chapter_cache_size: int = Field(512, env="CHAPTER_CACHE_SIZE")
+    # Rendered note HTML kept per distinct Markdown source
+    render_cache_size: int = Field(1024, env="RENDER_CACHE_SIZE")
+    # Background jobs (job table): worker threads per process (0 runs none; jobs wait for a
+    # process that has some), seconds between polls when idle, attempts before a job fails,
+    # base retry delay in seconds (doubling per attempt), and seconds without a heartbeat
+    # after which a running job is presumed lost with its process and requeued
+    job_workers: int = Field(2, env="JOB_WORKERS")
+    job_poll_interval: float = Field(1.0, env="JOB_POLL_INTERVAL")
+    job_max_attempts: int = Field(3, env="JOB_MAX_ATTEMPTS")
+    job_retry_delay: float = Field(5.0, env="JOB_RETRY_DELAY")
+    job_lease_seconds: int = Field(300, env="JOB_LEASE_SECONDS")
+    # Commit note writes with placeholder HTML and render Markdown / resolve cross references
+    # in a background job, so POST/PUT /notes return before that work is done
+    defer_note_processing: bool = Field(False, env="DEFER_NOTE_PROCESSING")
+    # Bulk note import: uploads larger than NOTE_IMPORT_MAX_BYTES are refused, lines are
+    # committed NOTE_IMPORT_CHUNK_SIZE at a time, Markdown is rendered in
+    # NOTE_IMPORT_RENDER_WORKERS processes (0 renders in the job's thread) and once
+    # NOTE_IMPORT_QUEUE_SIZE imports are queued or running POST answers 429
+    note_import_max_bytes: int = Field(64 * 1024 * 1024, env="NOTE_IMPORT_MAX_BYTES")
+    note_import_chunk_size: int = Field(1000, env="NOTE_IMPORT_CHUNK_SIZE")
+    note_import_render_workers: int = Field(2, env="NOTE_IMPORT_RENDER_WORKERS")
+    note_import_queue_size: int = Field(8, env="NOTE_IMPORT_QUEUE_SIZE")
+    # Notes read per query while streaming an export
+    note_export_page_size: int = Field(500, env="NOTE_EXPORT_PAGE_SIZE")
+    # Responses smaller than this are sent uncompressed
+    compression_minimum_size: int = Field(1024, env="COMPRESSION_MINIMUM_SIZE")
+    gzip_level: int = Field(6, env="GZIP_LEVEL")
+    brotli_quality: int = Field(4, env="BROTLI_QUALITY")
 
     class Config:
         env_file = ".env"
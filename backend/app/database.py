@@ -1,16 +1,221 @@
-from contextlib import contextmanager
-from typing import Iterator
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .config import get_settings
+from .utils.author_index import has_author_index, rebuild_author_index
+from .utils.fulltext import install_search_indexes
 
 settings = get_settings()
-engine = create_engine(settings.database_url, echo=False, connect_args={"check_same_thread": False})
 
+# Per-connection PRAGMA sets applied on connect. "serve" favours concurrent readers
+# alongside a single writer, "bulk-load" trades durability for import speed and
+# "readonly" refuses writes outright.
+SQLITE_PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    "serve": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -65536,  # KiB when negative: 64 MiB
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "busy_timeout": 30000,
+        "cache_size": -262144,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    "readonly": {
+        "query_only": "ON",
+        "busy_timeout": 5000,
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
 
-def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+
+# Engine -> (profile name, PRAGMAs applied on connect)
+_engine_pragmas: "weakref.WeakKeyDictionary[Engine, Tuple[str, Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+
+
+def parse_pragma_overrides(raw: Optional[str]) -> Dict[str, str]:
+    """Parse "name=value,name=value" overrides from settings."""
+    overrides: Dict[str, str] = {}
+    for item in (raw or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip():
+            overrides[name.strip().lower()] = value.strip()
+    return overrides
+
+
+def sqlite_pragmas(profile: str) -> Dict[str, Any]:
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(f"Unknown SQLite pragma profile '{profile}'. Choose from: {', '.join(SQLITE_PRAGMA_PROFILES)}")
+    pragmas = dict(SQLITE_PRAGMA_PROFILES[profile])
+    pragmas.update(parse_pragma_overrides(settings.sqlite_pragmas))
+    return pragmas
+
+
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def install_sqlite_pragmas(engine: Engine, profile: str) -> None:
+    """Run the profile's PRAGMAs on every new DBAPI connection of ``engine``."""
+    pragmas = sqlite_pragmas(profile)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    _engine_pragmas[engine] = (profile, pragmas)
+
+
+def engine_pragma_config(db_engine: Engine) -> Tuple[Optional[str], Dict[str, Any]]:
+    return _engine_pragmas.get(db_engine, (None, {}))
+
+
+def create_db_engine(url: str, profile: Optional[str] = None, **kwargs: Any) -> Engine:
+    """Create an engine for ``url``.
+
+    SQLite engines get the pragma profile installed; server databases such as
+    PostgreSQL get a pre-pinged, recycled connection pool sized from settings.
+    """
+    if is_sqlite_url(url):
+        connect_args = kwargs.pop("connect_args", {})
+        connect_args.setdefault("check_same_thread", False)
+        db_engine = create_engine(url, echo=False, connect_args=connect_args, **kwargs)
+        install_sqlite_pragmas(db_engine, profile or settings.sqlite_pragma_profile)
+        return db_engine
+    kwargs.setdefault("pool_size", settings.db_pool_size)
+    kwargs.setdefault("max_overflow", settings.db_max_overflow)
+    kwargs.setdefault("pool_timeout", settings.db_pool_timeout)
+    kwargs.setdefault("pool_recycle", settings.db_pool_recycle)
+    kwargs.setdefault("pool_pre_ping", True)
+    return create_engine(url, echo=False, **kwargs)
+
+
+def seed_engine(db_path: Optional[Path] = None) -> Engine:
+    """Engine for seed scripts: ``db_path`` when given (SQLite), else the configured ``DATABASE_URL``."""
+    url = f"sqlite:///{db_path.resolve()}" if db_path else settings.database_url
+    if is_sqlite_url(url):
+        database = make_url(url).database
+        if database and database != ":memory:" and not database.startswith("file:"):
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+    return create_db_engine(url, profile="bulk-load")
+
+
+def read_only_url(url: str) -> Optional[str]:
+    """URL opening the same SQLite file read-only (``mode=ro``), or None when that is not possible."""
+    if not is_sqlite_url(url):
+        return None
+    database = make_url(url).database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+    return f"sqlite:///file:{database}?mode=ro&uri=true"
+
+
+def effective_pragmas(db_engine: Engine) -> Dict[str, Any]:
+    """Current values of the engine's configured PRAGMAs as reported by SQLite."""
+    names = list(engine_pragma_config(db_engine)[1].keys())
+    results: Dict[str, Any] = {}
+    with db_engine.connect() as conn:
+        for name in names:
+            row = conn.exec_driver_sql(f"PRAGMA {name}").first()
+            results[name] = row[0] if row else None
+    return results
+
+
+engine = create_db_engine(settings.database_url)
+
+# Reads go through their own pool of read-only connections so they never queue
+# behind the writer; in-memory and non-file databases share the main engine.
+# PostgreSQL reads share the main pool but run in READ ONLY transactions.
+_read_url = read_only_url(settings.database_url)
+if _read_url:
+    read_engine = create_db_engine(
+        _read_url,
+        profile="readonly",
+        pool_size=settings.read_pool_size,
+        max_overflow=settings.read_pool_max_overflow,
+    )
+elif engine.dialect.name == "postgresql":
+    read_engine = engine.execution_options(postgresql_readonly=True)
+else:
+    read_engine = engine
+
+
+# Async drivers for the async read path, keyed by the sync URL's backend name
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+_async_read_engine = None
+
+
+def async_url(url: str) -> str:
+    """``url`` rewritten to use the matching async driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_read_engine():
+    """Async engine over the read-only database, created on first use.
+
+    Created lazily so the async driver is only required when ``ASYNC_READS`` is on.
+    """
+    global _async_read_engine
+    if _async_read_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = async_url(_read_url or settings.database_url)
+        if is_sqlite_url(url):
+            _async_read_engine = create_async_engine(
+                url,
+                echo=False,
+                pool_size=settings.read_pool_size,
+                max_overflow=settings.read_pool_max_overflow,
+            )
+            install_sqlite_pragmas(_async_read_engine.sync_engine, "readonly" if _read_url else settings.sqlite_pragma_profile)
+        else:
+            _async_read_engine = create_async_engine(
+                url,
+                echo=False,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+                pool_recycle=settings.db_pool_recycle,
+                pool_pre_ping=True,
+                execution_options={"postgresql_readonly": True},
+            )
+    return _async_read_engine
+
+
+def init_db(db_engine: Optional[Engine] = None) -> None:
+    db_engine = db_engine or engine
+    had_author_index = has_author_index(db_engine)
+    SQLModel.metadata.create_all(db_engine)
+    install_search_indexes(db_engine)
+    if not had_author_index:
+        # Index the users and notes of a database created before the author index existed
+        with db_engine.begin() as conn:
+            rebuild_author_index(conn)
 
 
 @contextmanager
@@ -26,5 +231,25 @@ def get_session() -> Iterator[Session]:
         session.close()
 
 
+@contextmanager
+def get_read_session() -> Iterator[Session]:
+    """Session on the read-only engine. It never commits; closing releases the snapshot."""
+    session = Session(read_engine, autoflush=False)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@asynccontextmanager
+async def get_async_read_session() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of :func:`get_read_session`; never commits."""
+    session = AsyncSession(get_async_read_engine(), autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
 if __name__ == "__main__":
     init_db()
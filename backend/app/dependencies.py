@@ -1,38 +1,72 @@
-from typing import Iterator, Optional
+from typing import AsyncIterator, Iterator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .auth import decode_access_token
-from .database import get_session
+from .auth import decode_access_token, decode_access_token_claims
+from .database import get_async_read_session, get_read_session, get_session
 from .models import User
+from .utils.token_cache import token_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 oauth2_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
 def get_db() -> Iterator[Session]:
+    """Read-write session for endpoints that modify data; commits when the request succeeds."""
     with get_session() as session:
         yield session
 
 
-def get_current_user(session: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    user_id = decode_access_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+def get_read_db() -> Iterator[Session]:
+    """Read-only session for endpoints that only query."""
+    with get_read_session() as session:
+        yield session
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Async read-only session for the async read endpoints."""
+    async with get_async_read_session() as session:
+        yield session
+
+
+def _resolve_token(session: Session, token: str) -> Optional[User]:
+    """User for a bearer token: from the token cache, else decoded, looked up and cached."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.to_user()
+    claims = decode_access_token_claims(token)
+    if not claims:
+        return None
+    user_id, expires_in = claims
     user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if user is not None:
+        token_cache.put(token, user, expires_in)
     return user
 
 
+def get_current_user(session: Session = Depends(get_read_db), token: str = Depends(oauth2_scheme)) -> User:
+    user = _resolve_token(session, token)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return user
+
+
+async def get_optional_user_id(token: Optional[str] = Depends(oauth2_optional)) -> Optional[int]:
+    """Caller's user id from the bearer token, without a database lookup."""
+    if not token:
+        return None
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user_id
+    return decode_access_token(token)
+
+
 def get_optional_user(
-    session: Session = Depends(get_db), token: Optional[str] = Depends(oauth2_optional)
+    session: Session = Depends(get_read_db), token: Optional[str] = Depends(oauth2_optional)
 ) -> Optional[User]:
     if not token:
         return None
-    user_id = decode_access_token(token)
-    if not user_id:
-        return None
-    return session.get(User, user_id)
+    return _resolve_token(session, token)
@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the per-route histogram buckets; a final +Inf bucket is implicit
+QUERY_COUNT_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 250)
+DB_TIME_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+@dataclass
+class RequestQueryStats:
+    """SQL statements run while handling one request."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    # (seconds, statement) kept for the slow-request log, capped at ``max_statements``
+    statements: List[Tuple[float, str]] = field(default_factory=list)
+    max_statements: int = 50
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if len(self.statements) < self.max_statements:
+            self.statements.append((seconds, statement))
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+_hooks_installed = False
+
+
+def install_query_hooks() -> None:
+    """Time every statement on every engine (sync, read-only and async) for the current request."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _hooks_installed = True
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound label, cumulative count) pairs ending with "+Inf"."""
+        pairs, running = [], 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def snapshot(self) -> Dict[str, object]:
+        return {"count": self.total, "sum": self.sum, "buckets": dict(self.cumulative())}
+
+
+class RouteQueryMetrics:
+    """Per-route histograms of statement count and DB time per request."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Tuple[Histogram, Histogram]] = {}
+
+    def observe(self, method: str, route: str, stats: RequestQueryStats) -> None:
+        key = (method, route)
+        with self._lock:
+            histograms = self._routes.get(key)
+            if histograms is None:
+                histograms = (Histogram(QUERY_COUNT_BUCKETS), Histogram(DB_TIME_BUCKETS))
+                self._routes[key] = histograms
+            histograms[0].observe(stats.count)
+            histograms[1].observe(stats.total_seconds)
+
+    def items(self) -> List[Tuple[Tuple[str, str], Tuple[Histogram, Histogram]]]:
+        """((method, route), (query count histogram, DB time histogram)) sorted by route."""
+        with self._lock:
+            return sorted(self._routes.items(), key=lambda item: item[0][::-1])
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        return [
+            {
+                "method": method,
+                "route": route,
+                "queries": queries.snapshot(),
+                "db_seconds": db_time.snapshot(),
+            }
+            for (method, route), (queries, db_time) in self.items()
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_query_metrics = RouteQueryMetrics()
+
+
+def route_template(scope: Scope) -> str:
+    """Matched route path (e.g. ``/bible/{version_code}/{book}/{chapter}``), or a fixed label when none matched."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class QueryStatsMiddleware:
+    """Counts and times the SQL run by each request.
+
+    Adds ``X-DB-Queries`` / ``X-DB-Time`` (milliseconds) response headers when
+    ``expose_headers`` is set, feeds the per-route histograms, and logs requests
+    slower than ``slow_request_ms`` together with their statements.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        expose_headers: bool = False,
+        slow_request_ms: Optional[int] = None,
+        max_logged_statements: int = 50,
+    ) -> None:
+        self.app = app
+        self.expose_headers = expose_headers
+        self.slow_request_ms = slow_request_ms
+        self.max_logged_statements = max_logged_statements
+        install_query_hooks()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(max_statements=self.max_logged_statements)
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time"] = f"{stats.total_seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            method, route = scope.get("method", ""), route_template(scope)
+            route_query_metrics.observe(method, route, stats)
+            if self.slow_request_ms is not None and elapsed_ms >= self.slow_request_ms:
+                self._log_slow(method, scope.get("path", ""), route, elapsed_ms, stats)
+
+    def _log_slow(self, method: str, path: str, route: str, elapsed_ms: float, stats: RequestQueryStats) -> None:
+        lines = [
+            f"  {seconds * 1000:8.2f} ms  {' '.join(statement.split())}" for seconds, statement in stats.statements
+        ]
+        if stats.count > len(stats.statements):
+            lines.append(f"  ... {stats.count - len(stats.statements)} more")
+        logger.warning(
+            "Slow request %s %s (%s): %.1f ms, %d queries, %.1f ms in DB, slowest %.1f ms\n%s",
+            method,
+            path,
+            route,
+            elapsed_ms,
+            stats.count,
+            stats.total_seconds * 1000,
+            stats.slowest_seconds * 1000,
+            "\n".join(lines),
+        )
@@ -0,0 +1,28 @@
+"""Every job handler, registered on import.
+
+Imported by whatever runs jobs - the API process (``main.py``) and
+``seeds/run_jobs.py`` - so that neither needs the other's modules to know
+every job kind.
+"""
+from typing import Any, Dict
+
+from .database import engine
+from .jobs import JobContext, job_handler
+from .utils import note_processing, note_transfer  # noqa: F401 - process_note, refresh_notes, note_import
+from .utils.author_index import rebuild_author_index
+from .utils.fulltext import has_note_search_index, rebuild_note_search_index
+
+
+@job_handler("rebuild_search_index")
+def _rebuild_search_index(ctx: JobContext, payload: Dict[str, Any]) -> None:
+    # The PostgreSQL note tsvector is a generated column and never needs rebuilding
+    if engine.dialect.name != "sqlite" or not has_note_search_index(engine):
+        return
+    with engine.begin() as conn:
+        rebuild_note_search_index(conn)
+
+
+@job_handler("rebuild_author_index")
+def _rebuild_author_index(ctx: JobContext, payload: Dict[str, Any]) -> None:
+    with engine.begin() as conn:
+        rebuild_author_index(conn)
@@ -0,0 +1,285 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from sqlalchemy import Update, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine, Row
+from sqlmodel import Session
+
+from .config import get_settings
+from .database import engine
+from .models import Job
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_job_table = Job.__table__
+
+
+class JobContext:
+    """A running attempt of a job, as seen by its handler.
+
+    ``progress`` starts from what earlier attempts saved, so handlers that
+    record how far they got with :meth:`save_progress` resume there on retry.
+    """
+
+    def __init__(self, row: Row, db_engine: Engine) -> None:
+        self.job_id: int = row.id
+        self.owner_id: Optional[int] = row.owner_id
+        self.attempt: int = row.attempts
+        self.max_attempts: int = row.max_attempts
+        self.progress: Dict[str, Any] = dict(row.progress or {})
+        self._engine = db_engine
+
+    @property
+    def final_attempt(self) -> bool:
+        """True when a failure now fails the job instead of retrying it."""
+        return self.attempt >= self.max_attempts
+
+    def save_progress(self, conn: Optional[Connection] = None, **values: Any) -> None:
+        """Merge ``values`` into the job's progress and refresh its heartbeat.
+
+        Pass the connection of the transaction that did the work, so the
+        progress commits with it and a retry resumes exactly after it.
+        """
+        self.progress.update(values)
+        stmt = update(Job).where(Job.id == self.job_id).values(progress=dict(self.progress), updated_at=datetime.utcnow())
+        if conn is not None:
+            conn.execute(stmt)
+            return
+        with self._engine.begin() as own:
+            own.execute(stmt)
+
+
+JobHandler = Callable[[JobContext, Dict[str, Any]], None]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the function running jobs of ``kind``. Handlers must tolerate being run again.
+
+    Modules defining handlers are imported by ``app/job_handlers.py``, which every
+    process running jobs imports.
+    """
+
+    def register(fn: JobHandler) -> JobHandler:
+        _handlers[kind] = fn
+        return fn
+
+    return register
+
+
+def enqueue(
+    db: Union[Session, Connection],
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    owner_id: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+) -> int:
+    """Queue a job in the caller's transaction and return its id.
+
+    The job commits (and becomes visible to workers) together with the write
+    that needs it. Call ``job_runner.notify()`` after that commit to start it
+    without waiting for the next poll.
+    """
+    now = datetime.utcnow()
+    stmt = (
+        insert(Job)
+        .values(
+            kind=kind,
+            status="queued",
+            payload=payload or {},
+            progress={},
+            owner_id=owner_id,
+            attempts=0,
+            max_attempts=max_attempts or settings.job_max_attempts,
+            run_after=now,
+            created_at=now,
+            updated_at=now,
+        )
+        .returning(Job.id)
+    )
+    return db.execute(stmt).scalar_one()
+
+
+def queued_jobs(conn: Connection, kind: str) -> int:
+    """Jobs of ``kind`` waiting or running."""
+    return conn.execute(
+        select(func.count()).select_from(Job).where(Job.kind == kind, Job.status.in_(("queued", "running")))
+    ).scalar_one()
+
+
+class JobRunner:
+    """Worker threads running queued jobs from the job table.
+
+    Workers claim the oldest due job with a conditional UPDATE, so several
+    threads and processes can share one queue. A failed attempt is retried
+    after ``retry_delay`` seconds, doubling per attempt, until the job's
+    ``max_attempts`` are used up. While a handler runs, its worker refreshes
+    the job's heartbeat every third of ``lease_seconds``; a running job whose
+    heartbeat is older than the lease is taken to have died with its process
+    and is requeued. Heartbeats and results only apply to the attempt the
+    worker claimed, so a worker that lost its job cannot overwrite the next
+    attempt.
+    """
+
+    def __init__(
+        self, db_engine: Engine, workers: int, poll_interval: float, retry_delay: float, lease_seconds: int
+    ) -> None:
+        self.engine = db_engine
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Condition()
+        self._stopping = threading.Event()
+        self._last_reclaim = 0.0
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._threads:
+            return
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers after their current job; one still running past ``timeout`` is left to its lease."""
+        self._stopping.set()
+        with self._wake:
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake an idle worker: a job was just committed."""
+        with self._wake:
+            self._wake.notify()
+
+    def run_pending(self) -> int:
+        """Run due jobs in the calling thread until none is left; returns how many ran."""
+        ran = 0
+        while self.run_one():
+            ran += 1
+        return ran
+
+    def run_one(self) -> bool:
+        row = self._claim()
+        if row is None:
+            return False
+        self._execute(row)
+        return True
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_one()
+            except Exception:
+                logger.exception("Job worker failed to claim a job")
+                ran = False
+            if not ran and not self._stopping.is_set():
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+
+    def _reclaim_expired(self, conn: Connection, now: datetime) -> None:
+        # Rarely: the UPDATE takes SQLite's write lock even when nothing matches
+        if time.monotonic() - self._last_reclaim < self.lease_seconds / 4:
+            return
+        self._last_reclaim = time.monotonic()
+        expired = conn.execute(
+            update(Job)
+            .where(Job.status == "running", Job.updated_at < now - timedelta(seconds=self.lease_seconds))
+            .values(status="queued", run_after=now, error="Worker lost; requeued")
+        ).rowcount
+        if expired:
+            logger.warning("Requeued %d job(s) whose worker stopped reporting", expired)
+
+    def _claim(self) -> Optional[Row]:
+        now = datetime.utcnow()
+        due = _job_table.alias("due")
+        next_due = (
+            select(due.c.id)
+            .where(due.c.status == "queued", due.c.run_after <= now)
+            .order_by(due.c.run_after, due.c.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        # One UPDATE, so the write lock is taken up front instead of upgrading a
+        # read (which fails outright in WAL mode if another write came between)
+        with self.engine.begin() as conn:
+            self._reclaim_expired(conn, now)
+            return conn.execute(
+                update(_job_table)
+                .where(_job_table.c.id == next_due, _job_table.c.status == "queued")
+                .values(status="running", attempts=_job_table.c.attempts + 1, started_at=now, updated_at=now)
+                .returning(*_job_table.c)
+            ).first()
+
+    def _owned(self, row: Row) -> Update:
+        """UPDATE of the job ``row`` while it is still the attempt this worker claimed."""
+        return update(Job).where(Job.id == row.id, Job.status == "running", Job.attempts == row.attempts)
+
+    def _finish(self, row: Row, values: Dict[str, Any]) -> None:
+        with self.engine.begin() as conn:
+            finished = conn.execute(self._owned(row).values(updated_at=datetime.utcnow(), **values)).rowcount
+        if not finished:
+            logger.warning("Job %s (%s) attempt %d lost its lease; result discarded", row.id, row.kind, row.attempts)
+
+    def _heartbeat(self, row: Row, done: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                with self.engine.begin() as conn:
+                    alive = conn.execute(self._owned(row).values(updated_at=datetime.utcnow())).rowcount
+            except Exception:
+                logger.exception("Job %s (%s) heartbeat failed", row.id, row.kind)
+                continue
+            if not alive:
+                logger.warning("Job %s (%s) attempt %d was requeued while running", row.id, row.kind, row.attempts)
+                return
+
+    def _run_handler(self, handler: JobHandler, row: Row) -> None:
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(row, done), name=f"job-{row.id}-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            handler(JobContext(row, self.engine), dict(row.payload or {}))
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def _execute(self, row: Row) -> None:
+        handler = _handlers.get(row.kind)
+        if handler is None:
+            logger.error("No handler for job %s of kind '%s'", row.id, row.kind)
+            self._finish(row, {"status": "failed", "error": f"Unknown job kind '{row.kind}'", "finished_at": datetime.utcnow()})
+            return
+        started = time.perf_counter()
+        try:
+            self._run_handler(handler, row)
+        except Exception as exc:
+            error = f"{exc.__class__.__name__}: {exc}"
+            if row.attempts >= row.max_attempts:
+                logger.exception("Job %s (%s) failed after %d attempt(s)", row.id, row.kind, row.attempts)
+                self._finish(row, {"status": "failed", "error": error, "finished_at": datetime.utcnow()})
+            else:
+                delay = self.retry_delay * 2 ** (row.attempts - 1)
+                logger.warning("Job %s (%s) attempt %d failed, retrying in %.0fs: %s", row.id, row.kind, row.attempts, delay, error)
+                self._finish(
+                    row,
+                    {"status": "queued", "error": error, "run_after": datetime.utcnow() + timedelta(seconds=delay)},
+                )
+            return
+        logger.debug("Job %s (%s) done in %.2fs", row.id, row.kind, time.perf_counter() - started)
+        self._finish(row, {"status": "succeeded", "error": None, "finished_at": datetime.utcnow()})
+
+
+job_runner = JobRunner(
+    engine, settings.job_workers, settings.job_poll_interval, settings.job_retry_delay, settings.job_lease_seconds
+)
+
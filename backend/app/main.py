@@ -1,14 +1,32 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from . import job_handlers  # noqa: F401 - registers every job handler
+from .auth import password_hasher
+from .compression import CompressionMiddleware
 from .config import get_settings
-from .database import init_db
-from .routers import auth, bible, notes, users, manuscripts
+from .database import engine, get_async_read_engine, init_db, read_engine
+from .instrumentation import QueryStatsMiddleware
+from .jobs import job_runner
+from .metrics import RequestMetricsMiddleware, pool_metrics
+from .profiling import ProfilingMiddleware
+from .responses import FastJSONResponse
+from .routers import auth, bible, health, metrics, notes, reads_async, users, manuscripts
+from .utils.note_transfer import note_importer
 
 settings = get_settings()
 
-app = FastAPI(title="Bible Notes API", version="0.1.0")
+app = FastAPI(title="Bible Notes API", version="0.1.0", default_response_class=FastJSONResponse)
 
+if settings.profile_token or settings.profile_sample_rate > 0:
+    # Innermost, so profiles cover routing and the handler; absent (no overhead) unless configured
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profile_token,
+        sample_rate=settings.profile_sample_rate,
+        output_dir=settings.profile_dir,
+        interval_ms=settings.profile_interval_ms,
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -17,11 +35,39 @@ app.add_middleware(
     ,
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.gzip_level,
+    brotli_quality=settings.brotli_quality,
+)
+app.add_middleware(
+    QueryStatsMiddleware,
+    expose_headers=settings.debug,
+    slow_request_ms=settings.slow_request_ms,
+    max_logged_statements=settings.slow_request_max_statements,
+)
+if settings.metrics_enabled:
+    # Outermost, so latency covers compression and the other middlewares
+    app.add_middleware(RequestMetricsMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    job_runner.start()
+    if settings.metrics_enabled:
+        pool_metrics.instrument("primary", engine)
+        pool_metrics.instrument("read", read_engine)
+        if settings.async_reads:
+            pool_metrics.instrument("async_read", get_async_read_engine().sync_engine)
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    job_runner.stop()
+    password_hasher.shutdown()
+    note_importer.shutdown()
 
 
 app.include_router(auth.router)
@@ -29,3 +75,9 @@ app.include_router(bible.router)
 app.include_router(notes.router)
 app.include_router(users.router)
 app.include_router(manuscripts.router)
+app.include_router(health.router)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
+
+if settings.async_reads:
+    reads_async.install(app)
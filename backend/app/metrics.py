@@ -0,0 +1,313 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import anyio.to_thread
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .instrumentation import Histogram, route_query_metrics, route_template
+
+PREFIX = "biblenotes"
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class RequestMetrics:
+    """Per-route latency histograms, response counts by status and the in-flight gauge."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._responses: Dict[Tuple[str, str, int], int] = {}
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self._latency.get((method, route))
+            if histogram is None:
+                histogram = self._latency[(method, route)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            key = (method, route, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def latency_items(self) -> List[Tuple[Tuple[str, str], Histogram]]:
+        with self._lock:
+            return sorted(self._latency.items(), key=lambda item: item[0][::-1])
+
+    def response_items(self) -> List[Tuple[Tuple[str, str, int], int]]:
+        with self._lock:
+            return sorted(self._responses.items(), key=lambda item: (item[0][1], item[0][0], item[0][2]))
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """Feeds :data:`request_metrics`; costs two lock acquisitions and a histogram update per request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        request_metrics.started()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.finished(
+                scope.get("method", ""), route_template(scope), status, time.perf_counter() - started
+            )
+
+
+class PoolMetrics:
+    """Checkout counts, time spent waiting for a pooled connection and pool timeouts, per engine.
+
+    Timed around ``Engine.connect()``, which every session, ``engine.begin()``
+    and async connection goes through, rather than inside the pool: the pool
+    is replaced by ``engine.dispose()`` and ``pool.recreate()``, the engine is not.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts: Dict[str, int] = {}
+        self.timeouts: Dict[str, int] = {}
+        self.waits: Dict[str, Histogram] = {}
+        self._engines: Dict[str, Engine] = {}
+        self._instrumented: List[Engine] = []
+
+    def instrument(self, name: str, db_engine: Engine) -> None:
+        """Time connection acquisition on ``db_engine``.
+
+        Engines sharing a pool (e.g. the PostgreSQL read-only engine) are
+        counted under the first name their pool was registered with.
+        """
+        if any(known is db_engine for known in self._instrumented):
+            return
+        label = next((known for known, other in self._engines.items() if other.pool is db_engine.pool), name)
+        if label == name:
+            self.checkouts[name], self.timeouts[name] = 0, 0
+            self.waits[name] = Histogram(POOL_WAIT_BUCKETS)
+            self._engines[name] = db_engine
+        connect = db_engine.connect
+
+        def timed_connect() -> Connection:
+            started = time.perf_counter()
+            try:
+                connection = connect()
+            except SQLAlchemyTimeoutError:
+                with self._lock:
+                    self.timeouts[label] += 1
+                raise
+            with self._lock:
+                self.checkouts[label] += 1
+                self.waits[label].observe(time.perf_counter() - started)
+            return connection
+
+        db_engine.connect = timed_connect
+        self._instrumented.append(db_engine)
+
+    def pools(self) -> List[Tuple[str, Pool]]:
+        """(name, current pool) per registered engine; follows pools replaced by ``dispose()``."""
+        return sorted(((name, db_engine.pool) for name, db_engine in self._engines.items()), key=lambda item: item[0])
+
+
+pool_metrics = PoolMetrics()
+
+
+class IndexSizeGauge:
+    """Bytes used by the verse table's indexes (what the concordance searches), refreshed at most every ``ttl`` seconds."""
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+        self._sizes: Dict[str, int] = {}
+        self._refreshed_at: Optional[float] = None
+
+    def stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.ttl
+
+    def refresh(self, db_engine: Engine) -> None:
+        sizes: Dict[str, int] = {}
+        try:
+            with db_engine.connect() as conn:
+                if db_engine.dialect.name == "sqlite":
+                    rows = conn.execute(
+                        text(
+                            "SELECT d.name, SUM(d.pgsize) FROM dbstat AS d "
+                            "JOIN sqlite_master AS m ON m.name = d.name "
+                            "WHERE m.type = 'index' AND m.tbl_name = 'verse' GROUP BY d.name"
+                        )
+                    )
+                elif db_engine.dialect.name == "postgresql":
+                    rows = conn.execute(
+                        text(
+                            "SELECT indexname, pg_relation_size(quote_ident(indexname)::regclass) "
+                            "FROM pg_indexes WHERE tablename = 'verse'"
+                        )
+                    )
+                else:
+                    rows = []
+                sizes = {name: int(size or 0) for name, size in rows}
+        except DBAPIError:
+            # dbstat is a compile-time SQLite option; report nothing rather than fail the scrape
+            sizes = {}
+        self._sizes = sizes
+        self._refreshed_at = time.monotonic()
+
+    def sizes(self) -> Dict[str, int]:
+        return dict(self._sizes)
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class PrometheusWriter:
+    """Accumulates metric families in the Prometheus text exposition format (0.0.4)."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        self.lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    def sample(self, name: str, value: float, **labels: object) -> None:
+        self.lines.append(f"{PREFIX}_{name}{_labels(**labels)} {value}")
+
+    def histogram(self, name: str, histogram: Histogram, **labels: object) -> None:
+        for bound, count in histogram.cumulative():
+            self.sample(f"{name}_bucket", count, **labels, le=bound)
+        self.sample(f"{name}_sum", histogram.sum, **labels)
+        self.sample(f"{name}_count", histogram.total, **labels)
+
+    def histograms(self, name: str, help_text: str, items: Iterable[Tuple[Dict[str, object], Histogram]]) -> None:
+        self.family(name, "histogram", help_text)
+        for labels, histogram in items:
+            self.histogram(name, histogram, **labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def cache_ratio(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def render_metrics(
+    chapter_cache_stats: Tuple[int, int, int, int],
+    render_cache_stats: Tuple[int, int, int, int],
+    token_cache_stats: Tuple[int, int, int, int],
+    index_sizes: Dict[str, int],
+) -> str:
+    """Prometheus text for every collector.
+
+    The cache stats are (hits, misses, entries, capacity) tuples. Call from the
+    event loop so the threadpool limiter statistics can be read.
+    """
+    out = PrometheusWriter()
+
+    out.histograms(
+        "http_request_duration_seconds",
+        "Request latency by route.",
+        [({"method": method, "route": route}, histogram) for (method, route), histogram in request_metrics.latency_items()],
+    )
+    out.family("http_responses_total", "counter", "Responses by route and status code.")
+    for (method, route, status), count in request_metrics.response_items():
+        out.sample("http_responses_total", count, method=method, route=route, status=status)
+    out.family("http_requests_in_flight", "gauge", "Requests currently being handled.")
+    out.sample("http_requests_in_flight", request_metrics.in_flight)
+
+    query_items = route_query_metrics.items()
+    out.histograms(
+        "request_db_queries",
+        "SQL statements per request by route.",
+        [({"method": method, "route": route}, histograms[0]) for (method, route), histograms in query_items],
+    )
+    out.histograms(
+        "request_db_seconds",
+        "Time spent in SQL per request by route.",
+        [({"method": method, "route": route}, histograms[1]) for (method, route), histograms in query_items],
+    )
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter_stats = limiter.statistics()
+    out.family("threadpool_threads", "gauge", "Size of the threadpool that runs sync endpoints.")
+    out.sample("threadpool_threads", limiter.total_tokens)
+    out.family("threadpool_busy_threads", "gauge", "Threadpool threads currently running sync endpoints.")
+    out.sample("threadpool_busy_threads", limiter_stats.borrowed_tokens)
+    out.family("threadpool_waiting_tasks", "gauge", "Tasks queued for a threadpool thread (saturation).")
+    out.sample("threadpool_waiting_tasks", limiter_stats.tasks_waiting)
+
+    pools = pool_metrics.pools()
+    # Only queue-style pools have a size, checked-out count and overflow
+    queue_pools = [(name, pool) for name, pool in pools if isinstance(pool, QueuePool)]
+    out.family("db_pool_size", "gauge", "Configured pool size.")
+    for name, pool in queue_pools:
+        out.sample("db_pool_size", pool.size(), pool=name)
+    out.family("db_pool_checked_out", "gauge", "Connections currently checked out.")
+    for name, pool in queue_pools:
+        out.sample("db_pool_checked_out", pool.checkedout(), pool=name)
+    out.family("db_pool_overflow", "gauge", "Connections open beyond the pool size.")
+    for name, pool in queue_pools:
+        out.sample("db_pool_overflow", max(pool.overflow(), 0), pool=name)
+    out.family("db_pool_checkouts_total", "counter", "Connections handed out by the pool.")
+    for name, _ in pools:
+        out.sample("db_pool_checkouts_total", pool_metrics.checkouts[name], pool=name)
+    out.family("db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.")
+    for name, _ in pools:
+        out.sample("db_pool_timeouts_total", pool_metrics.timeouts[name], pool=name)
+    out.histograms(
+        "db_pool_wait_seconds",
+        "Time spent waiting for a pooled connection.",
+        [({"pool": name}, pool_metrics.waits[name]) for name, _ in pools],
+    )
+
+    for cache, (hits, misses, entries, capacity) in (
+        ("chapter", chapter_cache_stats),
+        ("render", render_cache_stats),
+        ("token", token_cache_stats),
+    ):
+        out.family(f"{cache}_cache_hits_total", "counter", f"{cache.title()} cache hits.")
+        out.sample(f"{cache}_cache_hits_total", hits)
+        out.family(f"{cache}_cache_misses_total", "counter", f"{cache.title()} cache misses.")
+        out.sample(f"{cache}_cache_misses_total", misses)
+        out.family(f"{cache}_cache_hit_ratio", "gauge", f"{cache.title()} cache hits / lookups since startup.")
+        out.sample(f"{cache}_cache_hit_ratio", round(cache_ratio(hits, misses), 6))
+        out.family(f"{cache}_cache_entries", "gauge", f"{cache.title()} cache entries (capacity {capacity}).")
+        out.sample(f"{cache}_cache_entries", entries)
+
+    out.family("concordance_index_bytes", "gauge", "Size of the indexes on the verse table searched by the concordance.")
+    for name, size in sorted(index_sizes.items()):
+        out.sample("concordance_index_bytes", size, index=name)
+
+    return out.render()
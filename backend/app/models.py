@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import JSON, Column, DateTime, Index, String
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -52,6 +52,13 @@ class BibleVersion(SQLModel, table=True):
 
 
 class Verse(SQLModel, table=True):
+    __table_args__ = (
+        # Chapter/passage/verse lookups, and concordance order within a version
+        Index("ix_verse_version_book_chapter_verse", "version_code", "book", "chapter", "verse"),
+        # Cross-reference resolution by canonical id within a version
+        Index("ix_verse_version_canonical_id", "version_code", "canonical_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     version_code: str = Field(foreign_key="bibleversion.code")
     book: str = Field(index=True)
@@ -79,6 +86,16 @@ class Verse(SQLModel, table=True):
 
 
 class Note(TimestampMixin, SQLModel, table=True):
+    __table_args__ = (
+        # Author and profile listings (newest first) and "my notes" (recently updated first)
+        Index("ix_note_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_note_owner_id_updated_at", "owner_id", "updated_at"),
+        # Notes anchored in a chapter: verse join, then version filter
+        Index("ix_note_start_verse_id_version_code", "start_verse_id", "version_code"),
+        # Public author listing: public notes grouped by owner
+        Index("ix_note_is_public_owner_id", "is_public", "owner_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     owner_id: int = Field(foreign_key="user.id")
     title: Optional[str] = None
@@ -104,6 +121,13 @@ class Note(TimestampMixin, SQLModel, table=True):
 
 
 class NoteCrossReference(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_notecrossreference_note_id", "note_id"),
+        Index("ix_notecrossreference_target_verse_id", "target_verse_id"),
+        # Chapter backlinks: canonical id lookup joined straight to the note
+        Index("ix_notecrossreference_canonical_id_note_id", "canonical_id", "note_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     note_id: int = Field(foreign_key="note.id")
     canonical_id: str = Field(index=True)
@@ -114,6 +138,11 @@ class NoteCrossReference(SQLModel, table=True):
 
 
 class UserNoteSubscription(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_usernotesubscription_subscriber_id_author_id", "subscriber_id", "author_id"),
+        Index("ix_usernotesubscription_author_id", "author_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     subscriber_id: int = Field(foreign_key="user.id")
     author_id: int = Field(foreign_key="user.id")
@@ -128,6 +157,123 @@ class UserNoteSubscription(SQLModel, table=True):
     )
 
 
+
+class UserNameToken(SQLModel, table=True):
+    """One searchable name token of a user, for prefix (typeahead) user and author search.
+
+    Maintained from ``User`` writes by ``utils.author_index``.
+    """
+
+    __table_args__ = (
+        # Finding a user's other matching tokens (one result per user)
+        Index("ix_usernametoken_user_id_token", "user_id", "token"),
+    )
+
+    # Byte-order collation on PostgreSQL so prefix ranges match SQLite's
+    token: str = Field(sa_column=Column(String().with_variant(String(collation="C"), "postgresql"), primary_key=True))
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+
+
+class AuthorNoteCount(SQLModel, table=True):
+    """Public notes per author, maintained from ``Note`` writes by ``utils.author_index``."""
+
+    __table_args__ = (
+        # Author listing, most public notes first
+        Index("ix_authornotecount_public_note_count_author_id", "public_note_count", "author_id"),
+    )
+
+    author_id: int = Field(foreign_key="user.id", primary_key=True)
+    public_note_count: int = Field(default=0)
+
+
+class AuthorVersionNoteCount(SQLModel, table=True):
+    """Public notes per author in one Bible version, maintained like ``AuthorNoteCount``."""
+
+    __table_args__ = (
+        # Authors of a version, most public notes first
+        Index("ix_authorversionnotecount_version_count_author", "version_code", "public_note_count", "author_id"),
+    )
+
+    author_id: int = Field(foreign_key="user.id", primary_key=True)
+    version_code: str = Field(foreign_key="bibleversion.code", primary_key=True)
+    public_note_count: int = Field(default=0)
+
+
+class AuthorChapterNoteCount(SQLModel, table=True):
+    """Public notes per author anchored (by start verse) in one chapter of one version."""
+
+    __table_args__ = (
+        # Authors pane of a chapter, most public notes first
+        Index(
+            "ix_authorchapternotecount_chapter_count_author",
+            "version_code",
+            "book",
+            "chapter",
+            "public_note_count",
+            "author_id",
+        ),
+        # The same chapter summed across versions
+        Index("ix_authorchapternotecount_book_chapter_author", "book", "chapter", "author_id"),
+    )
+
+    author_id: int = Field(foreign_key="user.id", primary_key=True)
+    version_code: str = Field(foreign_key="bibleversion.code", primary_key=True)
+    book: str = Field(primary_key=True)
+    chapter: int = Field(primary_key=True)
+    public_note_count: int = Field(default=0)
+
+
+class ChapterGeneration(SQLModel, table=True):
+    """Counter bumped in every transaction that changes the notes or backlinks shown on a
+    chapter; part of the chapter ETags, so every worker process validates against it.
+    """
+
+    # ``book_key`` of the book, so spelling variants (Psalm/Psalms) share a counter
+    book: str = Field(primary_key=True)
+    chapter: int = Field(primary_key=True)
+    generation: int = Field(default=0)
+
+
+class GraphGeneration(SQLModel, table=True):
+    """Single-row counter bumped in every transaction that changes notes or their cross
+    references; worker processes reload their in-memory reference graph when it moves.
+    """
+
+    id: int = Field(default=1, primary_key=True)
+    generation: int = Field(default=0)
+
+
+class Job(SQLModel, table=True):
+    """Deferred work for the in-process job runner (``app/jobs.py``), kept in the database so
+    it survives restarts and can be retried.
+    """
+
+    __table_args__ = (
+        # Workers claim the oldest due job
+        Index("ix_job_status_run_after_id", "status", "run_after", "id"),
+        # Queue depth per kind
+        Index("ix_job_kind_status", "kind", "status"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str
+    # queued, running, succeeded or failed
+    status: str = Field(default="queued")
+    # Handler arguments, and the progress it reports (what a retry resumes from)
+    payload: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    progress: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    # User a job runs for, who may read its status
+    owner_id: Optional[int] = None
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    error: Optional[str] = None
+    run_after: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Heartbeat of the running attempt; a running job silent for longer than the lease is requeued
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
 # Commentary models removed
 
 class ManuscriptEdition(SQLModel, table=True):
@@ -149,6 +295,10 @@ class ManuscriptEdition(SQLModel, table=True):
 
 
 class ManuscriptVerse(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_manuscriptverse_edition_book_chapter_verse", "edition_code", "book", "chapter", "verse"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     edition_code: str = Field(foreign_key="manuscriptedition.code")
     book: str = Field(index=True)
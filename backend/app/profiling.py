@@ -0,0 +1,196 @@
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .instrumentation import route_template
+
+logger = logging.getLogger(__name__)
+
+PROFILE_QUERY_PARAM = "__profile"
+PROFILE_TOKEN_HEADER = "x-profile-token"
+
+# Leaf frames of a thread with nothing to do: the event loop waiting in select()
+# and idle threadpool workers blocked on their queue
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+
+# Frame file names are shown relative to the repository or the import path they came from
+_ROOTS = sorted(
+    {str(Path(path)) for path in sys.path if path} | {str(Path(__file__).resolve().parents[2])},
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    for root in _ROOTS:
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1 :]
+    return filename
+
+
+class StackSampler:
+    """Samples the Python stacks of every busy thread every ``interval`` seconds.
+
+    Sync endpoints run on threadpool threads, so sampling only the event loop
+    thread would miss them. The flip side is that other requests being handled
+    at the same time show up in the profile too; profile on a quiet worker.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._labels: Dict[object, str] = {}
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_LEAVES:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Stacks in the "collapsed" format read by flamegraph.pl, speedscope and inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """Opt-in per-request sampling profiler.
+
+    A request is profiled when it carries ``?__profile=1`` together with an
+    ``X-Profile-Token`` header matching ``token`` - the folded stacks then
+    replace the response body - or when it is picked at ``sample_rate``, in
+    which case the profile is written to ``output_dir`` and the response is
+    untouched. Only install this middleware when one of the two is configured;
+    otherwise it is not in the stack at all.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        output_dir: Path = Path("profiles"),
+        interval_ms: float = 1.0,
+    ) -> None:
+        self.app = app
+        self.token = token
+        self.sample_rate = sample_rate
+        self.output_dir = Path(output_dir)
+        self.interval = interval_ms / 1000
+
+    def _requested(self, scope: Scope) -> bool:
+        if not self.token or PROFILE_QUERY_PARAM.encode() not in scope.get("query_string", b""):
+            return False
+        params = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+        if params.get(PROFILE_QUERY_PARAM) != "1":
+            return False
+        supplied = Headers(scope=scope).get(PROFILE_TOKEN_HEADER, "")
+        return hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._requested(scope):
+            await self._profile_inline(scope, receive, send)
+        elif self.sample_rate and random.random() < self.sample_rate:
+            await self._profile_to_file(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _profile_inline(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status = 500
+
+        async def swallow(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, swallow)
+        finally:
+            sampler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        body = sampler.folded().encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profile-status", str(status).encode()),
+                    (b"x-profile-samples", str(sampler.samples).encode()),
+                    (b"x-profile-elapsed-ms", f"{elapsed_ms:.1f}".encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _profile_to_file(self, scope: Scope, receive: Receive, send: Send) -> None:
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            await anyio.to_thread.run_sync(self._store, scope, sampler)
+
+    def _store(self, scope: Scope, sampler: StackSampler) -> Optional[Path]:
+        if not sampler.stacks:
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        route = route_template(scope).strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+        path = self.output_dir / f"{stamp}-{scope.get('method', '')}-{route}.folded"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(sampler.folded(), encoding="utf-8")
+        except OSError:
+            logger.exception("Could not write profile to %s", path)
+            return None
+        logger.info("Profiled %s %s: %d samples -> %s", scope.get("method"), scope.get("path"), sampler.samples, path)
+        return path
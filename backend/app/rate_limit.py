@@ -0,0 +1,203 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import anyio.to_thread
+from fastapi import Depends, HTTPException, Request, status
+
+from .config import get_settings
+from .dependencies import get_optional_user_id
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket: ``capacity`` requests in a burst, refilled at ``per_minute`` per minute."""
+
+    name: str
+    per_minute: float
+    capacity: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60
+
+
+def refill(tokens: float, updated_at: float, now: float, limit: RateLimit) -> float:
+    return min(limit.capacity, tokens + (now - updated_at) * limit.refill_per_second)
+
+
+def take_token(tokens: float, limit: RateLimit) -> Tuple[bool, float, float]:
+    """(allowed, tokens left, seconds until a token is available when refused)."""
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / limit.refill_per_second
+
+
+class MemoryBackend:
+    """Per-process buckets: one (tokens, updated_at) pair per active key.
+
+    Keys are kept in least-recently-used order, so keys idle long enough to have
+    refilled completely - indistinguishable from a fresh bucket - are evicted
+    from the front in amortised O(1) on each hit.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+
+    def hit(self, key: str, limit: RateLimit, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            state = self._buckets.pop(key, None)
+            tokens = limit.capacity if state is None else refill(state[0], state[1], now, limit)
+            allowed, tokens, retry_after = take_token(tokens, limit)
+            # Third field: when this bucket will be full again, for eviction
+            self._buckets[key] = (tokens, now, now + (limit.capacity - tokens) / limit.refill_per_second)
+            self._evict(now)
+            return allowed, retry_after
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            oldest_key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now and len(self._buckets) <= self.max_keys:
+                break
+            del self._buckets[oldest_key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBackend:
+    """Buckets in a small SQLite file shared by every worker on the host.
+
+    Deliberately separate from the application database so rate limiting never
+    contends with (or touches) it. Each hit is one short IMMEDIATE transaction.
+    """
+
+    blocking = True
+
+    def __init__(self, path: Path, busy_timeout_ms: int = 1000) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_bucket "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_bucket_full_at ON rate_limit_bucket (full_at)")
+        self._hits = 0
+
+    def hit(self, key: str, limit: RateLimit, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM rate_limit_bucket WHERE key = ?", (key,)).fetchone()
+                tokens = limit.capacity if row is None else refill(row[0], row[1], now, limit)
+                allowed, tokens, retry_after = take_token(tokens, limit)
+                full_at = now + (limit.capacity - tokens) / limit.refill_per_second
+                conn.execute(
+                    "INSERT INTO rate_limit_bucket (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at, "
+                    "full_at = excluded.full_at",
+                    (key, tokens, now, full_at),
+                )
+                self._hits += 1
+                if self._hits % 1000 == 0:
+                    # Buckets that have refilled are the same as no bucket
+                    conn.execute("DELETE FROM rate_limit_bucket WHERE full_at <= ?", (now,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return allowed, retry_after
+
+
+class RateLimiter:
+    def __init__(self, backend, clock: Callable[[], float] = time.time) -> None:
+        self.backend = backend
+        # Wall-clock time: the SQLite backend compares timestamps across processes
+        self.clock = clock
+        self.rejected = 0
+
+    async def check(self, key: str, limit: RateLimit) -> None:
+        """Raise 429 (with Retry-After) when ``key`` has exhausted ``limit``."""
+        now = self.clock()
+        if self.backend.blocking:
+            allowed, retry_after = await anyio.to_thread.run_sync(self.backend.hit, key, limit, now)
+        else:
+            allowed, retry_after = self.backend.hit(key, limit, now)
+        if not allowed:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded for {limit.name}, retry later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+def build_limiter() -> RateLimiter:
+    if settings.rate_limit_backend == "sqlite":
+        return RateLimiter(SQLiteBackend(settings.rate_limit_sqlite_path))
+    if settings.rate_limit_backend != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{settings.rate_limit_backend}'. Choose from: memory, sqlite")
+    return RateLimiter(MemoryBackend(settings.rate_limit_max_keys))
+
+
+def make_limit(name: str, per_minute: Optional[int], burst: Optional[int] = None) -> Optional[RateLimit]:
+    """None (no limiting) when ``per_minute`` is unset or zero."""
+    if not per_minute:
+        return None
+    return RateLimit(name=name, per_minute=per_minute, capacity=burst or per_minute)
+
+
+limiter = build_limiter()
+
+note_write_limit = make_limit("note writes", settings.rate_limit_notes_per_minute)
+auth_limit = make_limit("sign-in attempts", settings.rate_limit_auth_per_minute)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def limit_per_user(limit: Optional[RateLimit]) -> Callable:
+    """Dependency charging one token per request to the caller's user bucket (their IP when anonymous).
+
+    The user id comes from the bearer token (token cache or JWT decode), so a
+    refused request never reaches the database. List it in the route's
+    ``dependencies`` so it runs before the session and user dependencies.
+    """
+
+    async def dependency(request: Request, user_id: Optional[int] = Depends(get_optional_user_id)) -> None:
+        if limit is None:
+            return
+        key = f"user:{user_id}" if user_id else f"ip:{client_ip(request)}"
+        await limiter.check(f"{limit.name}:{key}", limit)
+
+    return dependency
+
+
+def limit_per_ip(limit: Optional[RateLimit]) -> Callable:
+    """Dependency charging one token per request to the client IP's bucket."""
+
+    async def dependency(request: Request) -> None:
+        if limit is None:
+            return
+        await limiter.check(f"{limit.name}:ip:{client_ip(request)}", limit)
+
+    return dependency
+
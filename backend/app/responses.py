@@ -0,0 +1,43 @@
+import json
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def json_bytes(content: Any) -> bytes:
+    """``content`` as compact UTF-8 JSON: orjson when installed, else the stdlib encoder."""
+    if orjson is not None:
+        return orjson.dumps(content, default=pydantic_encoder, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=pydantic_encoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when installed, else compact stdlib JSON.
+
+    Accepts a pydantic model directly, so endpoints returning large payloads can
+    skip FastAPI's response-model revalidation and ``jsonable_encoder`` pass by
+    returning ``FastJSONResponse(model)``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.dict()
+        return json_bytes(content)
+
+
+def fast_json(content: Any, headers: Optional[Mapping[str, str]] = None, status_code: int = 200) -> FastJSONResponse:
+    """Wrap ``content`` in a FastJSONResponse, carrying over headers set on the injected Response."""
+    return FastJSONResponse(content, status_code=status_code, headers=dict(headers) if headers else None)
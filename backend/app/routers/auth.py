@@ -1,38 +1,73 @@
-from datetime import timedelta
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
-from ..auth import create_access_token, get_password_hash, verify_password
+from ..auth import PasswordHasherBusy, create_access_token, password_hasher
 from ..dependencies import get_current_user, get_db
 from ..models import User
+from ..rate_limit import auth_limit, limit_per_ip
 from ..schemas import Token, UserCreate, UserLogin, UserRead
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
-def signup(payload: UserCreate, session: Session = Depends(get_db)) -> Token:
-    existing = session.exec(select(User).where(User.email == payload.email)).first()
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = User(
-        email=payload.email,
-        hashed_password=get_password_hash(payload.password),
-        display_name=payload.display_name,
-    )
+def _find_user(session: Session, email: str) -> Optional[User]:
+    return session.exec(select(User).where(User.email == email)).first()
+
+
+def _save_user(session: Session, user: User) -> User:
     session.add(user)
     session.commit()
     session.refresh(user)
+    return user
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many sign-ins in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+# Async handlers: bcrypt runs in the password hasher's process pool and the short
+# DB calls in the threadpool, so a burst of logins holds neither threads nor the loop.
+@router.post(
+    "/signup",
+    response_model=Token,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_per_ip(auth_limit))],
+)
+async def signup(payload: UserCreate, session: Session = Depends(get_db)) -> Token:
+    if await run_in_threadpool(_find_user, session, payload.email):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    try:
+        hashed_password = await password_hasher.hash(payload.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    user = User(email=payload.email, hashed_password=hashed_password, display_name=payload.display_name)
+    user = await run_in_threadpool(_save_user, session, user)
     token = create_access_token(subject=user.id)
     return Token(access_token=token)
 
 
-@router.post("/login", response_model=Token)
-def login(payload: UserLogin, session: Session = Depends(get_db)) -> Token:
-    user = session.exec(select(User).where(User.email == payload.email)).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_per_ip(auth_limit))])
+async def login(payload: UserLogin, session: Session = Depends(get_db)) -> Token:
+    user = await run_in_threadpool(_find_user, session, payload.email)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(payload.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+    if new_hash:
+        # Stored with an older cost factor: upgrade transparently now that we know the password
+        user.hashed_password = new_hash
+        await run_in_threadpool(_save_user, session, user)
     token = create_access_token(subject=user.id)
     return Token(access_token=token)
 
@@ -1,13 +1,15 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 import re
 import html
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import or_
 from sqlalchemy.orm import aliased
 from sqlmodel import Session, select
 
-from ..dependencies import get_db, get_optional_user
-from ..models import BibleVersion, Note, NoteCrossReference, User, Verse
+from ..dependencies import get_optional_user_id, get_read_db
+from ..models import BibleVersion, ManuscriptEdition, ManuscriptVerse, Note, NoteCrossReference, User, Verse
+from ..responses import fast_json
 from ..schemas import (
     BacklinkRead,
     BibleChapterResponse,
@@ -16,171 +18,467 @@ from ..schemas import (
     VerseWithBacklinks,
     ConcordanceResponse,
     ConcordanceHit,
+    ManuscriptEditionRead,
+    ManuscriptVerseRead,
+    ParallelPassageResponse,
+    ParallelVerseRow,
+    PassageResponse,
+    PassageSection,
+)
+from ..utils.http_cache import (
+    chapter_generations,
+    conditional_response,
+    make_etag,
+    revalidate_cache_control,
+    static_cache_control,
+)
+from ..utils.chapter_cache import chapter_cache
+from ..utils.fulltext import is_word_query, supports_tsvector, verse_text_matches
+from ..utils.visibility import note_visible_to
+from ..utils.reference_parser import (
+    PassageRange,
+    book_name_candidates,
+    fold_book_name,
+    normalize_book,
+    parse_passage,
 )
 
 router = APIRouter(prefix="/bible", tags=["bible"])
 
+# Canonical book order for sorting
+BOOK_ORDER = {
+    name: i
+    for i, name in enumerate([
+        "Genesis","Exodus","Leviticus","Numbers","Deuteronomy","Joshua","Judges","Ruth",
+        "1 Samuel","2 Samuel","1 Kings","2 Kings","1 Chronicles","2 Chronicles","Ezra","Nehemiah","Esther",
+        "Job","Psalms","Proverbs","Ecclesiastes","Song of Solomon","Isaiah","Jeremiah","Lamentations",
+        "Ezekiel","Daniel","Hosea","Joel","Amos","Obadiah","Jonah","Micah","Nahum","Habakkuk",
+        "Zephaniah","Haggai","Zechariah","Malachi","Matthew","Mark","Luke","John","Acts","Romans",
+        "1 Corinthians","2 Corinthians","Galatians","Ephesians","Philippians","Colossians","1 Thessalonians",
+        "2 Thessalonians","1 Timothy","2 Timothy","Titus","Philemon","Hebrews","James","1 Peter","2 Peter",
+        "1 John","2 John","3 John","Jude","Revelation"
+    ])
+}
+
+
+def book_idx(b: str) -> int:
+    return BOOK_ORDER.get(b, 999)
+
+
+def require_version(session: Session, version_code: str) -> BibleVersion:
+    version = session.get(BibleVersion, version_code)
+    if not version:
+        raise HTTPException(status_code=404, detail="Bible version not found")
+    return version
+
+
+def backlinks_query(viewer_id: Optional[int]):
+    """Backlink rows visible to ``viewer_id``; callers add the cross-reference target condition.
+
+    Selects just the columns a BacklinkRead needs rather than whole notes,
+    owners and verses, and drops hidden notes in SQL.
+    """
+    SrcVerse = aliased(Verse)
+    return (
+        select(
+            NoteCrossReference.canonical_id,
+            Note.id,
+            Note.title,
+            Note.owner_id,
+            Note.is_public,
+            User.display_name,
+            User.email,
+            SrcVerse.book,
+            SrcVerse.chapter,
+            SrcVerse.verse,
+        )
+        .join(Note, Note.id == NoteCrossReference.note_id)
+        .join(User, User.id == Note.owner_id)
+        .join(SrcVerse, SrcVerse.id == Note.start_verse_id)
+        .where(note_visible_to(viewer_id))
+    )
+
+
+def backlink_read(row: Any) -> BacklinkRead:
+    _, note_id, title, owner_id, is_public, display_name, email, book, chapter, verse = row
+    return BacklinkRead(
+        note_id=note_id,
+        note_title=title,
+        note_owner_name=display_name or email,
+        note_owner_id=owner_id,
+        note_is_public=is_public,
+        source_book=book,
+        source_chapter=chapter,
+        source_verse=verse,
+    )
+
+
+def collect_backlinks(
+    session: Session, canonical_ids: List[str], viewer_id: Optional[int]
+) -> dict[str, list[BacklinkRead]]:
+    """Visible backlinks per target canonical id, sorted by canonical source (book, chapter, verse)."""
+    backlinks_map: dict[str, list[BacklinkRead]] = {cid: [] for cid in canonical_ids}
+    if not backlinks_map:
+        return backlinks_map
+
+    rows = session.exec(
+        backlinks_query(viewer_id).where(NoteCrossReference.canonical_id.in_(list(backlinks_map.keys())))
+    ).all()
+    for row in rows:
+        backlinks_map[row[0]].append(backlink_read(row))
+
+    for lst in backlinks_map.values():
+        lst.sort(key=lambda b: (book_idx(b.source_book), b.source_chapter, b.source_verse))
+    return backlinks_map
+
 
 @router.get("/versions", response_model=List[BibleVersionRead])
-def list_versions(session: Session = Depends(get_db)) -> List[BibleVersionRead]:
+def list_versions(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_db),
+) -> List[BibleVersionRead]:
+    not_modified = conditional_response(request, response, make_etag("versions"), static_cache_control())
+    if not_modified:
+        return not_modified
     versions = session.exec(select(BibleVersion).order_by(BibleVersion.code)).all()
     return [BibleVersionRead.from_orm(version) for version in versions]
 
 
-@router.get("/{version_code}/{book}/{chapter}", response_model=BibleChapterResponse)
-def read_chapter(
-    version_code: str,
+def _split_codes(raw: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(code.strip() for code in (raw or "").split(",") if code.strip()))
+
+
+@router.get("/parallel", response_model=ParallelPassageResponse)
+def read_parallel_passage(
+    request: Request,
+    response: Response,
     book: str,
     chapter: int,
-    session: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user),
-) -> BibleChapterResponse:
-    # Canonical book order for sorting
-    book_order = {
-        name: i
-        for i, name in enumerate([
-            "Genesis","Exodus","Leviticus","Numbers","Deuteronomy","Joshua","Judges","Ruth",
-            "1 Samuel","2 Samuel","1 Kings","2 Kings","1 Chronicles","2 Chronicles","Ezra","Nehemiah","Esther",
-            "Job","Psalms","Proverbs","Ecclesiastes","Song of Solomon","Isaiah","Jeremiah","Lamentations",
-            "Ezekiel","Daniel","Hosea","Joel","Amos","Obadiah","Jonah","Micah","Nahum","Habakkuk",
-            "Zephaniah","Haggai","Zechariah","Malachi","Matthew","Mark","Luke","John","Acts","Romans",
-            "1 Corinthians","2 Corinthians","Galatians","Ephesians","Philippians","Colossians","1 Thessalonians",
-            "2 Thessalonians","1 Timothy","2 Timothy","Titus","Philemon","Hebrews","James","1 Peter","2 Peter",
-            "1 John","2 John","3 John","Jude","Revelation"
-        ])
-    }
-    def book_idx(b: str) -> int:
-        return book_order.get(b, 999)
-    version = session.get(BibleVersion, version_code)
-    if not version:
-        raise HTTPException(status_code=404, detail="Bible version not found")
+    versions: str = Query(..., description="Comma-separated Bible version codes, e.g. KJV,ESV"),
+    editions: Optional[str] = Query(None, description="Comma-separated manuscript edition codes"),
+    verse_start: Optional[int] = None,
+    verse_end: Optional[int] = None,
+    session: Session = Depends(get_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> ParallelPassageResponse:
+    """A chapter or verse range aligned across several versions (and optionally manuscripts).
+
+    One query per source kind fetches every requested version (and edition) at once;
+    rows are aligned on (chapter, verse) and backlinks are joined once per row.
+    """
+    version_codes = _split_codes(versions)
+    edition_codes = _split_codes(editions)
+    if not version_codes:
+        raise HTTPException(status_code=400, detail="At least one version is required")
+    if verse_end is not None and (verse_start is None or verse_end < verse_start):
+        raise HTTPException(status_code=400, detail="Invalid verse range")
 
-    # Support simple book-name aliases (e.g., Psalms vs Psalm)
-    aliases: dict[str, list[str]] = {
-        "Psalms": ["Psalm"],
-        "Psalm": ["Psalms"],
-        # Song of Solomon aliases
-        "Song of Solomon": ["Song of Songs", "Canticles", "Song", "Songs"],
-        "Song of Songs": ["Song of Solomon", "Canticles", "Song", "Songs"],
-        "Canticles": ["Song of Solomon", "Song of Songs", "Song", "Songs"],
-        "Song": ["Songs", "Song of Solomon", "Song of Songs", "Canticles"],
-        "Songs": ["Song", "Song of Solomon", "Song of Songs", "Canticles"],
+    etag = make_etag(
+        "parallel",
+        ",".join(version_codes),
+        ",".join(edition_codes),
+        book,
+        chapter,
+        verse_start,
+        verse_end,
+        chapter_generations.get(session, book, chapter),
+        current_user_id,
+    )
+    not_modified = conditional_response(
+        request, response, etag, revalidate_cache_control(private=current_user_id is not None)
+    )
+    if not_modified:
+        return not_modified
+
+    version_rows = {
+        v.code: v for v in session.exec(select(BibleVersion).where(BibleVersion.code.in_(version_codes))).all()
     }
+    missing = [code for code in version_codes if code not in version_rows]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Bible version not found: {', '.join(missing)}")
 
-    candidates = [book]
-    candidates.extend(aliases.get(book, []))
+    edition_rows = {}
+    if edition_codes:
+        edition_rows = {
+            e.code: e
+            for e in session.exec(select(ManuscriptEdition).where(ManuscriptEdition.code.in_(edition_codes))).all()
+        }
+        missing = [code for code in edition_codes if code not in edition_rows]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Manuscript edition not found: {', '.join(missing)}")
 
-    verses = session.exec(
-        select(Verse)
-        .where(
-            Verse.version_code == version_code,
-            Verse.book.in_(candidates),
-            Verse.chapter == chapter,
-        )
-        .order_by(Verse.verse)
-    ).all()
+    verse_stmt = select(Verse).where(
+        Verse.version_code.in_(version_codes),
+        Verse.book.in_(book_name_candidates(book)),
+        Verse.chapter == chapter,
+    )
+    if verse_start is not None:
+        verse_stmt = verse_stmt.where(Verse.verse >= verse_start, Verse.verse <= (verse_end or verse_start))
+    verses = session.exec(verse_stmt.order_by(Verse.verse)).all()
 
     if not verses:
-        # Fallback: normalize book names (strip non-alphanumerics, lowercase) and compare
-        def _norm(s: str) -> str:
-            raw = "".join(ch for ch in (s or "").lower() if ch.isalnum())
-            # drop a leading 'the'
-            return raw[3:] if raw.startswith("the") else raw
-
-        norm_targets = {_norm(b) for b in candidates}
-        rows = session.exec(
+        raise HTTPException(status_code=404, detail="Chapter not found")
+
+    rows: dict[int, ParallelVerseRow] = {}
+    canonical_by_verse: dict[int, set[str]] = {}
+    for verse in verses:
+        row = rows.setdefault(verse.verse, ParallelVerseRow(chapter=chapter, verse=verse.verse))
+        row.verses[verse.version_code] = VerseRead.from_orm(verse)
+        canonical_by_verse.setdefault(verse.verse, set()).add(verse.canonical_id)
+
+    if edition_codes:
+        ms_stmt = select(ManuscriptVerse).where(
+            ManuscriptVerse.edition_code.in_(edition_codes),
+            ManuscriptVerse.book == normalize_book(book),
+            ManuscriptVerse.chapter == chapter,
+        )
+        if verse_start is not None:
+            ms_stmt = ms_stmt.where(
+                ManuscriptVerse.verse >= verse_start, ManuscriptVerse.verse <= (verse_end or verse_start)
+            )
+        for ms_verse in session.exec(ms_stmt).all():
+            row = rows.setdefault(ms_verse.verse, ParallelVerseRow(chapter=chapter, verse=ms_verse.verse))
+            row.manuscripts[ms_verse.edition_code] = ManuscriptVerseRead.from_orm(ms_verse)
+
+    # Versions may spell the book differently, so a row can carry more than one canonical id
+    all_canonical = sorted({cid for cids in canonical_by_verse.values() for cid in cids})
+    backlinks_map = collect_backlinks(session, all_canonical, current_user_id)
+    for verse_num, cids in canonical_by_verse.items():
+        merged = {}
+        for cid in cids:
+            for backlink in backlinks_map.get(cid, []):
+                merged.setdefault(backlink.note_id, backlink)
+        rows[verse_num].backlinks = sorted(
+            merged.values(), key=lambda b: (book_idx(b.source_book), b.source_chapter, b.source_verse)
+        )
+
+    payload = ParallelPassageResponse(
+        book=book,
+        chapter=chapter,
+        versions=[BibleVersionRead.from_orm(version_rows[code]) for code in version_codes],
+        editions=[ManuscriptEditionRead.from_orm(edition_rows[code]) for code in edition_codes],
+        rows=[rows[key] for key in sorted(rows)],
+    )
+    return fast_json(payload, response.headers)
+
+
+def chapter_etag(session: Session, version_code: str, book: str, chapter: int, viewer_id: Optional[int]) -> str:
+    # Scripture text only changes with the content version; backlinks change with the chapter generation.
+    generation = chapter_generations.get(session, book, chapter)
+    return make_etag("chapter", version_code, book, chapter, generation, viewer_id)
+
+
+def build_chapter(
+    session: Session, version_code: str, book: str, chapter: int, viewer_id: Optional[int]
+) -> BibleChapterResponse:
+    """Chapter text (served from the chapter cache when possible) with visible backlinks per verse."""
+    cached = chapter_cache.get(version_code, book, chapter)
+    if cached is not None:
+        version_read, verse_reads = cached.version, cached.verses
+    else:
+        version = require_version(session, version_code)
+
+        # Support simple book-name aliases (e.g., Psalms vs Psalm)
+        candidates = book_name_candidates(book)
+
+        verses = session.exec(
             select(Verse)
             .where(
                 Verse.version_code == version_code,
+                Verse.book.in_(candidates),
                 Verse.chapter == chapter,
             )
             .order_by(Verse.verse)
         ).all()
-        verses = [v for v in rows if _norm(v.book) in norm_targets]
 
-    if not verses:
-        raise HTTPException(status_code=404, detail="Chapter not found")
-
-    verse_ids = [v.id for v in verses]
-    canon_to_vid = {v.canonical_id: v.id for v in verses}
-
-    backlinks_map: dict[int, list[BacklinkRead]] = {vid: [] for vid in verse_ids}
+        if not verses:
+            # Fallback: normalize book names (strip non-alphanumerics, lowercase) and compare
+            norm_targets = {fold_book_name(b) for b in candidates}
+            rows = session.exec(
+                select(Verse)
+                .where(
+                    Verse.version_code == version_code,
+                    Verse.chapter == chapter,
+                )
+                .order_by(Verse.verse)
+            ).all()
+            verses = [v for v in rows if fold_book_name(v.book) in norm_targets]
 
-    if canon_to_vid:
-        SrcVerse = aliased(Verse)
-        results = session.exec(
-            select(NoteCrossReference, Note, User, SrcVerse)
-            .join(Note, Note.id == NoteCrossReference.note_id)
-            .join(User, User.id == Note.owner_id)
-            .join(SrcVerse, SrcVerse.id == Note.start_verse_id)
-            .where(NoteCrossReference.canonical_id.in_(list(canon_to_vid.keys())))
-        ).all()
+        if not verses:
+            raise HTTPException(status_code=404, detail="Chapter not found")
 
-        for cross_ref, note, owner, src in results:
-            if not note.is_public and (not current_user or note.owner_id != current_user.id):
-                continue
-            target_vid = canon_to_vid.get(cross_ref.canonical_id)
-            if not target_vid:
-                continue
-            backlinks_map[target_vid].append(
-                BacklinkRead(
-                    note_id=note.id,
-                    note_title=note.title,
-                    note_owner_name=owner.display_name or owner.email,
-                    note_owner_id=owner.id,
-                    note_is_public=note.is_public,
-                    source_book=src.book,
-                    source_chapter=src.chapter,
-                    source_verse=src.verse,
-                )
-            )
+        version_read = BibleVersionRead.from_orm(version)
+        verse_reads = [VerseRead.from_orm(v) for v in verses]
+        chapter_cache.put(version_read, book, chapter, verse_reads)
 
-    # Sort each backlinks list by canonical source (book, chapter, verse)
-    for vid, lst in backlinks_map.items():
-        lst.sort(key=lambda b: (book_idx(getattr(b, "source_book", "")), getattr(b, "source_chapter", 0), getattr(b, "source_verse", 0)))
+    backlinks_map = collect_backlinks(session, [v.canonical_id for v in verse_reads], viewer_id)
 
     verse_payloads = [
         VerseWithBacklinks(
-            **VerseRead.from_orm(verse).dict(),
-            backlinks=backlinks_map.get(verse.id, []),
+            **verse.dict(),
+            backlinks=backlinks_map.get(verse.canonical_id, []),
         )
-        for verse in verses
+        for verse in verse_reads
     ]
 
     return BibleChapterResponse(
-        version=BibleVersionRead.from_orm(version),
+        version=version_read,
         book=book,
         chapter=chapter,
         verses=verse_payloads,
     )
 
 
-@router.get("/{version_code}/concordance", response_model=ConcordanceResponse)
-def concordance(
+@router.get("/{version_code}/{book}/{chapter}", response_model=BibleChapterResponse)
+def read_chapter(
     version_code: str,
-    q: str,
-    limit: int = 200,
-    offset: int = 0,
-    session: Session = Depends(get_db),
-) -> ConcordanceResponse:
+    book: str,
+    chapter: int,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> BibleChapterResponse:
+    not_modified = conditional_response(
+        request,
+        response,
+        chapter_etag(session, version_code, book, chapter, current_user_id),
+        revalidate_cache_control(private=current_user_id is not None),
+    )
+    if not_modified:
+        return not_modified
+    payload = build_chapter(session, version_code, book, chapter, current_user_id)
+    return fast_json(payload, response.headers)
+
+
+def _resolve_book_names(session: Session, version_code: str, book: str, chapter: int) -> List[str]:
+    """Asset spellings of ``book`` in this version, falling back to a folded-name match."""
+    candidates = book_name_candidates(book)
+    found = session.exec(
+        select(Verse.book)
+        .where(Verse.version_code == version_code, Verse.book.in_(candidates), Verse.chapter == chapter)
+        .limit(1)
+    ).first()
+    if found:
+        return candidates
+    targets = {fold_book_name(b) for b in candidates}
+    names = session.exec(
+        select(Verse.book).where(Verse.version_code == version_code, Verse.chapter == chapter).distinct()
+    ).all()
+    return [name for name in names if fold_book_name(name) in targets]
+
+
+def _passage_verses(session: Session, version: BibleVersionRead, passage: PassageRange) -> List[VerseRead]:
+    chapters = range(passage.start_chapter, passage.end_chapter + 1)
+
+    def in_range(v: VerseRead) -> bool:
+        position = (v.chapter, v.verse)
+        after_start = position >= (passage.start_chapter, passage.start_verse or 0)
+        before_end = passage.end_verse is None or position <= (passage.end_chapter, passage.end_verse)
+        return after_start and before_end
+
+    if all(chapter_cache.contains(version.code, passage.book, ch) for ch in chapters):
+        cached = [chapter_cache.get(version.code, passage.book, ch) for ch in chapters]
+        if all(entry is not None for entry in cached):
+            return [v for entry in cached for v in entry.verses if in_range(v)]
+
+    names = _resolve_book_names(session, version.code, passage.book, passage.start_chapter)
+    if not names:
+        return []
+
+    # Bounded by chapter and verse rather than by id, so the order verses were seeded in does not matter
+    stmt = select(Verse).where(
+        Verse.version_code == version.code,
+        Verse.book.in_(names),
+        Verse.chapter.between(passage.start_chapter, passage.end_chapter),
+    )
+    if passage.start_verse is not None:
+        stmt = stmt.where(or_(Verse.chapter > passage.start_chapter, Verse.verse >= passage.start_verse))
+    if passage.end_verse is not None:
+        stmt = stmt.where(or_(Verse.chapter < passage.end_chapter, Verse.verse <= passage.end_verse))
+
+    verses: List[VerseRead] = []
+    by_chapter: dict[int, List[VerseRead]] = {}
+    for verse in session.exec(stmt.order_by(Verse.chapter, Verse.verse)):
+        item = VerseRead.from_orm(verse)
+        verses.append(item)
+        by_chapter.setdefault(item.chapter, []).append(item)
+
+    # Chapters read in full are worth keeping for later chapter and passage reads
+    for ch, chapter_verses in by_chapter.items():
+        starts_whole = ch > passage.start_chapter or passage.start_verse is None
+        ends_whole = ch < passage.end_chapter or passage.end_verse is None
+        if starts_whole and ends_whole:
+            chapter_cache.put(version, passage.book, ch, chapter_verses)
+
+    return verses
+
+
+@router.get("/{version_code}/passage", response_model=PassageResponse)
+def read_passage(
+    version_code: str,
+    request: Request,
+    response: Response,
+    ref: str = Query(..., description='Passage reference(s), e.g. "Rom 5:1-8:39, 12:1-2; John 3"'),
+    session: Session = Depends(get_read_db),
+) -> PassageResponse:
+    try:
+        passages = parse_passage(ref)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if not passages:
+        raise HTTPException(status_code=400, detail="Empty reference")
+
+    etag = make_etag("passage", version_code, ref)
+    not_modified = conditional_response(request, response, etag, static_cache_control())
+    if not_modified:
+        return not_modified
+
     version = session.get(BibleVersion, version_code)
     if not version:
         raise HTTPException(status_code=404, detail="Bible version not found")
+    version_read = BibleVersionRead.from_orm(version)
 
-    term = (q or "").strip()
-    if not term:
-        return ConcordanceResponse(query=q, version_code=version_code, total=0, total_occurrences=0, hits=[])
-
-    # Pre-filter with LIKE for performance
-    verses = session.exec(
-        select(Verse)
-        .where(
-            Verse.version_code == version_code,
-            Verse.text.ilike(f"%{term}%"),
+    sections = [
+        PassageSection(
+            reference=passage.raw,
+            book=passage.book,
+            start_chapter=passage.start_chapter,
+            start_verse=passage.start_verse,
+            end_chapter=passage.end_chapter,
+            end_verse=passage.end_verse,
+            verses=_passage_verses(session, version_read, passage),
         )
-        .order_by(Verse.book, Verse.chapter, Verse.verse)
-    ).all()
+        for passage in passages
+    ]
+    if not any(section.verses for section in sections):
+        raise HTTPException(status_code=404, detail="Passage not found")
+
+    return fast_json(PassageResponse(version=version_read, query=ref, passages=sections), response.headers)
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def concordance_candidates(session: Session, version_code: str, term: str, prefilter: bool = True) -> List[Any]:
+    """(book, chapter, verse, text) rows of ``version_code`` to scan for ``term``.
+
+    ``prefilter`` narrows them first: through the GIN-indexed tsvector on
+    PostgreSQL for plain-word terms, else with LIKE. Plain rows rather than
+    ORM objects keep large scans cheap to load.
+    """
+    stmt = select(Verse.book, Verse.chapter, Verse.verse, Verse.text).where(Verse.version_code == version_code)
+    if prefilter:
+        if supports_tsvector(session.get_bind()) and is_word_query(term):
+            stmt = stmt.where(verse_text_matches(term))
+        else:
+            stmt = stmt.where(Verse.text.ilike(f"%{term}%"))
+    return session.exec(stmt.order_by(Verse.book, Verse.chapter, Verse.verse)).all()
 
+
+def count_concordance_hits(verses: List[Any], term: str) -> tuple[List[ConcordanceHit], int]:
+    """Hits with per-verse occurrence counts, and the total number of occurrences."""
     # Prepare regexes
     try:
         pattern_word = re.compile(rf"\\b{re.escape(term)}\\b", flags=re.IGNORECASE)
@@ -188,13 +486,12 @@ def concordance(
         pattern_word = None
     pattern_any = re.compile(re.escape(term), flags=re.IGNORECASE)
 
-    hits_all: List[ConcordanceHit] = []
+    hits: List[ConcordanceHit] = []
     total_occ = 0
-    tag_re = re.compile(r"<[^>]+>")
     for v in verses:
         raw = v.text or ""
         # strip tags and unescape entities for more reliable matching
-        cleaned = html.unescape(tag_re.sub(" ", raw))
+        cleaned = html.unescape(_TAG_RE.sub(" ", raw))
         occ = 0
         if pattern_word is not None:
             occ = len(pattern_word.findall(cleaned))
@@ -203,34 +500,41 @@ def concordance(
         if occ <= 0:
             continue
         total_occ += occ
-        hits_all.append(ConcordanceHit(book=v.book, chapter=v.chapter, verse=v.verse, text=raw, occurrences=occ))
+        hits.append(ConcordanceHit(book=v.book, chapter=v.chapter, verse=v.verse, text=raw, occurrences=occ))
+    return hits, total_occ
 
-    # If LIKE-based prefilter missed due to markup/collation, fall back to scanning all verses
-    if not hits_all:
-        verses = session.exec(
-            select(Verse)
-            .where(Verse.version_code == version_code)
-            .order_by(Verse.book, Verse.chapter, Verse.verse)
-        ).all()
-        for v in verses:
-            raw = v.text or ""
-            cleaned = html.unescape(tag_re.sub(" ", raw))
-            occ = 0
-            if pattern_word is not None:
-                occ = len(pattern_word.findall(cleaned))
-            if occ <= 0:
-                occ = len(pattern_any.findall(cleaned))
-            if occ <= 0:
-                continue
-            total_occ += occ
-            hits_all.append(ConcordanceHit(book=v.book, chapter=v.chapter, verse=v.verse, text=raw, occurrences=occ))
-
-    total = len(hits_all)
-    paged = hits_all[offset : offset + limit]
+
+def concordance_page(
+    query: str, version_code: str, hits: List[ConcordanceHit], total_occ: int, limit: int, offset: int
+) -> ConcordanceResponse:
     return ConcordanceResponse(
-        query=term,
+        query=query,
         version_code=version_code,
-        total=total,
+        total=len(hits),
         total_occurrences=total_occ,
-        hits=paged,
+        hits=hits[offset : offset + limit],
     )
+
+
+@router.get("/{version_code}/concordance", response_model=ConcordanceResponse)
+def concordance(
+    version_code: str,
+    q: str,
+    limit: int = 200,
+    offset: int = 0,
+    session: Session = Depends(get_read_db),
+) -> ConcordanceResponse:
+    require_version(session, version_code)
+
+    term = (q or "").strip()
+    if not term:
+        return ConcordanceResponse(query=q, version_code=version_code, total=0, total_occurrences=0, hits=[])
+
+    # Pre-filter with LIKE for performance
+    hits, total_occ = count_concordance_hits(concordance_candidates(session, version_code, term), term)
+    # If LIKE-based prefilter missed due to markup/collation, fall back to scanning all verses
+    if not hits:
+        hits, total_occ = count_concordance_hits(
+            concordance_candidates(session, version_code, term, prefilter=False), term
+        )
+    return fast_json(concordance_page(term, version_code, hits, total_occ, limit, offset))
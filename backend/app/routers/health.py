@@ -0,0 +1,48 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from ..config import get_settings
+from ..database import effective_pragmas, engine, engine_pragma_config, is_sqlite_url, read_engine
+from ..instrumentation import route_query_metrics
+
+router = APIRouter(prefix="/health", tags=["health"])
+settings = get_settings()
+
+
+@router.get("")
+def health() -> Dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/db")
+def database_health() -> Dict[str, Any]:
+    """Database dialect with SQLite profile/PRAGMA values or, for server databases, pool state."""
+    payload: Dict[str, Any] = {"status": "ok", "dialect": engine.dialect.name}
+    if is_sqlite_url(settings.database_url):
+        profile, pragmas = engine_pragma_config(engine)
+        payload["pragma_profile"] = profile
+        payload["configured_pragmas"] = pragmas
+        payload["effective_pragmas"] = effective_pragmas(engine)
+        if read_engine is not engine:
+            read_profile, read_pragmas = engine_pragma_config(read_engine)
+            payload["read_pool"] = {
+                "pragma_profile": read_profile,
+                "configured_pragmas": read_pragmas,
+                "effective_pragmas": effective_pragmas(read_engine),
+                "size": read_engine.pool.size(),
+            }
+    else:
+        payload["pool"] = {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+            "max_overflow": settings.db_max_overflow,
+        }
+    return payload
+
+
+@router.get("/queries")
+def query_metrics() -> Dict[str, Any]:
+    """Per-route histograms of SQL statement count and DB time per request since startup."""
+    return {"routes": route_query_metrics.snapshot()}
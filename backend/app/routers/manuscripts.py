@@ -1,9 +1,9 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
 
-from ..dependencies import get_db
+from ..dependencies import get_read_db
 from ..models import ManuscriptBookCoverage, ManuscriptEdition, ManuscriptVerse
 from ..schemas import (
     ManuscriptChapterResponse,
@@ -11,6 +11,7 @@ from ..schemas import (
     ManuscriptEditionRead,
     ManuscriptVerseRead,
 )
+from ..utils.http_cache import conditional_response, make_etag, static_cache_control
 from ..utils.reference_parser import normalize_book
 
 router = APIRouter(prefix="/manuscripts", tags=["manuscripts"])
@@ -18,10 +19,16 @@ router = APIRouter(prefix="/manuscripts", tags=["manuscripts"])
 
 @router.get("/editions", response_model=ManuscriptEditionListResponse)
 def list_editions(
+    request: Request,
+    response: Response,
     language: Optional[str] = Query(None, description="Filter by language code e.g. grc, heb, syr"),
     scope: Optional[str] = Query(None, description="Filter by scope e.g. OT, NT, LXX, FULL"),
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ) -> ManuscriptEditionListResponse:
+    etag = make_etag("editions", language, scope)
+    not_modified = conditional_response(request, response, etag, static_cache_control())
+    if not_modified:
+        return not_modified
     stmt = select(ManuscriptEdition)
     if language:
         stmt = stmt.where(ManuscriptEdition.language == language)
@@ -37,7 +44,7 @@ def list_available_for_passage(
     book: str,
     chapter: int,
     language: Optional[str] = Query(None),
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ) -> ManuscriptEditionListResponse:
     canonical_book = normalize_book(book)
     stmt = (
@@ -57,8 +64,15 @@ def read_manuscript_chapter(
     edition_code: str,
     book: str,
     chapter: int,
-    session: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_db),
 ) -> ManuscriptChapterResponse:
+    etag = make_etag("manuscript", edition_code, book, chapter)
+    not_modified = conditional_response(request, response, etag, static_cache_control())
+    if not_modified:
+        return not_modified
+
     edition = session.get(ManuscriptEdition, edition_code)
     if not edition:
         raise HTTPException(status_code=404, detail="Manuscript edition not found")
@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..config import get_settings
+from ..database import read_engine
+from ..metrics import IndexSizeGauge, render_metrics
+from ..utils.chapter_cache import chapter_cache
+from ..utils.markdown import render_cache_info
+from ..utils.token_cache import token_cache
+
+router = APIRouter(tags=["metrics"])
+settings = get_settings()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+index_sizes = IndexSizeGauge(ttl=settings.metrics_index_size_ttl)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape target.
+
+    Everything except the index sizes is read from in-process counters; those
+    need a query and are refreshed at most every ``METRICS_INDEX_SIZE_TTL`` seconds.
+    """
+    if index_sizes.stale():
+        await run_in_threadpool(index_sizes.refresh, read_engine)
+    render_info = render_cache_info()
+    body = render_metrics(
+        chapter_cache_stats=(
+            chapter_cache.hits,
+            chapter_cache.misses,
+            len(chapter_cache),
+            chapter_cache.max_entries,
+        ),
+        render_cache_stats=(render_info.hits, render_info.misses, render_info.currsize, render_info.maxsize or 0),
+        token_cache_stats=(token_cache.hits, token_cache.misses, len(token_cache), token_cache.max_entries),
+        index_sizes=index_sizes.sizes(),
+    )
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
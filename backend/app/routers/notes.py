@@ -1,12 +1,21 @@
-from typing import List, Optional
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
-
-from ..dependencies import get_current_user, get_db, get_optional_user
-from ..models import Note, NoteCrossReference, User, UserNoteSubscription, Verse
+from starlette.concurrency import run_in_threadpool
+
+from ..config import get_settings
+from ..database import get_session
+from ..dependencies import get_current_user, get_db, get_optional_user, get_optional_user_id, get_read_db
+from ..jobs import enqueue, job_runner
+from ..models import Note, NoteCrossReference, User, UserNameToken, UserNoteSubscription, Verse
+from ..rate_limit import limit_per_user, note_write_limit
+from ..responses import fast_json
 from ..schemas import (
     AuthorListResponse,
     AuthorNotesRead,
@@ -14,43 +23,55 @@ from ..schemas import (
     AuthorSubscriptionListResponse,
     AuthorSubscriptionRead,
     AuthorSummary,
-    BacklinkRead,
     BacklinksResponse,
+    GraphEdgeRead,
+    GraphNodeRead,
     NoteCreate,
+    NoteImportJobRead,
     NoteRead,
+    NoteSearchHit,
+    NoteSearchResponse,
     NoteUpdate,
     NotesResponse,
+    ReferenceGraphResponse,
 )
+from ..utils.author_index import author_counts, name_match_page, name_prefix_matches
+from ..utils.http_cache import chapter_generations
+from ..utils.fulltext import has_note_search_index, highlight_snippet, note_search_query, note_snippets
 from ..utils.markdown import render_markdown
-from ..utils.reference_parser import extract_canonical_ids
+from ..utils.note_processing import apply_cross_references, note_canonical_ids, placeholder_html
+from ..utils.note_transfer import (
+    EXPORT_MEDIA_TYPES,
+    NoteImportsBusy,
+    export_notes,
+    import_job_read,
+    note_importer,
+    spool_upload,
+)
+from ..utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    count_rows,
+    decode_count_cursor,
+    decode_score_cursor,
+    encode_count_cursor,
+    encode_score_cursor,
+    keyset_page,
+    page_size,
+)
+from ..utils.reference_graph import reference_graph
+from ..utils.tags import normalize_tags
+from ..utils.visibility import note_visible_to
+from .bible import backlink_read, backlinks_query, book_idx
 
 # Notes API router
 # - CRUD for verse-anchored notes with cross references
 # - Tags: normalized, comma-separated in Note.tags_text; exposed as list on NoteRead
 # - Filtering: supports tag filtering via /notes/me?tag=... and on author endpoints
+# - Listings are keyset-paginated: ?limit=&cursor=, with next_cursor and a COUNT total in the response
 router = APIRouter(prefix="/notes", tags=["notes"])
+settings = get_settings()
 
 
-def _normalize_tags(raw: Optional[str]) -> str:
-    """Normalize a comma-separated tag string to a canonical, deduped form.
-    - trim whitespace, lowercase
-    - remove empties
-    - preserve first-seen order
-    Returns a single comma-joined string (stored in DB as Note.tags_text).
-    """
-    if not raw:
-        return ""
-    parts = [p.strip().lower() for p in raw.split(",")]
-    parts = [p for p in parts if p]
-    # dedupe while preserving order
-    seen: set[str] = set()
-    normalized: list[str] = []
-    for p in parts:
-        if p not in seen:
-            seen.add(p)
-            normalized.append(p)
-    return ",".join(normalized)
-
 def get_author_label(user: User) -> str:
     return user.display_name or user.email
 
@@ -93,13 +114,52 @@ def _verses_text_for_note(session: Session, note: Note) -> list[str]:
     return [f"{v.chapter}:{v.verse} {v.text}" for v in verses]
 
 
-def serialize_note(session: Session, note: Note) -> NoteRead:
+def _verses_text_for_notes(session: Session, notes: Sequence[Note]) -> Dict[int, list[str]]:
+    """Verse lists for a page of notes: one query per (version, book) instead of one per note."""
+    chapters: Dict[Tuple[str, str], set] = defaultdict(set)
+    for note in notes:
+        start, end = note.anchor_start, note.anchor_end
+        if start and end:
+            chapters[(note.version_code, start.book)].update(range(start.chapter, end.chapter + 1))
+
+    # (version, book) -> sorted (chapter, verse) positions and the matching "c:v text" lines
+    verses_by_book: Dict[Tuple[str, str], Tuple[list, list]] = {}
+    for (version_code, book), chapter_numbers in chapters.items():
+        rows = session.exec(
+            select(Verse.chapter, Verse.verse, Verse.text)
+            .where(
+                Verse.version_code == version_code,
+                Verse.book == book,
+                Verse.chapter.in_(sorted(chapter_numbers)),
+            )
+            .order_by(Verse.chapter.asc(), Verse.verse.asc())
+        ).all()
+        verses_by_book[(version_code, book)] = (
+            [(chapter, verse) for chapter, verse, _ in rows],
+            [f"{chapter}:{verse} {text}" for chapter, verse, text in rows],
+        )
+
+    result: Dict[int, list[str]] = {}
+    for note in notes:
+        start, end = note.anchor_start, note.anchor_end
+        if not start or not end:
+            result[note.id] = []
+            continue
+        positions, lines = verses_by_book[(note.version_code, start.book)]
+        lo = bisect_left(positions, (start.chapter, start.verse))
+        hi = bisect_right(positions, (end.chapter, end.verse))
+        result[note.id] = lines[lo:hi]
+    return result
+
+
+def serialize_note(session: Session, note: Note, verses_text: Optional[list[str]] = None) -> NoteRead:
     """Project a Note ORM into the NoteRead schema, including:
-    - derived verse list for the range
+    - derived verse list for the range (looked up unless given)
     - tags: split Note.tags_text into a list
     - owner label and cross references
     """
-    verses_text = _verses_text_for_note(session, note)
+    if verses_text is None:
+        verses_text = _verses_text_for_note(session, note)
     tags = [t for t in (note.tags_text or "").split(",") if t]
     return NoteRead(
         id=note.id,
@@ -126,52 +186,41 @@ def serialize_note(session: Session, note: Note) -> NoteRead:
     )
 
 
-def apply_cross_references(session: Session, note: Note, version_code: str) -> None:
-    canonical_ids = list(dict.fromkeys(extract_canonical_ids(note.content_markdown)))
-    note.cross_references.clear()
+def serialize_notes(session: Session, notes: Sequence[Note]) -> List[NoteRead]:
+    verses_text = _verses_text_for_notes(session, notes)
+    return [serialize_note(session, note, verses_text[note.id]) for note in notes]
 
-    if not canonical_ids:
-        return
 
-    target_verses = session.exec(
-        select(Verse).where(Verse.version_code == version_code, Verse.canonical_id.in_(canonical_ids))
-    ).all()
+def notes_query():
+    """``select(Note)`` with everything ``serialize_note`` reads eagerly loaded."""
+    return select(Note).options(
+        selectinload(Note.owner),
+        selectinload(Note.cross_references),
+        selectinload(Note.anchor_start),
+        selectinload(Note.anchor_end),
+    )
 
-    verse_map = {verse.canonical_id: verse for verse in target_verses}
 
-    for canonical_id in canonical_ids:
-        verse = verse_map.get(canonical_id)
-        if not verse:
-            continue
-        note.cross_references.append(
-            NoteCrossReference(canonical_id=canonical_id, target_verse_id=verse.id)
-        )
+def tag_filter(tag: Optional[str]):
+    """Exact match of a single normalized tag within Note.tags_text, or None for no filter."""
+    t = (tag or "").strip().lower()
+    if not t:
+        return None
+    return (
+        (Note.tags_text == t)
+        | (Note.tags_text.like(f"{t},%"))
+        | (Note.tags_text.like(f"%,{t},%"))
+        | (Note.tags_text.like(f"%,{t}"))
+    )
 
 
-def fetch_author_notes(
-    session: Session,
-    author_id: int,
-    include_private: bool,
+def filter_notes(
+    stmt,
     version_code: Optional[str] = None,
     book: Optional[str] = None,
     chapter: Optional[int] = None,
     tag: Optional[str] = None,
-) -> List[Note]:
-    stmt = (
-        select(Note)
-        .options(
-            selectinload(Note.owner),
-            selectinload(Note.cross_references),
-            selectinload(Note.anchor_start),
-            selectinload(Note.anchor_end),
-        )
-        .where(Note.owner_id == author_id)
-        .order_by(Note.created_at.desc())
-    )
-
-    if not include_private:
-        stmt = stmt.where(Note.is_public.is_(True))
-
+):
     if version_code:
         stmt = stmt.where(Note.version_code == version_code)
 
@@ -182,88 +231,235 @@ def fetch_author_notes(
         if chapter:
             stmt = stmt.where(Verse.chapter == chapter)
 
-    if tag:
-        # Filter by a single normalized tag (exact token match within the CSV field)
-        t = tag.strip().lower()
-        if t:
-            stmt = stmt.where(
-                (Note.tags_text == t)
-                | (Note.tags_text.like(f"{t},%"))
-                | (Note.tags_text.like(f"%,{t},%"))
-                | (Note.tags_text.like(f"%,{t}"))
-            )
+    tag_clause = tag_filter(tag)
+    if tag_clause is not None:
+        stmt = stmt.where(tag_clause)
 
-    return session.exec(stmt).all()
+    return stmt
 
 
 @router.get("/me", response_model=NotesResponse)
 def list_my_notes(
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
 ) -> NotesResponse:
-    stmt = (
-        select(Note)
-        .options(
-            selectinload(Note.owner),
-            selectinload(Note.cross_references),
-            selectinload(Note.anchor_start),
-            selectinload(Note.anchor_end),
-        )
-        .where(Note.owner_id == current_user.id)
-        .order_by(Note.updated_at.desc())
+    """The caller's notes, most recently updated first."""
+    stmt = filter_notes(notes_query().where(Note.owner_id == current_user.id), tag=tag)
+    notes, next_cursor = keyset_page(session, stmt, Note.updated_at, Note.id, cursor, limit)
+
+    return NotesResponse(
+        notes=serialize_notes(session, notes),
+        total=count_rows(session, stmt),
+        next_cursor=next_cursor,
     )
 
-    if tag:
-        t = tag.strip().lower()
-        if t:
-            stmt = stmt.where(
-                (Note.tags_text == t)
-                | (Note.tags_text.like(f"{t},%"))
-                | (Note.tags_text.like(f"%,{t},%"))
-                | (Note.tags_text.like(f"%,{t}"))
+
+@router.get("/search", response_model=NoteSearchResponse)
+def search_notes(
+    q: str = Query(..., min_length=1, max_length=200),
+    author_id: Optional[int] = None,
+    version_code: Optional[str] = None,
+    book: Optional[str] = None,
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    session: Session = Depends(get_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> NoteSearchResponse:
+    """Full-text search over note titles, bodies and tags, best match first.
+
+    Ranked with BM25 over the FTS5 index on SQLite and ``ts_rank_cd`` on
+    PostgreSQL; only notes the caller may see are matched. There is no total:
+    counting every match of a common word would cost more than the page.
+    """
+    bind = session.get_bind()
+    if not has_note_search_index(bind):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Note search is not available")
+    search = note_search_query(bind, q)
+    if search is None:
+        return NoteSearchResponse(query=q, hits=[])
+    stmt, score = search
+
+    stmt = stmt.where(note_visible_to(current_user_id))
+    if author_id is not None:
+        stmt = stmt.where(Note.owner_id == author_id)
+    if version_code:
+        stmt = stmt.where(Note.version_code == version_code)
+    if book:
+        stmt = stmt.join(Verse, Verse.id == Note.start_verse_id).where(Verse.book == book)
+    tag_clause = tag_filter(tag)
+    if tag_clause is not None:
+        stmt = stmt.where(tag_clause)
+    if cursor:
+        stmt = stmt.where(tuple_(score, Note.id) > tuple_(*decode_score_cursor(cursor)))
+
+    ranked = session.exec(stmt.order_by(score.asc(), Note.id.asc()).limit(limit + 1)).all()
+    next_cursor = encode_score_cursor(ranked[limit - 1].score, ranked[limit - 1].id) if len(ranked) > limit else None
+    ranked = ranked[:limit]
+
+    # Details and snippets for this page only
+    note_ids = [row.id for row in ranked]
+    details = {
+        row.id: row
+        for row in session.exec(
+            select(
+                Note.id,
+                Note.title,
+                Note.owner_id,
+                Note.is_public,
+                Note.version_code,
+                Note.tags_text,
+                Note.updated_at,
+                User.display_name,
+                User.email,
+                Verse.book,
+                Verse.chapter,
+                Verse.verse,
             )
+            .join(User, User.id == Note.owner_id)
+            .join(Verse, Verse.id == Note.start_verse_id)
+            .where(Note.id.in_(note_ids))
+        ).all()
+    }
+    snippets = note_snippets(session.connection(), q, note_ids)
+
+    hits = [
+        NoteSearchHit(
+            note_id=row.id,
+            title=row.title,
+            snippet=highlight_snippet(snippets.get(row.id)),
+            owner_id=row.owner_id,
+            owner_display_name=row.display_name or row.email,
+            is_public=row.is_public,
+            version_code=row.version_code,
+            book=row.book,
+            chapter=row.chapter,
+            verse=row.verse,
+            tags=[t for t in (row.tags_text or "").split(",") if t],
+            updated_at=row.updated_at,
+            score=ranked_row.score,
+        )
+        for ranked_row in ranked
+        for row in [details[ranked_row.id]]
+    ]
+    return NoteSearchResponse(query=q, hits=hits, next_cursor=next_cursor)
 
-    notes = session.exec(stmt).all()
 
-    return NotesResponse(notes=[serialize_note(session, note) for note in notes])
+# Declared before the chapter listing so /notes/graph/... is not captured by /{version_code}/{book}/{chapter}
+@router.get("/graph/{book}/{chapter}", response_model=ReferenceGraphResponse)
+def get_reference_graph(
+    book: str,
+    chapter: int,
+    verse: Optional[int] = None,
+    end_verse: Optional[int] = None,
+    depth: int = Query(2, ge=1, le=6),
+    limit: int = Query(500, ge=1, le=5000),
+    session: Session = Depends(get_read_db),
+    current_user: Optional[User] = Depends(get_optional_user),
+) -> ReferenceGraphResponse:
+    """k-hop neighbourhood of a verse or passage over notes and their cross references.
 
+    Walks verse -> notes anchored at or citing it -> their anchors and citations -> ...
+    using the in-memory reference graph; only visible notes are traversed.
+    """
+    if end_verse is not None and (verse is None or end_verse < verse):
+        raise HTTPException(status_code=400, detail="Invalid verse range")
 
-@router.get("/{version_code}/{book}/{chapter}", response_model=NotesResponse)
-def list_notes(
+    reference_graph.ensure_loaded(session)
+    seeds = reference_graph.passage_verses(book, chapter, verse, end_verse)
+    viewer_id = current_user.id if current_user else None
+    result = reference_graph.neighbourhood(seeds, depth=depth, viewer_id=viewer_id, max_nodes=limit)
+
+    owner_ids = {entry.owner_id for entry, _ in result.notes}
+    owners = {}
+    if owner_ids:
+        owners = {
+            user_id: display_name or email
+            for user_id, display_name, email in session.exec(
+                select(User.id, User.display_name, User.email).where(User.id.in_(owner_ids))
+            ).all()
+        }
+
+    nodes: List[GraphNodeRead] = []
+    for canonical_id, node_depth in sorted(result.verses, key=lambda item: (item[1], item[0])):
+        v_book, v_chapter, v_verse = canonical_id.split("|")
+        nodes.append(
+            GraphNodeRead(
+                id=f"verse:{canonical_id}",
+                kind="verse",
+                depth=node_depth,
+                canonical_id=canonical_id,
+                book=v_book,
+                chapter=int(v_chapter),
+                verse=int(v_verse),
+            )
+        )
+    for entry, node_depth in sorted(result.notes, key=lambda item: (item[1], item[0].note_id)):
+        nodes.append(
+            GraphNodeRead(
+                id=f"note:{entry.note_id}",
+                kind="note",
+                depth=node_depth,
+                note_id=entry.note_id,
+                note_title=entry.title,
+                note_owner_id=entry.owner_id,
+                note_owner_name=owners.get(entry.owner_id),
+                note_is_public=entry.is_public,
+                note_version_code=entry.version_code,
+            )
+        )
+
+    edges = [
+        GraphEdgeRead(source=f"note:{note_id}", target=f"verse:{canonical_id}", kind=kind)
+        for note_id, canonical_id, kind in result.edges
+    ]
+
+    return ReferenceGraphResponse(depth=depth, nodes=nodes, edges=edges, truncated=result.truncated)
+
+
+def chapter_notes(
+    session: Session,
     version_code: str,
     book: str,
     chapter: int,
-    session: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user),
+    viewer_id: Optional[int],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
 ) -> NotesResponse:
+    """Notes anchored in a chapter that ``viewer_id`` may see, newest first."""
     stmt = (
-        select(Note)
-        .options(
-            selectinload(Note.owner),
-            selectinload(Note.cross_references),
-            selectinload(Note.anchor_start),
-            selectinload(Note.anchor_end),
-        )
+        notes_query()
         .join(Verse, Note.start_verse_id == Verse.id)
         .where(
             Note.version_code == version_code,
             Verse.book == book,
             Verse.chapter == chapter,
+            note_visible_to(viewer_id),
         )
-        .order_by(Note.created_at.desc())
     )
+    notes, next_cursor = keyset_page(session, stmt, Note.created_at, Note.id, cursor, limit)
 
-    notes = session.exec(stmt).all()
+    return NotesResponse(
+        notes=serialize_notes(session, notes),
+        total=count_rows(session, stmt),
+        next_cursor=next_cursor,
+    )
 
-    visible_notes: List[Note] = []
-    for note in notes:
-        if note.is_public:
-            visible_notes.append(note)
-        elif current_user and note.owner_id == current_user.id:
-            visible_notes.append(note)
 
-    return NotesResponse(notes=[serialize_note(session, note) for note in visible_notes])
+@router.get("/{version_code}/{book}/{chapter}", response_model=NotesResponse)
+def list_notes(
+    version_code: str,
+    book: str,
+    chapter: int,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    session: Session = Depends(get_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> NotesResponse:
+    return chapter_notes(session, version_code, book, chapter, current_user_id, cursor, limit)
 
 
 @router.get("/authors/public", response_model=AuthorListResponse)
@@ -272,71 +468,94 @@ def list_public_authors(
     book: Optional[str] = None,
     chapter: Optional[int] = None,
     query: Optional[str] = None,
-    session: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    session: Session = Depends(get_read_db),
 ) -> AuthorListResponse:
-    stmt = (
-        select(User.id, User.display_name, User.email, func.count(Note.id))
-        .join(Note, Note.owner_id == User.id)
-        .where(Note.is_public.is_(True))
-    )
-
-    if version_code:
-        stmt = stmt.where(Note.version_code == version_code)
+    """Authors with public notes (in the version/book/chapter when given): by name prefix when
+    ``query`` is given, else most public notes first.
 
-    if book or chapter:
-        stmt = stmt.join(Verse, Note.start_verse_id == Verse.id)
-        if book:
-            stmt = stmt.where(Verse.book == book)
-        if chapter:
-            stmt = stmt.where(Verse.chapter == chapter)
+    Reads the maintained per-author counters and the name index, never the
+    note table.
+    """
+    counts = author_counts(version_code, book, chapter)
 
-    if query:
-        like_term = f"%{query.lower()}%"
-        stmt = stmt.where(func.lower(func.coalesce(User.display_name, User.email)).like(like_term))
+    matches = name_prefix_matches(query, cursor) if query else None
+    if matches is not None:
+        stmt = (
+            matches.add_columns(User.display_name, User.email, counts.c.public_note_count)
+            .join(counts, counts.c.author_id == UserNameToken.user_id)
+            .join(User, User.id == UserNameToken.user_id)
+            .where(counts.c.public_note_count > 0)
+        )
+        rows, next_cursor = name_match_page(session, stmt, limit)
+        authors = [
+            AuthorSummary(
+                author_id=row.user_id,
+                author_display_name=row.display_name or row.email,
+                public_note_count=row.public_note_count,
+            )
+            for row in rows
+        ]
+        return AuthorListResponse(authors=authors, next_cursor=next_cursor)
 
-    stmt = stmt.group_by(User.id, User.display_name, User.email).order_by(
-        func.lower(func.coalesce(User.display_name, User.email))
+    stmt = (
+        select(counts.c.author_id, counts.c.public_note_count, User.display_name, User.email)
+        .join(User, User.id == counts.c.author_id)
+        .where(counts.c.public_note_count > 0)
     )
-
-    results = session.exec(stmt).all()
-
-    authors: List[AuthorSummary] = []
-    for author_id, display_name, email, count in results:
-        label = display_name or email
-        authors.append(AuthorSummary(author_id=author_id, author_display_name=label, public_note_count=count))
-
-    return AuthorListResponse(authors=authors)
+    if cursor:
+        position = tuple_(counts.c.public_note_count, counts.c.author_id)
+        stmt = stmt.where(position < tuple_(*decode_count_cursor(cursor)))
+    rows = session.exec(
+        stmt.order_by(counts.c.public_note_count.desc(), counts.c.author_id.desc()).limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_count_cursor(rows[-1].public_note_count, rows[-1].author_id)
+    authors = [
+        AuthorSummary(
+            author_id=row.author_id,
+            author_display_name=row.display_name or row.email,
+            public_note_count=row.public_note_count,
+        )
+        for row in rows
+    ]
+    return AuthorListResponse(authors=authors, next_cursor=next_cursor)
 
 
 @router.get("/authors/{author_id}", response_model=AuthorNotesRead)
 def get_author_notes(
     author_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_optional_user),
     tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
 ) -> AuthorNotesRead:
     author = session.get(User, author_id)
     if not author:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Author not found")
 
-    include_private = bool(current_user and current_user.id == author_id)
-    notes = fetch_author_notes(
-        session,
-        author_id=author_id,
-        include_private=include_private,
-        tag=tag,
-    )
+    stmt = notes_query().where(Note.owner_id == author_id)
+    if not (current_user and current_user.id == author_id):
+        stmt = stmt.where(Note.is_public.is_(True))
+    stmt = filter_notes(stmt, tag=tag)
+    notes, next_cursor = keyset_page(session, stmt, Note.created_at, Note.id, cursor, limit)
 
     return AuthorNotesRead(
         author_id=author.id,
         author_display_name=get_author_label(author),
-        notes=[serialize_note(session, note) for note in notes],
+        notes=serialize_notes(session, notes),
+        total=count_rows(session, stmt),
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/subscriptions", response_model=AuthorSubscriptionListResponse)
 def list_subscriptions(
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> AuthorSubscriptionListResponse:
     subs = session.exec(
@@ -415,47 +634,106 @@ def list_subscribed_notes(
     version_code: Optional[str] = None,
     book: Optional[str] = None,
     chapter: Optional[int] = None,
-    session: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    session: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> AuthorNotesResponse:
-    subs = session.exec(
-        select(UserNoteSubscription)
-        .where(UserNoteSubscription.subscriber_id == current_user.id)
-        .options(selectinload(UserNoteSubscription.author))
-    ).all()
+    """Newest notes across every subscribed author, one page at a time, grouped by author."""
+    subscribed_authors = select(UserNoteSubscription.author_id).where(
+        UserNoteSubscription.subscriber_id == current_user.id
+    )
+    # Subscribing to yourself is refused, so only public notes can appear here
+    stmt = notes_query().where(Note.owner_id.in_(subscribed_authors), Note.is_public.is_(True))
+    stmt = filter_notes(stmt, version_code=version_code, book=book, chapter=chapter)
+    notes, next_cursor = keyset_page(session, stmt, Note.created_at, Note.id, cursor, limit)
+
+    authors_payload: Dict[int, AuthorNotesRead] = {}
+    for note, serialized in zip(notes, serialize_notes(session, notes)):
+        group = authors_payload.get(note.owner_id)
+        if group is None:
+            group = authors_payload[note.owner_id] = AuthorNotesRead(
+                author_id=note.owner_id,
+                author_display_name=get_author_label(note.owner),
+                notes=[],
+            )
+        group.notes.append(serialized)
 
-    authors_payload: List[AuthorNotesRead] = []
+    return fast_json(
+        AuthorNotesResponse(
+            authors=list(authors_payload.values()),
+            total=count_rows(session, stmt),
+            next_cursor=next_cursor,
+        )
+    )
 
-    for sub in subs:
-        author = sub.author
-        if not author:
-            continue
 
-        include_private = author.id == current_user.id
-        author_notes = fetch_author_notes(
-            session,
-            author_id=author.id,
-            include_private=include_private,
-            version_code=version_code,
-            book=book,
-            chapter=chapter,
-        )
+@router.get("/export")
+def export_my_notes(
+    fmt: Literal["ndjson", "markdown"] = Query("ndjson", alias="format"),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream all of the current user's notes, oldest first, as NDJSON (re-importable) or Markdown.
 
-        if not author_notes:
-            continue
+    The body is produced page by page while it is sent; the generator opens
+    its own read sessions because request dependencies are torn down before
+    a streaming body starts.
+    """
+    extension = "md" if fmt == "markdown" else "ndjson"
+    return StreamingResponse(
+        export_notes(current_user.id, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="notes.{extension}"'},
+    )
 
-        authors_payload.append(
-            AuthorNotesRead(
-                author_id=author.id,
-                author_display_name=get_author_label(author),
-                notes=[serialize_note(session, note) for note in author_notes],
-            )
+
+@router.post(
+    "/import",
+    response_model=NoteImportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(limit_per_user(note_write_limit))],
+)
+async def import_notes(request: Request, current_user: User = Depends(get_current_user)) -> NoteImportJobRead:
+    """Queue an import of NDJSON notes (the export format) for the current user.
+
+    The body is spooled to disk as it arrives and imported in the background;
+    poll ``GET /notes/import/{job_id}`` for progress and rejected lines.
+    """
+    path = await spool_upload(request.stream(), settings.note_import_max_bytes)
+    try:
+        job_id = await run_in_threadpool(note_importer.submit, current_user.id, path)
+    except NoteImportsBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many imports in progress, retry shortly",
+            headers={"Retry-After": "5"},
         )
+    return await run_in_threadpool(_read_import_job, job_id, current_user.id)
+
 
-    return AuthorNotesResponse(authors=authors_payload)
+def _read_import_job(job_id: int, owner_id: int) -> Optional[NoteImportJobRead]:
+    with get_session() as session:
+        return import_job_read(session, job_id, owner_id)
 
 
-@router.post("", response_model=NoteRead, status_code=status.HTTP_201_CREATED)
+@router.get("/import/{job_id}", response_model=NoteImportJobRead)
+def get_import_job(
+    job_id: int,
+    session: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> NoteImportJobRead:
+    job = import_job_read(session, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
+
+@router.post(
+    "",
+    response_model=NoteRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_per_user(note_write_limit))],
+)
 def create_note(
     payload: NoteCreate,
     session: Session = Depends(get_db),
@@ -476,7 +754,9 @@ def create_note(
     if (start_verse.chapter, start_verse.verse) > (end_verse.chapter, end_verse.verse):
         raise HTTPException(status_code=400, detail="Start verse must be before end verse")
 
-    content_html = render_markdown(payload.content_markdown)
+    # Deferred: commit the note with escaped text now, render and link it in a job
+    deferred = settings.defer_note_processing
+    content_html = placeholder_html(payload.content_markdown) if deferred else render_markdown(payload.content_markdown)
 
     note = Note(
         owner_id=current_user.id,
@@ -489,20 +769,28 @@ def create_note(
         is_public=payload.is_public,
     )
     # Apply normalized tags from optional payload.tags
-    note.tags_text = _normalize_tags(payload.tags)
+    note.tags_text = normalize_tags(payload.tags)
     session.add(note)
     session.flush()
 
-    apply_cross_references(session, note, payload.version_code)
+    if deferred:
+        enqueue(session, "process_note", {"note_id": note.id})
+    else:
+        apply_cross_references(session, note, payload.version_code)
 
     session.add(note)
+    chapter_generations.bump_canonical(session, note_canonical_ids(note))
+    graph_generation = reference_graph.bump(session)
     session.commit()
     session.refresh(note)
+    reference_graph.upsert_note(note, graph_generation)
+    if deferred:
+        job_runner.notify()
 
     return serialize_note(session, note)
 
 
-@router.put("/{note_id}", response_model=NoteRead)
+@router.put("/{note_id}", response_model=NoteRead, dependencies=[Depends(limit_per_user(note_write_limit))])
 def update_note(
     note_id: int,
     payload: NoteUpdate,
@@ -523,13 +811,21 @@ def update_note(
     if not note or note.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Note not found")
 
+    previous_ids = note_canonical_ids(note)
+    deferred = False
+
     if payload.title is not None:
         note.title = payload.title
 
     if payload.content_markdown is not None:
         note.content_markdown = payload.content_markdown
-        note.content_html = render_markdown(payload.content_markdown)
-        apply_cross_references(session, note, note.version_code)
+        if settings.defer_note_processing:
+            note.content_html = placeholder_html(payload.content_markdown)
+            enqueue(session, "process_note", {"note_id": note.id})
+            deferred = True
+        else:
+            note.content_html = render_markdown(payload.content_markdown)
+            apply_cross_references(session, note, note.version_code)
 
     if payload.is_public is not None:
         note.is_public = payload.is_public
@@ -546,11 +842,16 @@ def update_note(
 
     # Update tags if provided (normalize and persist to Note.tags_text)
     if payload.tags is not None:
-        note.tags_text = _normalize_tags(payload.tags)
+        note.tags_text = normalize_tags(payload.tags)
 
     session.add(note)
+    chapter_generations.bump_canonical(session, previous_ids + note_canonical_ids(note))
+    graph_generation = reference_graph.bump(session)
     session.commit()
     session.refresh(note)
+    reference_graph.upsert_note(note, graph_generation)
+    if deferred:
+        job_runner.notify()
 
     return serialize_note(session, note)
 
@@ -564,19 +865,17 @@ def delete_note(
     note = session.get(Note, note_id)
     if not note or note.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Note not found")
+    chapter_generations.bump_canonical(session, note_canonical_ids(note))
+    graph_generation = reference_graph.bump(session)
     session.delete(note)
     session.commit()
+    reference_graph.remove_note(note_id, graph_generation)
 
 
-@router.get("/backlinks/{version_code}/{book}/{chapter}/{verse}", response_model=BacklinksResponse)
-def get_backlinks(
-    version_code: str,
-    book: str,
-    chapter: int,
-    verse: int,
-    session: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user),
+def verse_backlinks(
+    session: Session, version_code: str, book: str, chapter: int, verse: int, viewer_id: Optional[int]
 ) -> BacklinksResponse:
+    """Notes cross-referencing a verse that ``viewer_id`` may see."""
     verse_obj = session.exec(
         select(Verse).where(
             Verse.version_code == version_code,
@@ -589,26 +888,24 @@ def get_backlinks(
     if not verse_obj:
         raise HTTPException(status_code=404, detail="Verse not found")
 
-    backlinks: List[BacklinkRead] = []
-
-    refs = session.exec(
-        select(NoteCrossReference, Note, User)
-        .join(Note, Note.id == NoteCrossReference.note_id)
-        .join(User, User.id == Note.owner_id)
-        .where(NoteCrossReference.target_verse_id == verse_obj.id)
+    rows = session.exec(
+        backlinks_query(viewer_id).where(NoteCrossReference.target_verse_id == verse_obj.id)
     ).all()
-
-    for cross_ref, note, owner in refs:
-        if not note.is_public and (not current_user or note.owner_id != current_user.id):
-            continue
-        backlinks.append(
-            BacklinkRead(
-                note_id=note.id,
-                note_title=note.title,
-                note_owner_name=owner.display_name or owner.email,
-                note_owner_id=owner.id,
-                note_is_public=note.is_public,
-            )
-        )
+    backlinks = sorted(
+        (backlink_read(row) for row in rows),
+        key=lambda b: (book_idx(b.source_book), b.source_chapter, b.source_verse),
+    )
 
     return BacklinksResponse(backlinks=backlinks)
+
+
+@router.get("/backlinks/{version_code}/{book}/{chapter}/{verse}", response_model=BacklinksResponse)
+def get_backlinks(
+    version_code: str,
+    book: str,
+    chapter: int,
+    verse: int,
+    session: Session = Depends(get_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> BacklinksResponse:
+    return verse_backlinks(session, version_code, book, chapter, verse, current_user_id)
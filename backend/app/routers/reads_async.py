@@ -0,0 +1,123 @@
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, Depends, FastAPI, Request, Response
+from fastapi.routing import APIRoute
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from ..dependencies import get_async_read_db, get_optional_user_id
+from ..responses import fast_json
+from ..schemas import BacklinksResponse, BibleChapterResponse, ConcordanceResponse, NotesResponse
+from ..utils.http_cache import conditional_response, revalidate_cache_control
+from ..utils.pagination import page_size
+from .bible import (
+    build_chapter,
+    chapter_etag,
+    concordance_candidates,
+    concordance_page,
+    count_concordance_hits,
+    require_version,
+)
+from .notes import chapter_notes, verse_backlinks
+
+# Async variants of the hot read endpoints
+# - Same paths and payloads as the sync handlers in bible.py / notes.py, which stay the default
+# - Queries run on the async engine, so waiting on the database does not hold a threadpool
+#   thread; a burst of slow concordance scans no longer starves chapter reads
+# - Enabled with ASYNC_READS=true; install() swaps these in place of the sync routes
+router = APIRouter()
+
+settings = get_settings()
+
+# Concordance scans are long and CPU-bound. Admitting only a few at a time keeps them from
+# taking every pooled connection, and the regex pass runs off the event loop on its own
+# threads rather than the shared request threadpool.
+_search_slots = anyio.Semaphore(settings.async_search_concurrency)
+_cpu_limiter = anyio.CapacityLimiter(settings.async_search_concurrency)
+
+
+@router.get("/bible/{version_code}/{book}/{chapter}", response_model=BibleChapterResponse, tags=["bible"])
+async def read_chapter(
+    version_code: str,
+    book: str,
+    chapter: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> BibleChapterResponse:
+    etag = await session.run_sync(chapter_etag, version_code, book, chapter, current_user_id)
+    not_modified = conditional_response(
+        request, response, etag, revalidate_cache_control(private=current_user_id is not None)
+    )
+    if not_modified:
+        return not_modified
+    payload = await session.run_sync(build_chapter, version_code, book, chapter, current_user_id)
+    return fast_json(payload, response.headers)
+
+
+@router.get("/bible/{version_code}/concordance", response_model=ConcordanceResponse, tags=["bible"])
+async def concordance(
+    version_code: str,
+    q: str,
+    limit: int = 200,
+    offset: int = 0,
+    session: AsyncSession = Depends(get_async_read_db),
+) -> ConcordanceResponse:
+    term = (q or "").strip()
+    # Nothing touches the database before a slot is free, so waiting searches hold no connection
+    async with _search_slots:
+        await session.run_sync(require_version, version_code)
+        if not term:
+            return ConcordanceResponse(query=q, version_code=version_code, total=0, total_occurrences=0, hits=[])
+
+        # Pre-filter with LIKE for performance; fall back to a full scan when markup hides matches
+        verses = await session.run_sync(concordance_candidates, version_code, term)
+        hits, total_occ = await anyio.to_thread.run_sync(count_concordance_hits, verses, term, limiter=_cpu_limiter)
+        if not hits:
+            verses = await session.run_sync(concordance_candidates, version_code, term, False)
+            hits, total_occ = await anyio.to_thread.run_sync(
+                count_concordance_hits, verses, term, limiter=_cpu_limiter
+            )
+    return fast_json(concordance_page(term, version_code, hits, total_occ, limit, offset))
+
+
+@router.get("/notes/{version_code}/{book}/{chapter}", response_model=NotesResponse, tags=["notes"])
+async def list_notes(
+    version_code: str,
+    book: str,
+    chapter: int,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    session: AsyncSession = Depends(get_async_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> NotesResponse:
+    return await session.run_sync(chapter_notes, version_code, book, chapter, current_user_id, cursor, limit)
+
+
+@router.get(
+    "/notes/backlinks/{version_code}/{book}/{chapter}/{verse}", response_model=BacklinksResponse, tags=["notes"]
+)
+async def get_backlinks(
+    version_code: str,
+    book: str,
+    chapter: int,
+    verse: int,
+    session: AsyncSession = Depends(get_async_read_db),
+    current_user_id: Optional[int] = Depends(get_optional_user_id),
+) -> BacklinksResponse:
+    return await session.run_sync(verse_backlinks, version_code, book, chapter, verse, current_user_id)
+
+
+def install(app: FastAPI) -> None:
+    """Replace the sync routes with their async variants, keeping route order.
+
+    Order matters: e.g. ``/notes/graph/{book}/{chapter}`` must still be matched
+    before ``/notes/{version_code}/{book}/{chapter}``.
+    """
+    overrides = {(route.path, frozenset(route.methods)): route for route in router.routes}
+    app.router.routes[:] = [
+        overrides.get((route.path, frozenset(route.methods)), route) if isinstance(route, APIRoute) else route
+        for route in app.router.routes
+    ]
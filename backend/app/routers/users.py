@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
-from ..dependencies import get_current_user, get_db
-from ..models import Note, User
+from ..dependencies import get_current_user, get_read_db
+from ..models import Note, User, UserNameToken
+from ..responses import fast_json
 from ..schemas import (
     UserProfileRead,
     UserListResponse,
@@ -14,7 +15,9 @@ from ..schemas import (
     AuthorSubscriptionRead,
 )
 from ..models import UserNoteSubscription
-from .notes import serialize_note
+from ..utils.author_index import name_match_page, name_prefix_matches
+from ..utils.pagination import count_rows, keyset_page, page_size
+from .notes import filter_notes, notes_query, serialize_notes
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -30,76 +33,59 @@ def _default_avatar_url(user: User) -> str:
 
 @router.get("/me/profile", response_model=UserProfileRead)
 def read_my_profile(
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     tag: str | None = None,
+    cursor: str | None = None,
+    limit: int = Depends(page_size),
 ) -> UserProfileRead:
-    notes = session.exec(
-        select(Note)
-        .options(
-            selectinload(Note.owner),
-            selectinload(Note.cross_references),
-            selectinload(Note.anchor_start),
-            selectinload(Note.anchor_end),
+    stmt = filter_notes(notes_query().where(Note.owner_id == current_user.id), tag=tag)
+    notes, next_cursor = keyset_page(session, stmt, Note.created_at, Note.id, cursor, limit)
+
+    return fast_json(
+        UserProfileRead(
+            id=current_user.id,
+            email=current_user.email,
+            display_name=current_user.display_name,
+            avatar_url=_default_avatar_url(current_user),
+            note_count=count_rows(session, stmt),
+            notes=serialize_notes(session, notes),
+            next_cursor=next_cursor,
         )
-        .where(Note.owner_id == current_user.id)
-        .order_by(Note.created_at.desc())
-    ).all()
-
-    if tag:
-        t = tag.strip().lower()
-        if t:
-            notes = [
-                n for n in notes
-                if (n.tags_text == t)
-                or n.tags_text.startswith(f"{t},")
-                or f",{t}," in n.tags_text
-                or n.tags_text.endswith(f",{t}")
-            ]
-
-    serialized_notes = [serialize_note(session, note) for note in notes]
-
-    return UserProfileRead(
-        id=current_user.id,
-        email=current_user.email,
-        display_name=current_user.display_name,
-        avatar_url=_default_avatar_url(current_user),
-        note_count=len(serialized_notes),
-        notes=serialized_notes,
     )
 
 
 @router.get("/search", response_model=UserListResponse)
 def search_users(
     query: str | None = None,
-    session: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int = Depends(page_size),
+    session: Session = Depends(get_read_db),
 ) -> UserListResponse:
-    if not query or not query.strip():
+    """Users with a display-name or email word starting with ``query``, in name order."""
+    matches = name_prefix_matches(query or "", cursor)
+    if matches is None:
         return UserListResponse(users=[])
 
-    like = f"%{query}%"
-    users = session.exec(
-        select(User)
-        .where((User.display_name.ilike(like)) | (User.email.ilike(like)))
-        .order_by(User.display_name.is_(None), User.display_name, User.email)
-    ).all()
+    stmt = matches.add_columns(User.email, User.display_name).join(User, User.id == UserNameToken.user_id)
+    rows, next_cursor = name_match_page(session, stmt, limit)
 
     results = [
         UserSearchResult(
-            id=u.id,
-            email=u.email,
-            display_name=u.display_name,
+            id=row.user_id,
+            email=row.email,
+            display_name=row.display_name,
         )
-        for u in users
+        for row in rows
     ]
 
-    return UserListResponse(users=results)
+    return UserListResponse(users=results, next_cursor=next_cursor)
 
 
 @router.get("/{user_id}/subscriptions", response_model=AuthorSubscriptionListResponse)
 def read_user_subscriptions(
     user_id: int,
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ):
     subs = session.exec(
         select(UserNoteSubscription)
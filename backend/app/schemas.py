@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -131,6 +131,9 @@ class AuthorNotesRead(BaseModel):
     author_id: int
     author_display_name: Optional[str] = None
     notes: List["NoteRead"]
+    # Set on /notes/authors/{id}; pass next_cursor back as ?cursor= for the following page
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class AuthorNotesSummary(BaseModel):
@@ -140,7 +143,10 @@ class AuthorNotesSummary(BaseModel):
 
 
 class AuthorNotesResponse(BaseModel):
+    # One page of the merged feed, grouped by author in order of their newest note on the page
     authors: List[AuthorNotesRead]
+    total: int = 0
+    next_cursor: Optional[str] = None
 
 
 class BibleChapterResponse(BaseModel):
@@ -152,6 +158,74 @@ class BibleChapterResponse(BaseModel):
 
 class NotesResponse(BaseModel):
     notes: List[NoteRead]
+    total: int = 0
+    next_cursor: Optional[str] = None
+
+
+class NoteSearchHit(BaseModel):
+    note_id: int
+    title: Optional[str] = None
+    # Matching excerpt, HTML-escaped, with the matched terms wrapped in <mark>
+    snippet: str
+    owner_id: int
+    owner_display_name: Optional[str] = None
+    is_public: bool
+    version_code: str
+    book: str
+    chapter: int
+    verse: int
+    tags: List[str] = Field(default_factory=list)
+    updated_at: datetime
+    # Lower is a better match
+    score: float
+
+
+class NoteSearchResponse(BaseModel):
+    query: str
+    hits: List[NoteSearchHit]
+    next_cursor: Optional[str] = None
+
+
+# One line of an NDJSON note export, and of an import. Verses are addressed by
+# reference rather than id so files move between databases; on import ``id``
+# is ignored, ``end_*`` default to the start verse and ``tags`` may also be a
+# comma-separated string.
+class NoteTransferRecord(BaseModel):
+    id: Optional[int] = None
+    title: Optional[str] = None
+    content_markdown: str
+    version_code: str
+    book: str
+    start_chapter: int
+    start_verse: int
+    end_chapter: Optional[int] = None
+    end_verse: Optional[int] = None
+    is_public: bool = False
+    tags: Union[List[str], str, None] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class NoteImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class NoteImportJobRead(BaseModel):
+    id: int
+    # queued, running, succeeded or failed; a failed attempt is queued again until its retries run out
+    status: str
+    attempts: int = 0
+    lines_read: int = 0
+    imported: int = 0
+    skipped: int = 0
+    # The first rejected lines; ``skipped`` counts all of them
+    errors: List[NoteImportError] = Field(default_factory=list)
+    # Error of the last failed attempt; chunks committed before it are kept and not repeated
+    detail: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 class CommentaryBase(BaseModel):
@@ -232,14 +306,47 @@ class UserProfileRead(BaseModel):
     avatar_url: str
     note_count: int
     notes: List[NoteRead]
+    next_cursor: Optional[str] = None
 
 
 class BacklinksResponse(BaseModel):
     backlinks: List[BacklinkRead]
 
 
+class GraphNodeRead(BaseModel):
+    # "verse:<canonical_id>" or "note:<id>"
+    id: str
+    kind: str
+    depth: int
+    canonical_id: Optional[str] = None
+    book: Optional[str] = None
+    chapter: Optional[int] = None
+    verse: Optional[int] = None
+    note_id: Optional[int] = None
+    note_title: Optional[str] = None
+    note_owner_id: Optional[int] = None
+    note_owner_name: Optional[str] = None
+    note_is_public: Optional[bool] = None
+    note_version_code: Optional[str] = None
+
+
+class GraphEdgeRead(BaseModel):
+    source: str
+    target: str
+    # "anchors" (note is attached to the verse) or "cites" (note references the verse)
+    kind: str
+
+
+class ReferenceGraphResponse(BaseModel):
+    depth: int
+    nodes: List[GraphNodeRead]
+    edges: List[GraphEdgeRead]
+    truncated: bool = False
+
+
 class AuthorListResponse(BaseModel):
     authors: List[AuthorSummary]
+    next_cursor: Optional[str] = None
 
 
 class AuthorSubscriptionListResponse(BaseModel):
@@ -255,6 +362,7 @@ class UserSearchResult(BaseModel):
 
 class UserListResponse(BaseModel):
     users: List[UserSearchResult]
+    next_cursor: Optional[str] = None
 
 
 class ManuscriptEditionRead(BaseModel):
@@ -295,6 +403,39 @@ class ManuscriptEditionListResponse(BaseModel):
     editions: List[ManuscriptEditionRead]
 
 
+class ParallelVerseRow(BaseModel):
+    chapter: int
+    verse: int
+    # Keyed by Bible version code / manuscript edition code; absent where a source lacks the verse
+    verses: Dict[str, VerseRead] = Field(default_factory=dict)
+    manuscripts: Dict[str, ManuscriptVerseRead] = Field(default_factory=dict)
+    backlinks: List[BacklinkRead] = Field(default_factory=list)
+
+
+class ParallelPassageResponse(BaseModel):
+    book: str
+    chapter: int
+    versions: List[BibleVersionRead]
+    editions: List[ManuscriptEditionRead] = Field(default_factory=list)
+    rows: List[ParallelVerseRow]
+
+
+class PassageSection(BaseModel):
+    reference: str
+    book: str
+    start_chapter: int
+    start_verse: Optional[int] = None
+    end_chapter: int
+    end_verse: Optional[int] = None
+    verses: List[VerseRead]
+
+
+class PassageResponse(BaseModel):
+    version: BibleVersionRead
+    query: str
+    passages: List[PassageSection]
+
+
 class ConcordanceHit(BaseModel):
     book: str
     chapter: int
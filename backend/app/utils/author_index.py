@@ -0,0 +1,305 @@
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, event, exists, func, inspect, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from sqlmodel import Session
+
+from ..models import (
+    AuthorChapterNoteCount,
+    AuthorNoteCount,
+    AuthorVersionNoteCount,
+    Note,
+    User,
+    UserNameToken,
+    Verse,
+)
+from .pagination import decode_name_cursor, encode_name_cursor
+
+# Tables maintained here, rebuilt together by rebuild_author_index()
+AUTHOR_INDEX_TABLES = (UserNameToken, AuthorNoteCount, AuthorVersionNoteCount, AuthorChapterNoteCount)
+
+# Longest token kept; longer names still match on their first MAX_TOKEN_LENGTH characters
+MAX_TOKEN_LENGTH = 64
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_name(value: str) -> str:
+    """Lowercased, whitespace-collapsed form shared by indexed tokens and search prefixes."""
+    return " ".join(value.lower().split())[:MAX_TOKEN_LENGTH]
+
+
+def name_tokens(display_name: Optional[str], email: str) -> Set[str]:
+    """Tokens a user can be found by: the display name from each of its words on (so
+    "john sm" finds "John Smith" and "o'b" finds "John O'Brien"), every word of the
+    display name and email, the email and its domain.
+    """
+    tokens = {normalize_name(email), normalize_name(email.rsplit("@", 1)[-1])}
+    tokens.update(normalize_name(word) for word in _WORD_RE.findall(email))
+    if display_name:
+        parts = normalize_name(display_name).split(" ")
+        tokens.update(" ".join(parts[start:]) for start in range(len(parts)))
+        tokens.update(normalize_name(word) for word in _WORD_RE.findall(display_name))
+    tokens.discard("")
+    return tokens
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``, for a range scan."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def name_prefix_matches(query: str, cursor: Optional[str] = None) -> Optional[Select]:
+    """``SELECT token, user_id``: users with a name token starting with ``query``, one row each,
+    after the ``cursor`` position when given.
+
+    A user with several matching tokens is returned once, on the first of
+    them, so ordering by (token, user_id) pages through the users in index
+    order without sorting every match. None when ``query`` is blank.
+    """
+    prefix = normalize_name(query)
+    if not prefix:
+        return None
+    position = tuple_(UserNameToken.token, UserNameToken.user_id)
+    # The cursor alone as lower bound: SQLite then seeks straight to it instead
+    # of scanning from the start of the prefix and filtering
+    lower = position > tuple_(*decode_name_cursor(cursor)) if cursor else UserNameToken.token >= prefix
+    earlier = aliased(UserNameToken)
+    earlier_match = (
+        exists()
+        .where(earlier.user_id == UserNameToken.user_id, earlier.token >= prefix, earlier.token < UserNameToken.token)
+        .correlate(UserNameToken)
+    )
+    return select(UserNameToken.token, UserNameToken.user_id).where(
+        lower, UserNameToken.token < prefix_upper_bound(prefix), ~earlier_match
+    )
+
+
+def name_match_page(session: Session, stmt: Select, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """One page of a :func:`name_prefix_matches` select, in (token, user_id) order, and the next cursor."""
+    rows = session.exec(stmt.order_by(UserNameToken.token, UserNameToken.user_id).limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return list(rows), None
+    last = rows[limit - 1]
+    return list(rows[:limit]), encode_name_cursor(last.token, last.user_id)
+
+
+def _upsert(conn: Connection):
+    return postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+
+
+def replace_name_tokens(conn: Connection, user_id: int, display_name: Optional[str], email: str) -> None:
+    conn.execute(delete(UserNameToken).where(UserNameToken.user_id == user_id))
+    tokens = name_tokens(display_name, email)
+    if tokens:
+        conn.execute(insert(UserNameToken), [{"token": token, "user_id": user_id} for token in tokens])
+
+
+def _add_to_counter(conn: Connection, counter, keys: Dict[str, Any], delta: int) -> None:
+    upsert = _upsert(conn)(counter).values(**keys, public_note_count=delta)
+    conn.execute(
+        upsert.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={"public_note_count": counter.public_note_count + upsert.excluded.public_note_count},
+        )
+    )
+
+
+def add_public_notes(conn: Connection, author_id: int, version_code: str, start_verse_id: int, delta: int) -> None:
+    """Adjust the author, author+version and author+chapter counters of ``delta`` public notes
+    anchored at ``start_verse_id``, creating counters on first use.
+    """
+    book, chapter = conn.execute(select(Verse.book, Verse.chapter).where(Verse.id == start_verse_id)).one()
+    _add_to_counter(conn, AuthorNoteCount, {"author_id": author_id}, delta)
+    _add_to_counter(conn, AuthorVersionNoteCount, {"author_id": author_id, "version_code": version_code}, delta)
+    _add_to_counter(
+        conn,
+        AuthorChapterNoteCount,
+        {"author_id": author_id, "version_code": version_code, "book": book, "chapter": chapter},
+        delta,
+    )
+
+
+def count_public_notes(conn: Connection, author_id: int, anchors: Iterable[Tuple[str, str, int]]) -> None:
+    """Add new public notes of one author, given by the (version_code, book, chapter) they are
+    anchored in, to the counters: one upsert per counter row instead of three per note.
+    """
+    chapters = Counter(anchors)
+    if not chapters:
+        return
+    versions: Counter = Counter()
+    for (version_code, _, _), count in chapters.items():
+        versions[version_code] += count
+    _add_to_counter(conn, AuthorNoteCount, {"author_id": author_id}, sum(versions.values()))
+    for version_code, count in versions.items():
+        _add_to_counter(conn, AuthorVersionNoteCount, {"author_id": author_id, "version_code": version_code}, count)
+    for (version_code, book, chapter), count in chapters.items():
+        _add_to_counter(
+            conn,
+            AuthorChapterNoteCount,
+            {"author_id": author_id, "version_code": version_code, "book": book, "chapter": chapter},
+            count,
+        )
+
+
+def author_counts(version_code: Optional[str] = None, book: Optional[str] = None, chapter: Optional[int] = None):
+    """Subquery of (author_id, public_note_count) over the public notes matching the filters.
+
+    Reads the counters: the whole site, one version, or one chapter of one
+    version is a single indexed counter read; other combinations sum the
+    per-chapter counters, which are far fewer than the notes they count.
+    """
+    if not (version_code or book or chapter):
+        stmt = select(AuthorNoteCount.author_id, AuthorNoteCount.public_note_count)
+    elif version_code and not (book or chapter):
+        stmt = select(AuthorVersionNoteCount.author_id, AuthorVersionNoteCount.public_note_count).where(
+            AuthorVersionNoteCount.version_code == version_code
+        )
+    elif version_code and book and chapter:
+        stmt = select(AuthorChapterNoteCount.author_id, AuthorChapterNoteCount.public_note_count).where(
+            AuthorChapterNoteCount.version_code == version_code,
+            AuthorChapterNoteCount.book == book,
+            AuthorChapterNoteCount.chapter == chapter,
+        )
+    else:
+        stmt = select(
+            AuthorChapterNoteCount.author_id,
+            func.sum(AuthorChapterNoteCount.public_note_count).label("public_note_count"),
+        ).group_by(AuthorChapterNoteCount.author_id)
+        if version_code:
+            stmt = stmt.where(AuthorChapterNoteCount.version_code == version_code)
+        if book:
+            stmt = stmt.where(AuthorChapterNoteCount.book == book)
+        if chapter:
+            stmt = stmt.where(AuthorChapterNoteCount.chapter == chapter)
+    return stmt.subquery("author_counts")
+
+
+def has_author_index(bind: Engine | Connection) -> bool:
+    inspector = inspect(bind)
+    return all(inspector.has_table(table.__tablename__) for table in AUTHOR_INDEX_TABLES)
+
+
+def rebuild_name_tokens(conn: Connection, batch_size: int = 5000) -> None:
+    """Recompute every user's name tokens from the user table."""
+    conn.execute(delete(UserNameToken))
+    last_id = 0
+    while True:
+        users = conn.execute(
+            select(User.id, User.display_name, User.email).where(User.id > last_id).order_by(User.id).limit(batch_size)
+        ).all()
+        if not users:
+            break
+        rows = [
+            {"token": token, "user_id": user_id}
+            for user_id, display_name, email in users
+            for token in name_tokens(display_name, email)
+        ]
+        if rows:
+            conn.execute(insert(UserNameToken), rows)
+        last_id = users[-1].id
+
+
+def rebuild_note_counts(conn: Connection) -> None:
+    """Recompute the public note counters from the note table."""
+    public = Note.is_public.is_(True)
+    conn.execute(delete(AuthorNoteCount))
+    conn.execute(
+        insert(AuthorNoteCount).from_select(
+            ["author_id", "public_note_count"],
+            select(Note.owner_id, func.count()).where(public).group_by(Note.owner_id),
+        )
+    )
+    conn.execute(delete(AuthorVersionNoteCount))
+    conn.execute(
+        insert(AuthorVersionNoteCount).from_select(
+            ["author_id", "version_code", "public_note_count"],
+            select(Note.owner_id, Note.version_code, func.count())
+            .where(public)
+            .group_by(Note.owner_id, Note.version_code),
+        )
+    )
+    conn.execute(delete(AuthorChapterNoteCount))
+    conn.execute(
+        insert(AuthorChapterNoteCount).from_select(
+            ["author_id", "version_code", "book", "chapter", "public_note_count"],
+            select(Note.owner_id, Note.version_code, Verse.book, Verse.chapter, func.count())
+            .join(Verse, Verse.id == Note.start_verse_id)
+            .where(public)
+            .group_by(Note.owner_id, Note.version_code, Verse.book, Verse.chapter),
+        )
+    )
+
+
+def rebuild_author_index(conn: Connection) -> None:
+    """Recompute name tokens and public note counters from the user and note tables.
+
+    For new databases, and after bulk loads that bypassed the ORM (Core
+    ``insert()`` does not fire the listeners below).
+    """
+    rebuild_name_tokens(conn)
+    rebuild_note_counts(conn)
+
+
+# Note fields that decide which counters a note adds to
+_COUNTED_FIELDS = ("is_public", "owner_id", "version_code", "start_verse_id")
+
+
+def _committed_value(target, key: str):
+    """The value of ``key`` as stored before this flush."""
+    history = inspect(target).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return history.unchanged[0] if history.unchanged else getattr(target, key)
+
+
+def _changed(target, keys: Iterable[str]) -> bool:
+    state = inspect(target)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
+@event.listens_for(User, "after_insert")
+def _index_new_user(mapper, connection, target: User) -> None:
+    replace_name_tokens(connection, target.id, target.display_name, target.email)
+
+
+@event.listens_for(User, "after_update")
+def _reindex_user(mapper, connection, target: User) -> None:
+    if _changed(target, ("display_name", "email")):
+        replace_name_tokens(connection, target.id, target.display_name, target.email)
+
+
+@event.listens_for(User, "before_delete")
+def _unindex_user(mapper, connection, target: User) -> None:
+    connection.execute(delete(UserNameToken).where(UserNameToken.user_id == target.id))
+    for counter in (AuthorNoteCount, AuthorVersionNoteCount, AuthorChapterNoteCount):
+        connection.execute(delete(counter).where(counter.author_id == target.id))
+
+
+@event.listens_for(Note, "after_insert")
+def _count_new_note(mapper, connection, target: Note) -> None:
+    if target.is_public:
+        add_public_notes(connection, target.owner_id, target.version_code, target.start_verse_id, 1)
+
+
+@event.listens_for(Note, "after_update")
+def _recount_note(mapper, connection, target: Note) -> None:
+    if not _changed(target, _COUNTED_FIELDS):
+        return
+    was_public, *old_key = (_committed_value(target, key) for key in _COUNTED_FIELDS)
+    if was_public:
+        add_public_notes(connection, *old_key, -1)
+    if target.is_public:
+        add_public_notes(connection, target.owner_id, target.version_code, target.start_verse_id, 1)
+
+
+@event.listens_for(Note, "after_delete")
+def _uncount_note(mapper, connection, target: Note) -> None:
+    was_public, *old_key = (_committed_value(target, key) for key in _COUNTED_FIELDS)
+    if was_public:
+        add_public_notes(connection, *old_key, -1)
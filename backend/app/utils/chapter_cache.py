@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..config import get_settings
+from ..schemas import BibleVersionRead, VerseRead
+from .reference_parser import book_key
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class CachedChapter:
+    version: BibleVersionRead
+    verses: Tuple[VerseRead, ...]
+
+
+class ChapterCache:
+    """LRU of seeded chapter text keyed by (content version, version code, book key, chapter).
+
+    Scripture text only changes when assets are re-seeded, which bumps
+    ``CONTENT_VERSION``, so entries never need explicit invalidation.
+    Backlinks are not cached here; they are joined per request.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str, int], CachedChapter]" = OrderedDict()
+
+    @staticmethod
+    def _key(version_code: str, book: str, chapter: int) -> Tuple[str, str, str, int]:
+        return settings.content_version, version_code, book_key(book), chapter
+
+    def get(self, version_code: str, book: str, chapter: int) -> Optional[CachedChapter]:
+        key = self._key(version_code, book, chapter)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def contains(self, version_code: str, book: str, chapter: int) -> bool:
+        return self._key(version_code, book, chapter) in self._entries
+
+    def put(self, version: BibleVersionRead, book: str, chapter: int, verses: List[VerseRead]) -> None:
+        if self.max_entries <= 0 or not verses:
+            return
+        key = self._key(version.code, book, chapter)
+        with self._lock:
+            self._entries[key] = CachedChapter(version=version, verses=tuple(verses))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+chapter_cache = ChapterCache(settings.chapter_cache_size)
@@ -0,0 +1,246 @@
+import html
+import logging
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Float, column, func, inspect, literal_column, select, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models import Note, User, Verse
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration used for every tsvector column and query
+TS_CONFIG = "english"
+
+VERSE_TSV_COLUMN = "text_tsv"
+NOTE_TSV_COLUMN = "search_tsv"
+
+# SQLite: external-content FTS5 index over the note table, kept in sync by triggers
+NOTE_FTS_TABLE = "note_fts"
+NOTE_FTS_COLUMNS = ("title", "content_markdown", "tags_text")
+# BM25 column weights, in NOTE_FTS_COLUMNS order: a title or tag hit outranks a body hit
+NOTE_FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Snippet highlight markers; control characters so the text can be HTML-escaped around them
+SNIPPET_START = "\x02"
+SNIPPET_STOP = "\x03"
+
+_WORDS_RE = re.compile(r"^[\w\s'-]+$", re.UNICODE)
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _quoted(table) -> str:
+    return f'"{table.__tablename__}"'
+
+
+def postgres_search_ddl() -> List[str]:
+    """Idempotent DDL adding tsvector columns, GIN indexes and trigram indexes on PostgreSQL.
+
+    The tsvector columns are generated (PostgreSQL 12+), so they stay in sync
+    with ``verse.text`` / ``note.title`` + ``note.content_markdown`` + ``note.tags_text``
+    without triggers.
+    """
+    verse, note, user = _quoted(Verse), _quoted(Note), _quoted(User)
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"ALTER TABLE {verse} ADD COLUMN IF NOT EXISTS {VERSE_TSV_COLUMN} tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{TS_CONFIG}', coalesce(text, ''))) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_verse_{VERSE_TSV_COLUMN} ON {verse} USING GIN ({VERSE_TSV_COLUMN})",
+        f"ALTER TABLE {note} ADD COLUMN IF NOT EXISTS {NOTE_TSV_COLUMN} tsvector "
+        f"GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce(content_markdown, '')), 'B') || "
+        f"setweight(to_tsvector('{TS_CONFIG}', replace(coalesce(tags_text, ''), ',', ' ')), 'A')) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_note_{NOTE_TSV_COLUMN} ON {note} USING GIN ({NOTE_TSV_COLUMN})",
+        # User search (ILIKE on display name / email) and author search (lower(coalesce(...)) LIKE)
+        f"CREATE INDEX IF NOT EXISTS ix_user_display_name_trgm ON {user} USING GIN (display_name gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS ix_user_email_trgm ON {user} USING GIN (email gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS ix_user_author_label_trgm ON {user} "
+        f"USING GIN (lower(coalesce(display_name, email)) gin_trgm_ops)",
+    ]
+
+
+def sqlite_search_ddl() -> List[str]:
+    """Idempotent DDL for the SQLite FTS5 note index and the triggers that maintain it.
+
+    The index stores no copy of the text (``content='note'``): it reads
+    snippets back from the note table. Every insert, delete and text update
+    of a note, ORM or raw SQL, updates it through the triggers.
+    """
+    note = _quoted(Note)
+    columns = ", ".join(NOTE_FTS_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in NOTE_FTS_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in NOTE_FTS_COLUMNS)
+    insert_new = f"INSERT INTO {NOTE_FTS_TABLE} (rowid, {columns}) VALUES (new.id, {new_values});"
+    delete_old = (
+        f"INSERT INTO {NOTE_FTS_TABLE} ({NOTE_FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {NOTE_FTS_TABLE} USING fts5({columns}, "
+        f"content='{Note.__tablename__}', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {NOTE_FTS_TABLE}_ai AFTER INSERT ON {note} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {NOTE_FTS_TABLE}_ad AFTER DELETE ON {note} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {NOTE_FTS_TABLE}_au AFTER UPDATE OF {columns} ON {note} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def sqlite_search_drop_ddl() -> List[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS {NOTE_FTS_TABLE}_au",
+        f"DROP TRIGGER IF EXISTS {NOTE_FTS_TABLE}_ad",
+        f"DROP TRIGGER IF EXISTS {NOTE_FTS_TABLE}_ai",
+        f"DROP TABLE IF EXISTS {NOTE_FTS_TABLE}",
+    ]
+
+
+def rebuild_note_search_index(conn: Connection) -> None:
+    """Re-read every note into the SQLite FTS5 index, then merge its segments.
+
+    For a fresh index, or after bulk loads that bypassed the triggers.
+    """
+    conn.execute(text(f"INSERT INTO {NOTE_FTS_TABLE} ({NOTE_FTS_TABLE}) VALUES ('rebuild')"))
+    conn.execute(text(f"INSERT INTO {NOTE_FTS_TABLE} ({NOTE_FTS_TABLE}) VALUES ('optimize')"))
+
+
+def install_sqlite_search_index(conn: Connection) -> None:
+    created = not inspect(conn).has_table(NOTE_FTS_TABLE)
+    for statement in sqlite_search_ddl():
+        conn.execute(text(statement))
+    if created:
+        # Index whatever notes the database already holds
+        rebuild_note_search_index(conn)
+
+
+def install_search_indexes(db_engine: Engine) -> None:
+    """Create the full-text and trigram search structures (PostgreSQL) or the FTS5 note index (SQLite)."""
+    if db_engine.dialect.name == "postgresql":
+        with db_engine.begin() as conn:
+            for statement in postgres_search_ddl():
+                conn.execute(text(statement))
+    elif db_engine.dialect.name == "sqlite":
+        try:
+            with db_engine.begin() as conn:
+                install_sqlite_search_index(conn)
+        except OperationalError as exc:
+            if "no such module: fts5" not in str(exc.orig):
+                raise
+            logger.warning("SQLite was built without FTS5; note search is unavailable")
+
+
+def has_note_search_index(bind: Engine | Connection) -> bool:
+    if bind.dialect.name == "postgresql":
+        return True
+    return bind.dialect.name == "sqlite" and inspect(bind).has_table(NOTE_FTS_TABLE)
+
+
+def supports_tsvector(bind: Engine | Connection) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def is_word_query(term: str) -> bool:
+    """True when ``term`` is plain words that a tsquery can match (no punctuation to preserve)."""
+    return bool(_WORDS_RE.match(term))
+
+
+def verse_text_matches(term: str) -> ColumnElement[bool]:
+    """``verse.text_tsv @@ plainto_tsquery(term)``, served by the GIN index."""
+    column = literal_column(f"{_quoted(Verse)}.{VERSE_TSV_COLUMN}")
+    return column.op("@@")(func.plainto_tsquery(TS_CONFIG, term))
+
+
+def note_text_matches(term: str) -> ColumnElement[bool]:
+    """``note.search_tsv @@ websearch_to_tsquery(term)``, served by the GIN index."""
+    column = literal_column(f"{_quoted(Note)}.{NOTE_TSV_COLUMN}")
+    return column.op("@@")(func.websearch_to_tsquery(TS_CONFIG, term))
+
+
+def note_text_rank(term: str) -> ColumnElement[float]:
+    """PostgreSQL relevance of a note for ``term``, higher is better (as float8 so cursors round-trip)."""
+    column = literal_column(f"{_quoted(Note)}.{NOTE_TSV_COLUMN}")
+    return func.ts_rank_cd(column, func.websearch_to_tsquery(TS_CONFIG, term), 1).cast(Float)
+
+
+def fts5_query(term: str) -> Optional[str]:
+    """User search text as an FTS5 query: every word must match, "quoted phrases"
+    match as phrases and a trailing ``*`` matches a prefix.
+
+    Only word characters reach FTS5, so operators and punctuation in user
+    input can never cause a query syntax error. None when there is no word.
+    """
+    parts: List[str] = []
+    for phrase, token in _QUERY_TOKEN_RE.findall(term):
+        if phrase:
+            words = _TERM_RE.findall(phrase)
+            if words:
+                parts.append('"' + " ".join(words) + '"')
+            continue
+        words = _TERM_RE.findall(token)
+        parts.extend(f'"{word}"' for word in words)
+        if words and token.endswith("*"):
+            parts[-1] += "*"
+    return " ".join(parts) or None
+
+
+def highlight_snippet(raw: Optional[str]) -> str:
+    """HTML-escape a snippet and turn the highlight markers into ``<mark>`` tags."""
+    escaped = html.escape(raw or "")
+    return escaped.replace(SNIPPET_START, "<mark>").replace(SNIPPET_STOP, "</mark>")
+
+
+def note_search_query(bind: Engine | Connection, term: str) -> Optional[Tuple[Select, ColumnElement[float]]]:
+    """``SELECT note.id, score`` over the notes matching ``term``, and the score expression.
+
+    Lower scores are better on both backends (FTS5 BM25 is negative; the
+    PostgreSQL rank is negated). Callers add filters, order by score and
+    limit, then fetch details and :func:`note_snippets` for that page only:
+    a common word can match most notes, and every extra join or snippet in
+    the ranking query is paid once per match. None when ``term`` has nothing
+    to search for.
+    """
+    if bind.dialect.name == "postgresql":
+        score = -note_text_rank(term)
+        return select(Note.id, score.label("score")).where(note_text_matches(term)), score
+
+    match = fts5_query(term)
+    if match is None:
+        return None
+    fts = table(NOTE_FTS_TABLE, column("rowid"))
+    fts_ref = literal_column(NOTE_FTS_TABLE)
+    score = func.bm25(fts_ref, *NOTE_FTS_WEIGHTS)
+    stmt = (
+        select(Note.id, score.label("score"))
+        .select_from(fts)
+        .join(Note, Note.id == fts.c.rowid)
+        .where(fts_ref.op("MATCH")(match))
+    )
+    return stmt, score
+
+
+def note_snippets(conn: Connection, term: str, note_ids: Sequence[int]) -> Dict[int, str]:
+    """Highlighted excerpts (raw, with the SNIPPET_* markers) for a page of search hits."""
+    if not note_ids:
+        return {}
+    if conn.dialect.name == "postgresql":
+        options = f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords=24, MinWords=8, MaxFragments=1"
+        headline = func.ts_headline(
+            TS_CONFIG,
+            func.coalesce(Note.title, "") + " " + Note.content_markdown,
+            func.websearch_to_tsquery(TS_CONFIG, term),
+            options,
+        )
+        return dict(conn.execute(select(Note.id, headline).where(Note.id.in_(list(note_ids)))).all())
+
+    fts = table(NOTE_FTS_TABLE, column("rowid"))
+    fts_ref = literal_column(NOTE_FTS_TABLE)
+    snippet = func.snippet(fts_ref, -1, SNIPPET_START, SNIPPET_STOP, "\u2026", 24)
+    return dict(
+        conn.execute(
+            select(fts.c.rowid, snippet).where(fts_ref.op("MATCH")(fts5_query(term)), fts.c.rowid.in_(list(note_ids)))
+        ).all()
+    )
@@ -0,0 +1,94 @@
+import hashlib
+from typing import Iterable, Optional, Tuple, Union
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import ChapterGeneration
+from .reference_parser import book_key
+
+settings = get_settings()
+
+
+class ChapterGenerations:
+    """Per-chapter counters bumped whenever notes or backlinks touching a chapter change.
+
+    Counters live in the ``chaptergeneration`` table and are bumped in the
+    transaction of the write, so every worker process (and a restarted one)
+    derives the same ETag from the committed state. Chapters are keyed by
+    ``book_key`` so that book-name variants (Psalm/Psalms) share one counter.
+    """
+
+    def get(self, db: Union[Session, Connection], book: str, chapter: int) -> int:
+        generation = db.execute(
+            select(ChapterGeneration.generation).where(
+                ChapterGeneration.book == book_key(book), ChapterGeneration.chapter == chapter
+            )
+        ).scalar()
+        return generation or 0
+
+    def bump(self, db: Union[Session, Connection], chapters: Iterable[Tuple[str, int]]) -> None:
+        """Increment the counters of ``chapters`` ((book, chapter) pairs) in the caller's transaction."""
+        keys = sorted({(book_key(book), chapter) for book, chapter in chapters})
+        if not keys:
+            return
+        dialect = db.get_bind().dialect.name if isinstance(db, Session) else db.dialect.name
+        upsert = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(ChapterGeneration).values(
+            [{"book": book, "chapter": chapter, "generation": 1} for book, chapter in keys]
+        )
+        db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["book", "chapter"],
+                set_={"generation": ChapterGeneration.generation + 1},
+            )
+        )
+
+    def bump_canonical(self, db: Union[Session, Connection], canonical_ids: Iterable[str]) -> None:
+        chapters = set()
+        for canonical_id in canonical_ids:
+            book, chapter, _ = canonical_id.split("|")
+            chapters.add((book, int(chapter)))
+        self.bump(db, chapters)
+
+
+chapter_generations = ChapterGenerations()
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag over the content version and the given identifying parts."""
+    raw = "|".join(str(p) for p in (settings.content_version, *parts))
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def static_cache_control() -> str:
+    return f"public, max-age={settings.static_cache_max_age}"
+
+
+def revalidate_cache_control(private: bool) -> str:
+    return f"{'private' if private else 'public'}, no-cache"
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str, cache_control: str
+) -> Optional[Response]:
+    """Apply validators to ``response``; return a 304 to send instead when the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,9 +1,13 @@
+from functools import lru_cache
+
 from markdown_it import MarkdownIt
 from bleach import clean
 import re
+from ..config import get_settings
 from .reference_parser import PAREN_CONTENT, tokenize_reference_text
 
 md = MarkdownIt("commonmark")
+settings = get_settings()
 
 
 def _linkify_parenthetical_refs(raw: str) -> str:
@@ -41,6 +45,18 @@ def _linkify_parenthetical_refs(raw: str) -> str:
 
 
 def render_markdown(text: str) -> str:
+    return _render_cached(text)
+
+
+def render_cache_info():
+    """functools cache statistics (hits, misses, maxsize, currsize) of the render cache."""
+    return _render_cached.cache_info()
+
+
+# Re-saving a note with unchanged content and bulk imports of repeated text skip the
+# markdown + bleach pass; hit/miss counts are exported on /metrics.
+@lru_cache(maxsize=settings.render_cache_size)
+def _render_cached(text: str) -> str:
     html = md.render(text)
     html = _linkify_parenthetical_refs(html)
     return clean(html, tags=[
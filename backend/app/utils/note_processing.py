@@ -0,0 +1,132 @@
+from collections import defaultdict
+from html import escape
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from ..database import get_session
+from ..jobs import JobContext, job_handler
+from ..models import Note, NoteCrossReference, Verse
+from .http_cache import chapter_generations
+from .markdown import render_markdown
+from .reference_graph import reference_graph
+from .reference_parser import extract_canonical_ids
+
+# Notes re-rendered and re-linked per transaction by the refresh_notes job
+REFRESH_BATCH_SIZE = 200
+
+
+def note_canonical_ids(note: Note) -> list[str]:
+    """Canonical ids whose chapters show this note (its anchor) or its backlinks (its citations)."""
+    ids = [ref.canonical_id for ref in note.cross_references]
+    if note.anchor_start:
+        ids.append(note.anchor_start.canonical_id)
+    return ids
+
+
+def _set_cross_references(note: Note, canonical_ids: Iterable[str], verse_ids: Dict[str, int]) -> None:
+    note.cross_references.clear()
+    for canonical_id in canonical_ids:
+        verse_id = verse_ids.get(canonical_id)
+        if verse_id is not None:
+            note.cross_references.append(NoteCrossReference(canonical_id=canonical_id, target_verse_id=verse_id))
+
+
+def apply_cross_references(session: Session, note: Note, version_code: str) -> None:
+    canonical_ids = list(dict.fromkeys(extract_canonical_ids(note.content_markdown)))
+    verse_ids: Dict[str, int] = {}
+    if canonical_ids:
+        verse_ids = dict(
+            session.exec(
+                select(Verse.canonical_id, Verse.id).where(
+                    Verse.version_code == version_code, Verse.canonical_id.in_(canonical_ids)
+                )
+            ).all()
+        )
+    _set_cross_references(note, canonical_ids, verse_ids)
+
+
+def relink_notes(session: Session, notes: Sequence[Note]) -> None:
+    """``apply_cross_references`` for many notes, with one verse lookup per version."""
+    cited: Dict[int, List[str]] = {}
+    wanted: Dict[str, Set[str]] = defaultdict(set)
+    for note in notes:
+        cited[note.id] = list(dict.fromkeys(extract_canonical_ids(note.content_markdown)))
+        wanted[note.version_code].update(cited[note.id])
+    verse_ids: Dict[Tuple[str, str], int] = {}
+    for version_code, canonical_ids in wanted.items():
+        if not canonical_ids:
+            continue
+        rows = session.exec(
+            select(Verse.canonical_id, Verse.id).where(
+                Verse.version_code == version_code, Verse.canonical_id.in_(sorted(canonical_ids))
+            )
+        ).all()
+        verse_ids.update(((version_code, canonical_id), verse_id) for canonical_id, verse_id in rows)
+    for note in notes:
+        version_ids = {cid: verse_ids[(note.version_code, cid)] for cid in cited[note.id] if (note.version_code, cid) in verse_ids}
+        _set_cross_references(note, cited[note.id], version_ids)
+
+
+def placeholder_html(markdown: str) -> str:
+    """Escaped plain-text paragraphs of a note body, shown until its render job replaces them."""
+    return "".join(f"<p>{escape(part.strip())}</p>" for part in markdown.split("\n\n") if part.strip())
+
+
+def _notes_with_links():
+    return select(Note).options(selectinload(Note.cross_references), selectinload(Note.anchor_start))
+
+
+@job_handler("process_note")
+def process_note(ctx: JobContext, payload: Dict[str, Any]) -> None:
+    """Render a note's Markdown and resolve its cross references after a deferred write."""
+    with get_session() as session:
+        note = session.exec(_notes_with_links().where(Note.id == payload["note_id"])).first()
+        if note is None:
+            # Deleted before its turn came
+            return
+        previous_ids = note_canonical_ids(note)
+        note.content_html = render_markdown(note.content_markdown)
+        apply_cross_references(session, note, note.version_code)
+        session.add(note)
+        chapter_generations.bump_canonical(session, previous_ids + note_canonical_ids(note))
+        graph_generation = reference_graph.bump(session)
+        session.commit()
+        session.refresh(note)
+        reference_graph.upsert_note(note, graph_generation)
+
+
+@job_handler("refresh_notes")
+def refresh_notes(ctx: JobContext, payload: Dict[str, Any]) -> None:
+    """Re-render and re-link every note (of ``payload["version_code"]`` when given).
+
+    For after a change to the Markdown renderer or sanitizer, or a re-seed of
+    a version's verses. Commits in batches in id order, saving the last id with
+    each, so a retry carries on from there.
+    """
+    version_code: Optional[str] = payload.get("version_code")
+    last_id = ctx.progress.get("last_id", 0)
+    refreshed = ctx.progress.get("refreshed", 0)
+    while True:
+        with get_session() as session:
+            stmt = _notes_with_links().where(Note.id > last_id).order_by(Note.id).limit(REFRESH_BATCH_SIZE)
+            if version_code:
+                stmt = stmt.where(Note.version_code == version_code)
+            notes = session.exec(stmt).all()
+            if not notes:
+                break
+            affected_ids: List[str] = []
+            for note in notes:
+                affected_ids += note_canonical_ids(note)
+                note.content_html = render_markdown(note.content_markdown)
+            relink_notes(session, notes)
+            for note in notes:
+                affected_ids += [ref.canonical_id for ref in note.cross_references]
+            session.flush()
+            last_id = notes[-1].id
+            refreshed += len(notes)
+            chapter_generations.bump_canonical(session, affected_ids)
+            # Every process holding a reference graph reloads it on next use
+            reference_graph.bump(session)
+            ctx.save_progress(session.connection(), last_id=last_id, refreshed=refreshed)
@@ -0,0 +1,475 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from ..config import get_settings
+from ..database import engine, get_read_session
+from ..jobs import JobContext, enqueue, job_handler, job_runner, queued_jobs
+from ..models import Job, Note, NoteCrossReference, Verse
+from ..responses import json_bytes
+from ..schemas import NoteImportJobRead, NoteTransferRecord
+from .author_index import count_public_notes
+from .http_cache import chapter_generations
+from .markdown import render_markdown
+from .reference_graph import GraphNote, reference_graph
+from .reference_parser import book_name_candidates, extract_canonical_ids, normalize_book
+from .tags import normalize_tags
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "markdown": "text/markdown; charset=utf-8"}
+
+# Canonical ids per IN (...) list when resolving anchors and citations
+_LOOKUP_BATCH = 2000
+
+# Rejected lines reported on a job; later ones are only counted
+MAX_REPORTED_ERRORS = 100
+
+NOTE_IMPORT_JOB = "note_import"
+
+
+def _export_pages(owner_id: int, page_size: int) -> Iterator[Sequence[Any]]:
+    """The owner's notes oldest first, a page at a time.
+
+    Each page is a keyset seek on ``ix_note_owner_id_created_at`` in its own
+    short read session, so a slow download neither holds a snapshot open nor
+    keeps more than one page in memory.
+    """
+    StartVerse = aliased(Verse)
+    EndVerse = aliased(Verse)
+    stmt = (
+        select(
+            Note.id,
+            Note.title,
+            Note.content_markdown,
+            Note.version_code,
+            StartVerse.book,
+            StartVerse.chapter.label("start_chapter"),
+            StartVerse.verse.label("start_verse"),
+            EndVerse.chapter.label("end_chapter"),
+            EndVerse.verse.label("end_verse"),
+            Note.is_public,
+            Note.tags_text,
+            Note.created_at,
+            Note.updated_at,
+        )
+        .join(StartVerse, StartVerse.id == Note.start_verse_id)
+        .join(EndVerse, EndVerse.id == Note.end_verse_id)
+        .where(Note.owner_id == owner_id)
+        .order_by(Note.created_at, Note.id)
+        .limit(page_size)
+    )
+    position = None
+    while True:
+        page = stmt if position is None else stmt.where(tuple_(Note.created_at, Note.id) > tuple_(*position))
+        with get_read_session() as session:
+            rows = session.exec(page).all()
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        position = (rows[-1].created_at, rows[-1].id)
+
+
+def _export_record(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "content_markdown": row.content_markdown,
+        "version_code": row.version_code,
+        "book": row.book,
+        "start_chapter": row.start_chapter,
+        "start_verse": row.start_verse,
+        "end_chapter": row.end_chapter,
+        "end_verse": row.end_verse,
+        "is_public": bool(row.is_public),
+        "tags": row.tags_text.split(",") if row.tags_text else [],
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def format_reference(book: str, start_chapter: int, start_verse: int, end_chapter: int, end_verse: int) -> str:
+    """"John 3:16", "John 3:16-18" or "John 3:16-4:2"."""
+    if (start_chapter, start_verse) == (end_chapter, end_verse):
+        return f"{book} {start_chapter}:{start_verse}"
+    if start_chapter == end_chapter:
+        return f"{book} {start_chapter}:{start_verse}-{end_verse}"
+    return f"{book} {start_chapter}:{start_verse}-{end_chapter}:{end_verse}"
+
+
+def _markdown_section(row: Any) -> str:
+    reference = format_reference(row.book, row.start_chapter, row.start_verse, row.end_chapter, row.end_verse)
+    details = [reference, row.version_code, "public" if row.is_public else "private"]
+    if row.tags_text:
+        details.append("tags: " + ", ".join(row.tags_text.split(",")))
+    details.append(row.created_at.date().isoformat())
+    return f"## {row.title or reference}\n\n*{' · '.join(details)}*\n\n{row.content_markdown.strip()}\n\n---\n\n"
+
+
+def export_notes(owner_id: int, fmt: str) -> Iterator[bytes]:
+    """Body of a notes export in ``fmt`` (a key of ``EXPORT_MEDIA_TYPES``), one chunk per page.
+
+    NDJSON lines are ``NoteTransferRecord`` objects and can be fed back to the
+    import; the Markdown document is for reading.
+    """
+    for rows in _export_pages(owner_id, settings.note_export_page_size):
+        if fmt == "markdown":
+            yield "".join(_markdown_section(row) for row in rows).encode("utf-8")
+        else:
+            yield b"".join(json_bytes(_export_record(row)) + b"\n" for row in rows)
+
+
+def _render_for_import(markdown: str) -> Tuple[str, List[str]]:
+    """HTML and cited canonical ids of one note body; runs in the render worker processes."""
+    return render_markdown(markdown), list(dict.fromkeys(extract_canonical_ids(markdown)))
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"] if part != "__root__")
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+async def spool_upload(chunks: AsyncIterator[bytes], max_bytes: int) -> Path:
+    """Write a request body to a temporary file as it arrives, refusing bodies over ``max_bytes``.
+
+    The import then reads the file line by line, so neither the upload nor the
+    job ever holds the whole body in memory.
+    """
+    fd, name = tempfile.mkstemp(prefix="note-import-", suffix=".ndjson")
+    path = Path(name)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Imports are limited to {max_bytes} bytes",
+                    )
+                out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+class NoteImportsBusy(Exception):
+    """Raised when the note import queue is full."""
+
+
+class _ImportProgress:
+    """Counters of an import, saved in its job's progress with every committed chunk."""
+
+    def __init__(self, saved: Dict[str, Any]) -> None:
+        # Lines up to here are committed or rejected; a retry skips them
+        self.lines_done: int = saved.get("lines_done", 0)
+        self.lines_read: int = saved.get("lines_read", 0)
+        self.imported: int = saved.get("imported", 0)
+        self.skipped: int = saved.get("skipped", 0)
+        self.errors: List[Dict[str, Any]] = list(saved.get("errors", []))
+
+    def reject(self, line: int, detail: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    def state(self, lines_done: int) -> Dict[str, Any]:
+        self.lines_done = lines_done
+        return {
+            "lines_done": lines_done,
+            "lines_read": self.lines_read,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class _Anchor:
+    verse_id: int
+    book: str
+    chapter: int
+    verse: int
+    canonical_id: str
+
+
+class NoteImporter:
+    """Imports NDJSON notes as ``note_import`` jobs.
+
+    At most ``queue_size`` imports wait or run at once before
+    :class:`NoteImportsBusy` is raised. Each chunk of lines resolves all its
+    verse anchors and citations in one lookup per version, renders its
+    Markdown in a process pool and is committed with bulk inserts together
+    with the job's progress, so a retried import resumes after the last
+    committed chunk instead of importing it twice.
+    """
+
+    def __init__(self, render_workers: int, queue_size: int, chunk_size: int) -> None:
+        self.render_workers = render_workers
+        self.queue_size = queue_size
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._renderer: Optional[Executor] = None
+
+    def _get_renderer(self) -> Executor:
+        with self._lock:
+            if self._renderer is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._renderer = ProcessPoolExecutor(
+                    max_workers=self.render_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._renderer
+
+    def submit(self, owner_id: int, path: Path) -> int:
+        """Queue the import of the NDJSON file at ``path``, which the job deletes when done; returns the job id."""
+        try:
+            with engine.begin() as conn:
+                if queued_jobs(conn, NOTE_IMPORT_JOB) >= self.queue_size:
+                    raise NoteImportsBusy()
+                job_id = enqueue(conn, NOTE_IMPORT_JOB, {"path": str(path)}, owner_id=owner_id)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        job_runner.notify()
+        return job_id
+
+    def run(self, ctx: JobContext, path: Path) -> None:
+        try:
+            self._import_file(ctx, path)
+        except Exception:
+            if ctx.final_attempt:
+                path.unlink(missing_ok=True)
+            raise
+        path.unlink(missing_ok=True)
+
+    def _import_file(self, ctx: JobContext, path: Path) -> None:
+        progress = _ImportProgress(ctx.progress)
+        batch: List[Tuple[int, NoteTransferRecord]] = []
+        line_no = progress.lines_done
+        with path.open("rb") as lines:
+            for line_no, raw in enumerate(lines, 1):
+                if line_no <= progress.lines_done or not raw.strip():
+                    continue
+                progress.lines_read += 1
+                try:
+                    batch.append((line_no, NoteTransferRecord.parse_raw(raw)))
+                except ValidationError as exc:
+                    progress.reject(line_no, _validation_detail(exc))
+                    continue
+                if len(batch) >= self.chunk_size:
+                    self._import_chunk(ctx, progress, batch, line_no)
+                    batch = []
+        if batch:
+            self._import_chunk(ctx, progress, batch, line_no)
+        elif line_no > progress.lines_done:
+            ctx.save_progress(**progress.state(line_no))
+
+    def _render(self, contents: List[str]) -> List[Tuple[str, List[str]]]:
+        if self.render_workers <= 0:
+            return [_render_for_import(text) for text in contents]
+        chunksize = max(1, len(contents) // (self.render_workers * 4))
+        return list(self._get_renderer().map(_render_for_import, contents, chunksize=chunksize))
+
+    def _import_chunk(
+        self,
+        ctx: JobContext,
+        progress: _ImportProgress,
+        batch: List[Tuple[int, NoteTransferRecord]],
+        last_line: int,
+    ) -> None:
+        # Distinct bodies only: exports of commentary often repeat boilerplate
+        contents = list(dict.fromkeys(record.content_markdown for _, record in batch))
+        rendered = dict(zip(contents, self._render(contents)))
+
+        # version -> canonical ids of every anchor candidate and citation in the chunk
+        wanted: Dict[str, Set[str]] = defaultdict(set)
+        for _, record in batch:
+            version_ids = wanted[record.version_code]
+            end_chapter, end_verse = _end_position(record)
+            for book in _book_names(record.book):
+                version_ids.add(f"{book}|{record.start_chapter}|{record.start_verse}")
+                version_ids.add(f"{book}|{end_chapter}|{end_verse}")
+            version_ids.update(rendered[record.content_markdown][1])
+
+        with engine.connect() as conn:
+            verses = _lookup_verses(conn, wanted)
+
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        # Per accepted row: (anchors, resolved citations)
+        links: List[Tuple[_Anchor, _Anchor, List[_Anchor]]] = []
+        for line_no, record in batch:
+            version = record.version_code
+            end_chapter, end_verse = _end_position(record)
+            start = end = None
+            for book in _book_names(record.book):
+                start = verses.get((version, f"{book}|{record.start_chapter}|{record.start_verse}"))
+                if start is not None:
+                    end = verses.get((version, f"{book}|{end_chapter}|{end_verse}"))
+                    break
+            if start is None:
+                progress.reject(line_no, f"Unknown verse {record.book} {record.start_chapter}:{record.start_verse} in {version}")
+                continue
+            if end is None:
+                progress.reject(line_no, f"Unknown verse {record.book} {end_chapter}:{end_verse} in {version}")
+                continue
+            if (start.chapter, start.verse) > (end.chapter, end.verse):
+                progress.reject(line_no, "Start verse must be before end verse")
+                continue
+
+            content_html, cited_ids = rendered[record.content_markdown]
+            tags = ",".join(record.tags) if isinstance(record.tags, list) else record.tags
+            created_at = record.created_at or now
+            rows.append(
+                {
+                    "owner_id": ctx.owner_id,
+                    "title": record.title,
+                    "content_markdown": record.content_markdown,
+                    "content_html": content_html,
+                    "version_code": version,
+                    "start_verse_id": start.verse_id,
+                    "end_verse_id": end.verse_id,
+                    "is_public": record.is_public,
+                    "tags_text": normalize_tags(tags),
+                    "created_at": created_at,
+                    "updated_at": record.updated_at or created_at,
+                }
+            )
+            cited = [verses[(version, cid)] for cid in cited_ids if (version, cid) in verses]
+            links.append((start, end, cited))
+
+        if not rows:
+            ctx.save_progress(**progress.state(last_line))
+            return
+        progress.imported += len(rows)
+        with engine.begin() as conn:
+            note_ids = conn.execute(insert(Note).returning(Note.id, sort_by_parameter_order=True), rows).scalars().all()
+            references = [
+                {"note_id": note_id, "canonical_id": target.canonical_id, "target_verse_id": target.verse_id}
+                for note_id, (_, _, cited) in zip(note_ids, links)
+                for target in cited
+            ]
+            if references:
+                conn.execute(insert(NoteCrossReference), references)
+            # Core inserts skip the ORM listeners that keep the author counters current
+            count_public_notes(
+                conn,
+                ctx.owner_id,
+                ((row["version_code"], start.book, start.chapter) for row, (start, _, _) in zip(rows, links) if row["is_public"]),
+            )
+            chapter_generations.bump_canonical(
+                conn,
+                (
+                    canonical_id
+                    for start, _, cited in links
+                    for canonical_id in (start.canonical_id, *(target.canonical_id for target in cited))
+                ),
+            )
+            graph_generation = reference_graph.bump(conn)
+            ctx.save_progress(conn, **progress.state(last_line))
+
+        reference_graph.add_notes(
+            (
+                GraphNote(
+                    note_id=note_id,
+                    owner_id=ctx.owner_id,
+                    is_public=bool(row["is_public"]),
+                    title=row["title"],
+                    version_code=row["version_code"],
+                    anchor_start=start.canonical_id,
+                    anchor_end=end.canonical_id,
+                    targets=tuple(target.canonical_id for target in cited),
+                )
+                for note_id, row, (start, end, cited) in zip(note_ids, rows, links)
+            ),
+            graph_generation,
+        )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            renderer, self._renderer = self._renderer, None
+        if renderer is not None:
+            renderer.shutdown(wait=False, cancel_futures=True)
+
+
+def _end_position(record: NoteTransferRecord) -> Tuple[int, int]:
+    end_chapter = record.end_chapter if record.end_chapter is not None else record.start_chapter
+    end_verse = record.end_verse if record.end_verse is not None else record.start_verse
+    return end_chapter, end_verse
+
+
+def _book_names(book: str) -> List[str]:
+    """Names a verse of ``book`` may be stored under: as given, then its canonical spelling and variants."""
+    return list(dict.fromkeys([book, *book_name_candidates(normalize_book(book))]))
+
+
+def _lookup_verses(conn: Connection, wanted: Dict[str, Set[str]]) -> Dict[Tuple[str, str], _Anchor]:
+    """(version, canonical id) -> verse, for the wanted canonical ids of each version that exist.
+
+    Canonical ids are ``book|chapter|verse`` in the version's own book names,
+    so this one ``ix_verse_version_canonical_id`` lookup resolves anchors given
+    by reference as well as citations.
+    """
+    found: Dict[Tuple[str, str], _Anchor] = {}
+    for version_code, canonical_ids in wanted.items():
+        ordered = sorted(canonical_ids)
+        for offset in range(0, len(ordered), _LOOKUP_BATCH):
+            rows = conn.execute(
+                select(Verse.id, Verse.book, Verse.chapter, Verse.verse, Verse.canonical_id).where(
+                    Verse.version_code == version_code,
+                    Verse.canonical_id.in_(ordered[offset : offset + _LOOKUP_BATCH]),
+                )
+            ).all()
+            for verse_id, book, chapter, verse, canonical_id in rows:
+                found[(version_code, canonical_id)] = _Anchor(verse_id, book, chapter, verse, canonical_id)
+    return found
+
+
+note_importer = NoteImporter(
+    settings.note_import_render_workers, settings.note_import_queue_size, settings.note_import_chunk_size
+)
+
+
+@job_handler(NOTE_IMPORT_JOB)
+def _run_note_import(ctx: JobContext, payload: Dict[str, Any]) -> None:
+    note_importer.run(ctx, Path(payload["path"]))
+
+
+def import_job_read(session: Session, job_id: int, owner_id: int) -> Optional[NoteImportJobRead]:
+    """Status of one of ``owner_id``'s imports, or None."""
+    job = session.get(Job, job_id)
+    if job is None or job.kind != NOTE_IMPORT_JOB or job.owner_id != owner_id:
+        return None
+    progress = job.progress or {}
+    return NoteImportJobRead(
+        id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+        lines_read=progress.get("lines_read", 0),
+        imported=progress.get("imported", 0),
+        skipped=progress.get("skipped", 0),
+        errors=progress.get("errors", []),
+        detail=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
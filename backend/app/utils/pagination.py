@@ -0,0 +1,107 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import func, tuple_
+from sqlmodel import Session
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def page_size(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)) -> int:
+    return limit
+
+
+def _pack(value: str, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{value}|{row_id}".encode()).decode().rstrip("=")
+
+
+def _unpack(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value, row_id = raw.rsplit("|", 1)
+        return value, int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque cursor for the (timestamp, id) position of the last row on a page."""
+    return _pack(timestamp.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    value, row_id = _unpack(cursor)
+    try:
+        return datetime.fromisoformat(value), row_id
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    """Opaque cursor for the (relevance score, id) position of the last search hit on a page."""
+    # repr() round-trips a float exactly, so the next page resumes at the same row
+    return _pack(repr(score), row_id)
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, int]:
+    value, row_id = _unpack(cursor)
+    try:
+        return float(value), row_id
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_name_cursor(token: str, row_id: int) -> str:
+    """Opaque cursor for the (name token, id) position of the last name-search result on a page."""
+    return _pack(token, row_id)
+
+
+def decode_name_cursor(cursor: str) -> Tuple[str, int]:
+    return _unpack(cursor)
+
+
+def encode_count_cursor(count: int, row_id: int) -> str:
+    """Opaque cursor for the (counter, id) position of the last row of a most-first listing."""
+    return _pack(str(count), row_id)
+
+
+def decode_count_cursor(cursor: str) -> Tuple[int, int]:
+    value, row_id = _unpack(cursor)
+    try:
+        return int(value), row_id
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def count_rows(session: Session, stmt) -> int:
+    """``COUNT(*)`` over a filtered select, without its ordering or eager loads."""
+    return session.exec(stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)).one()
+
+
+def keyset_page(
+    session: Session,
+    stmt,
+    timestamp_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """One page of ``stmt`` newest first on (timestamp, id), and the cursor of the next page.
+
+    Seeks past the cursor instead of using OFFSET, so every page costs the same
+    index range scan however deep the client pages. ``id`` breaks ties between
+    rows written within the same timestamp.
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(timestamp_column, id_column) < tuple_(*decode_cursor(cursor)))
+    rows: Sequence[Any] = session.exec(
+        stmt.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+    ).all()
+    if len(rows) <= limit:
+        return list(rows), None
+    last = rows[limit - 1]
+    return list(rows[:limit]), encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
@@ -0,0 +1,347 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from ..models import GraphGeneration, Note, NoteCrossReference, Verse
+
+
+@dataclass
+class GraphNote:
+    note_id: int
+    owner_id: int
+    is_public: bool
+    title: Optional[str]
+    version_code: str
+    anchor_start: str
+    anchor_end: str
+    targets: Tuple[str, ...]
+
+
+@dataclass
+class GraphResult:
+    # (canonical_id, depth) for verses, (GraphNote, depth) for notes
+    verses: List[Tuple[str, int]]
+    notes: List[Tuple[GraphNote, int]]
+    # (note_id, canonical_id, kind) where kind is "anchors" or "cites"
+    edges: List[Tuple[int, str, str]]
+    truncated: bool
+
+
+def _chapter_key(canonical_id: str) -> Tuple[str, int]:
+    book, chapter, _ = canonical_id.split("|")
+    return book, int(chapter)
+
+
+def _position(canonical_id: str) -> Tuple[int, int]:
+    _, chapter, verse = canonical_id.split("|")
+    return int(chapter), int(verse)
+
+
+def _anchor_chapters(entry: GraphNote) -> List[Tuple[str, int]]:
+    # Notes stay within a single book, so the anchor range covers whole chapters in between
+    book, first = _chapter_key(entry.anchor_start)
+    last = _position(entry.anchor_end)[0]
+    return [(book, chapter) for chapter in range(first, last + 1)]
+
+
+def _anchors(entry: GraphNote, canonical_id: str) -> bool:
+    """True when ``canonical_id`` lies within the note's anchor range."""
+    if _chapter_key(canonical_id)[0] != _chapter_key(entry.anchor_start)[0]:
+        return False
+    return _position(entry.anchor_start) <= _position(canonical_id) <= _position(entry.anchor_end)
+
+
+class ReferenceGraph:
+    """In-memory adjacency index over notes and the verses they anchor to and cite.
+
+    Verses are keyed by canonical id (``book|chapter|verse``) so that notes written
+    against different versions meet on the same verse nodes, matching how chapter
+    backlinks are resolved. A note anchors every verse of its range, found through
+    the chapters the range spans, so a note on John 3:16-18 is reached from 3:17.
+    The index is loaded lazily from the database on first use. Every note write bumps
+    the ``graphgeneration`` counter in its transaction (:meth:`bump`); the index
+    reloads when the counter has moved past what it reflects, so writes committed
+    by other worker processes or a separate job runner show up on the next read.
+    Writes of this process are applied in place through ``upsert_note``/``remove_note``
+    with the generation they bumped to, which avoids the reload when no other
+    process wrote in between.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loaded = False
+        # Generation of the committed notes the index reflects
+        self._generation = 0
+        self._notes: Dict[int, GraphNote] = {}
+        self._cited_by: Dict[str, Set[int]] = {}
+        # (book, chapter) -> notes whose anchor range covers some of that chapter
+        self._anchored: Dict[Tuple[str, int], Set[int]] = {}
+        self._by_chapter: Dict[Tuple[str, int], Set[str]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def reset(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._clear()
+
+    def _clear(self) -> None:
+        self._notes.clear()
+        self._cited_by.clear()
+        self._anchored.clear()
+        self._by_chapter.clear()
+
+    @staticmethod
+    def generation(db: Union[Session, Connection]) -> int:
+        return db.execute(select(GraphGeneration.generation).where(GraphGeneration.id == 1)).scalar() or 0
+
+    @staticmethod
+    def bump(db: Union[Session, Connection]) -> int:
+        """Increment the generation in the caller's transaction and return the new value.
+
+        Pass the value to ``upsert_note``/``remove_note``/``add_notes`` once committed.
+        """
+        dialect = db.get_bind().dialect.name if isinstance(db, Session) else db.dialect.name
+        upsert = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(GraphGeneration).values(
+            id=1, generation=1
+        )
+        return db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["id"], set_={"generation": GraphGeneration.generation + 1}
+            ).returning(GraphGeneration.generation)
+        ).scalar_one()
+
+    def ensure_loaded(self, session: Session) -> None:
+        current = self.generation(session)
+        if self._loaded and current == self._generation:
+            return
+        with self._lock:
+            if self._loaded and current == self._generation:
+                return
+            self._clear()
+            # Read before the notes: a write committed in between only causes another reload
+            self._load(session)
+            self._generation = current
+            self._loaded = True
+
+    def _load(self, session: Session) -> None:
+        StartVerse = aliased(Verse)
+        EndVerse = aliased(Verse)
+        rows = session.exec(
+            select(
+                Note.id,
+                Note.owner_id,
+                Note.is_public,
+                Note.title,
+                Note.version_code,
+                StartVerse.canonical_id,
+                EndVerse.canonical_id,
+            )
+            .join(StartVerse, StartVerse.id == Note.start_verse_id)
+            .join(EndVerse, EndVerse.id == Note.end_verse_id)
+        ).all()
+
+        targets: Dict[int, List[str]] = {}
+        for note_id, canonical_id in session.exec(
+            select(NoteCrossReference.note_id, NoteCrossReference.canonical_id)
+        ).all():
+            targets.setdefault(note_id, []).append(canonical_id)
+
+        for note_id, owner_id, is_public, title, version_code, start_cid, end_cid in rows:
+            self._add(
+                GraphNote(
+                    note_id=note_id,
+                    owner_id=owner_id,
+                    is_public=bool(is_public),
+                    title=title,
+                    version_code=version_code,
+                    anchor_start=start_cid,
+                    anchor_end=end_cid,
+                    targets=tuple(dict.fromkeys(targets.get(note_id, []))),
+                )
+            )
+
+    def _index_verse(self, canonical_id: str) -> None:
+        self._by_chapter.setdefault(_chapter_key(canonical_id), set()).add(canonical_id)
+
+    def _add(self, entry: GraphNote) -> None:
+        self._notes[entry.note_id] = entry
+        for chapter_key in _anchor_chapters(entry):
+            self._anchored.setdefault(chapter_key, set()).add(entry.note_id)
+        self._index_verse(entry.anchor_start)
+        for canonical_id in entry.targets:
+            self._cited_by.setdefault(canonical_id, set()).add(entry.note_id)
+            self._index_verse(canonical_id)
+
+    def _discard(self, note_id: int) -> None:
+        entry = self._notes.pop(note_id, None)
+        if entry is None:
+            return
+        for chapter_key in _anchor_chapters(entry):
+            anchored = self._anchored.get(chapter_key)
+            if anchored is not None:
+                anchored.discard(note_id)
+                if not anchored:
+                    del self._anchored[chapter_key]
+        for canonical_id in entry.targets:
+            citing = self._cited_by.get(canonical_id)
+            if citing is not None:
+                citing.discard(note_id)
+                if not citing:
+                    del self._cited_by[canonical_id]
+
+    def _apply(self, generation: int) -> bool:
+        """Whether a write committed at ``generation`` still needs applying; advances past it
+        when it directly follows what the index reflects. Call with the lock held.
+        """
+        # Before the first load the database is the source of truth, and a load
+        # at or after ``generation`` already contains the write
+        if not self._loaded or generation <= self._generation:
+            return False
+        if generation == self._generation + 1:
+            self._generation = generation
+        return True
+
+    def upsert_note(self, note: Note, generation: int) -> None:
+        """Reflect a committed note (with anchors and cross references loaded)."""
+        with self._lock:
+            if not self._apply(generation):
+                return
+            if not note.anchor_start or not note.anchor_end:
+                return
+            self._discard(note.id)
+            self._add(
+                GraphNote(
+                    note_id=note.id,
+                    owner_id=note.owner_id,
+                    is_public=bool(note.is_public),
+                    title=note.title,
+                    version_code=note.version_code,
+                    anchor_start=note.anchor_start.canonical_id,
+                    anchor_end=note.anchor_end.canonical_id,
+                    targets=tuple(dict.fromkeys(ref.canonical_id for ref in note.cross_references)),
+                )
+            )
+
+    def add_notes(self, entries: Iterable[GraphNote], generation: int) -> None:
+        """Reflect notes committed in bulk, without loading them back as ORM objects."""
+        with self._lock:
+            if not self._apply(generation):
+                return
+            for entry in entries:
+                self._discard(entry.note_id)
+                self._add(entry)
+
+    def _anchored_at(self, canonical_id: str) -> Set[int]:
+        return {
+            note_id
+            for note_id in self._anchored.get(_chapter_key(canonical_id), ())
+            if _anchors(self._notes[note_id], canonical_id)
+        }
+
+    def remove_note(self, note_id: int, generation: int) -> None:
+        with self._lock:
+            if self._apply(generation):
+                self._discard(note_id)
+
+    def passage_verses(
+        self, book: str, chapter: int, verse: Optional[int] = None, end_verse: Optional[int] = None
+    ) -> List[str]:
+        """Canonical ids within a chapter (optionally a verse span) that have graph edges.
+
+        Verses inside a note's anchor range count; for a whole chapter one seed per
+        range (its first verse in the chapter) is enough to reach the note.
+        """
+        with self._lock:
+            members = set(self._by_chapter.get((book, chapter), ()))
+            ranges = [self._notes[note_id] for note_id in self._anchored.get((book, chapter), ())]
+        if verse is None:
+            for entry in ranges:
+                first_chapter, first_verse = _position(entry.anchor_start)
+                members.add(f"{book}|{chapter}|{first_verse if first_chapter == chapter else 1}")
+            return sorted(members, key=lambda cid: int(cid.rsplit("|", 1)[1]))
+        last = end_verse if end_verse is not None else verse
+        return [
+            canonical_id
+            for canonical_id in (f"{book}|{chapter}|{v}" for v in range(verse, last + 1))
+            if canonical_id in members or any(_anchors(entry, canonical_id) for entry in ranges)
+        ]
+
+    def neighbourhood(
+        self,
+        seeds: Iterable[str],
+        depth: int,
+        viewer_id: Optional[int],
+        max_nodes: int,
+    ) -> GraphResult:
+        """Breadth-first walk from seed verses, alternating verse -> note -> verse.
+
+        A note is reachable from any verse of its anchor range and from the verses
+        it cites; from a note we continue to its anchor and to every verse it cites. Each edge is one hop.
+        Notes the viewer cannot see are skipped entirely.
+        """
+
+        def visible(entry: GraphNote) -> bool:
+            return entry.is_public or (viewer_id is not None and entry.owner_id == viewer_id)
+
+        with self._lock:
+            verse_depth: Dict[str, int] = {}
+            note_depth: Dict[int, int] = {}
+            edges: Set[Tuple[int, str, str]] = set()
+            truncated = False
+            queue: deque = deque()
+
+            for canonical_id in seeds:
+                if canonical_id not in verse_depth:
+                    verse_depth[canonical_id] = 0
+                    queue.append(("verse", canonical_id, 0))
+
+            while queue:
+                kind, key, hops = queue.popleft()
+                if hops >= depth:
+                    continue
+                if kind == "verse":
+                    anchored = self._anchored_at(key)
+                    note_ids = anchored | self._cited_by.get(key, set())
+                    for note_id in sorted(note_ids):
+                        entry = self._notes.get(note_id)
+                        if entry is None or not visible(entry):
+                            continue
+                        if note_id not in note_depth:
+                            if len(verse_depth) + len(note_depth) >= max_nodes:
+                                truncated = True
+                                continue
+                            note_depth[note_id] = hops + 1
+                            queue.append(("note", note_id, hops + 1))
+                        edge_kind = "anchors" if note_id in anchored else "cites"
+                        edges.add((note_id, key, edge_kind))
+                else:
+                    entry = self._notes[key]
+                    neighbours = [(entry.anchor_start, "anchors")]
+                    neighbours.extend((cid, "cites") for cid in entry.targets)
+                    for canonical_id, edge_kind in neighbours:
+                        if canonical_id not in verse_depth:
+                            if len(verse_depth) + len(note_depth) >= max_nodes:
+                                truncated = True
+                                continue
+                            verse_depth[canonical_id] = hops + 1
+                            queue.append(("verse", canonical_id, hops + 1))
+                        edges.add((key, canonical_id, edge_kind))
+
+            return GraphResult(
+                verses=list(verse_depth.items()),
+                notes=[(self._notes[note_id], d) for note_id, d in note_depth.items()],
+                edges=sorted(edges),
+                truncated=truncated,
+            )
+
+
+reference_graph = ReferenceGraph()
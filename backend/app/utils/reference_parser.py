@@ -100,6 +100,18 @@ BOOK_ALIASES = {
     "re": "Revelation",
 }
 
+# Book names that differ between Bible assets for the same book (e.g., Psalms vs Psalm)
+BOOK_NAME_VARIANTS = {
+    "Psalms": ["Psalm"],
+    "Psalm": ["Psalms"],
+    # Song of Solomon aliases
+    "Song of Solomon": ["Song of Songs", "Canticles", "Song", "Songs"],
+    "Song of Songs": ["Song of Solomon", "Canticles", "Song", "Songs"],
+    "Canticles": ["Song of Solomon", "Song of Songs", "Song", "Songs"],
+    "Song": ["Songs", "Song of Solomon", "Song of Songs", "Canticles"],
+    "Songs": ["Song", "Song of Solomon", "Song of Songs", "Canticles"],
+}
+
 # Matches a single scripture reference, e.g., "Romans 1:1-3" or "1 Cor 5:7"
 REFERENCE_REGEX = re.compile(
     r"\b(?P<book>(?:[1-3]?\s?[A-Za-z]+)|(?:[1-3][A-Za-z]+)|(?:[A-Za-z]+))\s+(?P<chapter>\d+)(?::(?P<verse>\d+)(?:-(?P<endverse>\d+))?)?",
@@ -108,6 +120,13 @@ REFERENCE_REGEX = re.compile(
 CHAPTER_VERSE_REGEX = re.compile(r"(?P<chapter>\d+):(?P<verse>\d+)(?:-(?P<endverse>\d+))?", re.IGNORECASE)
 VERSE_ONLY_REGEX = re.compile(r"(?P<verse>\d+)(?:-(?P<endverse>\d+))?")
 
+# A passage reference part, e.g. "Rom 5:1-8:39", "John 3", "Gen 1-3", "3:16-18" or "18"
+PASSAGE_PART_REGEX = re.compile(
+    r"^\s*(?:(?P<book>(?:[1-3]\s?)?[A-Za-z][A-Za-z ]*?)\s*(?=\d))?"
+    r"(?P<chapter>\d+)(?::(?P<verse>\d+))?"
+    r"(?:\s*-\s*(?:(?P<endchapter>\d+):)?(?P<end>\d+))?\s*$"
+)
+
 # Extracts text inside parentheses; we only treat references in parentheses as backlinks
 PAREN_CONTENT = re.compile(r"\(([^)]{0,1000})\)")
 
@@ -126,11 +145,39 @@ class VerseReference:
             yield f"{self.book}|{self.chapter}|{verse}"
 
 
+@dataclass
+class PassageRange:
+    """A contiguous span of one book; ``None`` verses mean the start/end of the chapter."""
+
+    book: str
+    start_chapter: int
+    start_verse: Optional[int]
+    end_chapter: int
+    end_verse: Optional[int]
+    raw: str = ""
+
+
 def normalize_book(name: str) -> str:
     key = name.lower().replace(" ", "")
     return BOOK_ALIASES.get(key, name.title())
 
 
+def book_name_candidates(book: str) -> List[str]:
+    """The requested book name followed by its known asset-name variants."""
+    return [book, *BOOK_NAME_VARIANTS.get(book, [])]
+
+
+def fold_book_name(name: str) -> str:
+    """Loose comparison form of a book name: lowercase alphanumerics without a leading 'the'."""
+    raw = "".join(ch for ch in (name or "").lower() if ch.isalnum())
+    return raw[3:] if raw.startswith("the") else raw
+
+
+def book_key(book: str) -> str:
+    """Stable key shared by a book name and all of its variants."""
+    return min(fold_book_name(b) for b in book_name_candidates(book))
+
+
 def _append_reference(
     tokens: List[Tuple[str, Optional[VerseReference]]],
     text: str,
@@ -274,6 +321,62 @@ def parse_references(text: str) -> List[VerseReference]:
     return references
 
 
+def parse_passage(text: str) -> List[PassageRange]:
+    """Parse comma/semicolon separated passage references such as "Rom 5:1-8:39, 12:1-2; John 3".
+
+    Like parenthetical references, later parts may omit the book (and, after a
+    verse reference, the chapter). Raises ValueError on unparseable input.
+    """
+    ranges: List[PassageRange] = []
+    last_book: Optional[str] = None
+    last_chapter: Optional[int] = None
+    last_had_verse = False
+
+    for part in re.split(r"[;,]", text or ""):
+        if not part.strip():
+            continue
+        match = PASSAGE_PART_REGEX.match(part)
+        if not match:
+            raise ValueError(f"Unrecognised reference: {part.strip()}")
+
+        book_raw = match.group("book")
+        chapter = int(match.group("chapter"))
+        verse = match.group("verse")
+        endchapter = match.group("endchapter")
+        end = match.group("end")
+
+        if book_raw and book_raw.strip():
+            book = normalize_book(book_raw.strip())
+        elif last_book:
+            book = last_book
+            # "John 3:16, 18" -> the bare number is a verse of the previous chapter
+            if last_had_verse and verse is None and last_chapter is not None:
+                verse, end, endchapter = str(chapter), end, None
+                chapter = last_chapter
+        else:
+            raise ValueError(f"Missing book in reference: {part.strip()}")
+
+        if verse is None:
+            # Whole chapter(s): "John 3" or "Gen 1-3"
+            end_chapter = int(end) if end else chapter
+            passage = PassageRange(book, chapter, None, end_chapter, None, raw=part.strip())
+        elif endchapter is not None:
+            passage = PassageRange(book, chapter, int(verse), int(endchapter), int(end), raw=part.strip())
+        else:
+            last_verse = int(end) if end else int(verse)
+            passage = PassageRange(book, chapter, int(verse), chapter, last_verse, raw=part.strip())
+
+        if (passage.end_chapter, passage.end_verse or 0) < (passage.start_chapter, passage.start_verse or 0):
+            raise ValueError(f"Reference ends before it starts: {part.strip()}")
+
+        ranges.append(passage)
+        last_book = book
+        last_chapter = passage.end_chapter
+        last_had_verse = passage.end_verse is not None
+
+    return ranges
+
+
 def extract_canonical_ids(text: str) -> List[str]:
     ids: List[str] = []
     for reference in parse_references(text):
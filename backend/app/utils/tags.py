@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+def normalize_tags(raw: Optional[str]) -> str:
+    """Normalize a comma-separated tag string to a canonical, deduped form.
+    - trim whitespace, lowercase
+    - remove empties
+    - preserve first-seen order
+    Returns a single comma-joined string (stored in DB as Note.tags_text).
+    """
+    if not raw:
+        return ""
+    parts = [p.strip().lower() for p in raw.split(",")]
+    parts = [p for p in parts if p]
+    # dedupe while preserving order
+    seen: set[str] = set()
+    normalized: list[str] = []
+    for p in parts:
+        if p not in seen:
+            seen.add(p)
+            normalized.append(p)
+    return ",".join(normalized)
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event
+
+from ..config import get_settings
+from ..models import User
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    user_id: int
+    email: str
+    display_name: Optional[str]
+    # time.monotonic() deadline: the token's own expiry or the cache TTL, whichever is sooner
+    expires_at: float
+
+    def to_user(self) -> User:
+        """Detached, read-only ``User`` for handlers; the password hash is deliberately not cached."""
+        return User(id=self.user_id, email=self.email, display_name=self.display_name, hashed_password="")
+
+
+class TokenCache:
+    """LRU of verified bearer tokens -> user snapshot, so repeat requests skip JWT decoding and the user lookup.
+
+    Only tokens that decoded to an existing user are cached. Entries live at
+    most ``ttl`` seconds and are dropped as soon as the user row is updated or
+    deleted in this process; other workers see such changes within ``ttl``.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, user: User, token_expires_in: float) -> None:
+        if self.max_entries <= 0 or self.ttl <= 0 or user.id is None:
+            return
+        entry = CachedToken(
+            user_id=user.id,
+            email=user.email,
+            display_name=user.display_name,
+            expires_at=time.monotonic() + min(self.ttl, token_expires_in),
+        )
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry.user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry.user_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+
+token_cache = TokenCache(settings.token_cache_size, settings.token_cache_ttl)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_tokens(mapper, connection, target: User) -> None:
+    # Profile, password and account changes must not be served from a stale snapshot
+    if target.id is not None:
+        token_cache.invalidate_user(target.id)
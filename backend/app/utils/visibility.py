@@ -0,0 +1,22 @@
+from typing import Optional
+
+from sqlalchemy import or_
+
+from ..models import Note
+
+
+def note_visible_to(viewer_id: Optional[int]):
+    """SQL predicate: public notes, plus the viewer's own when signed in.
+
+    Meant as a row filter checked after a query's own selective lookup (the
+    chapter's verses, a cross-reference target, an author) has found the
+    candidate notes, so hidden notes are dropped before any eager loading. It
+    is phrased so that no index can serve it: without ANALYZE statistics SQLite
+    otherwise drives the whole query from ``ix_note_is_public_owner_id``,
+    taking ``is_public = 1`` for a selective condition although most notes are
+    public. Listings that really are "public notes of these owners" should
+    filter on ``Note.is_public.is_(True)`` directly and use that index.
+    """
+    if viewer_id is None:
+        return Note.is_public.isnot(False)
+    return or_(Note.is_public.isnot(False), (Note.owner_id + 0) == viewer_id)
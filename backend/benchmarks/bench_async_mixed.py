@@ -0,0 +1,239 @@
+"""Latency of chapter reads while slow concordance searches run concurrently, sync vs async handlers.
+
+Seeds a synthetic SQLite database, then starts the API under uvicorn twice -
+once with the default sync handlers and once with ``ASYNC_READS=true`` - and
+drives the same mixed workload against each: ``--search-clients`` clients loop
+over concordance searches for rare words (full LIKE scans) while
+``--read-clients`` clients loop over chapter, notes-by-chapter and backlink
+reads. With enough searches in flight the sync handlers exhaust the request
+threadpool (40 threads) and reads queue behind them; the report shows
+p50/p95/p99 per request kind for both modes.
+
+Usage:
+    python backend/benchmarks/bench_async_mixed.py
+    python backend/benchmarks/bench_async_mixed.py --duration 20 --search-clients 80 --json bench_async_mixed.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+try:
+    from backend.app.models import BibleVersion, Verse
+except ModuleNotFoundError:
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from backend.app.models import BibleVersion, Verse
+
+logger = logging.getLogger(__name__)
+
+BOOKS = ["Genesis", "Exodus", "Psalms", "Isaiah", "Matthew", "John", "Romans", "Revelation"]
+WORDS = "and the of unto in that he shall said lord god land people house went came".split()
+# Rare words: every search scans the whole version but returns a handful of hits
+SEARCH_TERMS = "jubilee tabernacle ephod shewbread urim thummim".split()
+
+
+def seed_database(path: Path, chapters: int, verses: int) -> None:
+    rng = random.Random(7)
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(BibleVersion(code="KJV", name="King James Version", language="English"))
+        session.commit()
+        rows = [
+            {
+                "version_code": "KJV",
+                "book": book,
+                "chapter": chapter,
+                "verse": verse,
+                "canonical_id": f"{book}|{chapter}|{verse}",
+                "text": " ".join(rng.choices(WORDS, k=18) + ([rng.choice(SEARCH_TERMS)] if rng.random() < 0.01 else [])),
+            }
+            for book in BOOKS
+            for chapter in range(1, chapters + 1)
+            for verse in range(1, verses + 1)
+        ]
+        session.execute(insert(Verse), rows)
+        session.commit()
+    engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: Path, async_reads: bool, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        ASYNC_READS="true" if async_reads else "false",
+        # Measure handler scheduling, not the chapter cache
+        CHAPTER_CACHE_SIZE="0",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+def read_path(rng: random.Random, chapters: int, verses: int) -> tuple[str, str]:
+    book = rng.choice(BOOKS)
+    chapter = rng.randint(1, chapters)
+    kind = rng.choice(["chapter", "chapter", "notes", "backlinks"])
+    if kind == "chapter":
+        return kind, f"/bible/KJV/{book}/{chapter}"
+    if kind == "notes":
+        return kind, f"/notes/KJV/{book}/{chapter}"
+    return kind, f"/notes/backlinks/KJV/{book}/{chapter}/{rng.randint(1, verses)}"
+
+
+async def run_workload(
+    base_url: str, duration: float, search_clients: int, read_clients: int, chapters: int, verses: int
+) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {"chapter": [], "notes": [], "backlinks": [], "concordance": []}
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=search_clients + read_clients + 4)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await wait_ready(client)
+
+        async def searcher(seed: int) -> None:
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                r = await client.get("/bible/KJV/concordance", params={"q": rng.choice(SEARCH_TERMS), "limit": 50})
+                samples["concordance"].append((time.perf_counter() - started) * 1000)
+                errors += r.status_code != 200
+
+        async def reader(seed: int) -> None:
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.monotonic() < stop_at:
+                kind, path = read_path(rng, chapters, verses)
+                started = time.perf_counter()
+                r = await client.get(path)
+                samples[kind].append((time.perf_counter() - started) * 1000)
+                errors += r.status_code >= 500
+
+        await asyncio.gather(
+            *(searcher(i) for i in range(search_clients)),
+            *(reader(1000 + i) for i in range(read_clients)),
+        )
+    if errors:
+        logger.warning("%d requests failed", errors)
+    return samples
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples: Dict[str, List[float]], duration: float) -> Dict[str, Dict[str, float]]:
+    summary: Dict[str, Dict[str, float]] = {}
+    for kind, values in samples.items():
+        if not values:
+            continue
+        summary[kind] = {
+            "requests": len(values),
+            "rps": round(len(values) / duration, 1),
+            "p50_ms": round(statistics.median(values), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+        }
+    return summary
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        seed_database(db_path, args.chapters, args.verses)
+        for mode, async_reads in (("sync", False), ("async", True)):
+            port = free_port()
+            server = start_server(db_path, async_reads, port)
+            try:
+                samples = asyncio.run(
+                    run_workload(
+                        f"http://127.0.0.1:{port}",
+                        args.duration,
+                        args.search_clients,
+                        args.read_clients,
+                        args.chapters,
+                        args.verses,
+                    )
+                )
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+            results[mode] = summarize(samples, args.duration)
+            for kind, stats in results[mode].items():
+                logger.info(
+                    "%-5s %-11s %6d req %7.1f rps | p50 %8.1f ms  p95 %8.1f ms  p99 %8.1f ms",
+                    mode,
+                    kind,
+                    stats["requests"],
+                    stats["rps"],
+                    stats["p50_ms"],
+                    stats["p95_ms"],
+                    stats["p99_ms"],
+                )
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async read handlers under a mixed workload")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per mode")
+    parser.add_argument("--search-clients", type=int, default=60, help="Concurrent concordance clients")
+    parser.add_argument("--read-clients", type=int, default=20, help="Concurrent chapter/notes/backlink clients")
+    parser.add_argument("--chapters", type=int, default=50, help="Chapters per synthetic book")
+    parser.add_argument("--verses", type=int, default=30, help="Verses per synthetic chapter")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = run(args)
+    if args.json_path:
+        args.json_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        logger.info("Wrote %s", args.json_path)
+
+
+if __name__ == "__main__":
+    main()
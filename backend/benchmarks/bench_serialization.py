@@ -0,0 +1,222 @@
+"""Serialization time and bytes-on-wire for the large response models.
+
+Compares FastAPI's default path (response-model revalidation, ``jsonable_encoder``
+and the stdlib ``JSONResponse``) with ``FastJSONResponse`` rendering the model
+directly, and reports identity/gzip/brotli sizes of the encoded body.
+
+Usage:
+    python backend/benchmarks/bench_serialization.py
+    python backend/benchmarks/bench_serialization.py --repeat 20 --json bench_serialization.json
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    from backend.app.responses import FastJSONResponse
+    from backend.app.schemas import (
+        BacklinkRead,
+        BibleChapterResponse,
+        BibleVersionRead,
+        ConcordanceHit,
+        ConcordanceResponse,
+        NoteRead,
+        UserProfileRead,
+        VerseWithBacklinks,
+    )
+except ModuleNotFoundError:
+    ROOT_DIR = Path(__file__).resolve().parents[2]
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from backend.app.responses import FastJSONResponse
+    from backend.app.schemas import (
+        BacklinkRead,
+        BibleChapterResponse,
+        BibleVersionRead,
+        ConcordanceHit,
+        ConcordanceResponse,
+        NoteRead,
+        UserProfileRead,
+        VerseWithBacklinks,
+    )
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+VERSE_TEXT = (
+    "And God said, Let there be light: and there was light. And God saw the light, that it was good: "
+    "and God divided the light from the darkness."
+)
+
+
+def build_chapter(verses: int = 80, backlinks_per_verse: int = 6) -> BibleChapterResponse:
+    return BibleChapterResponse(
+        version=BibleVersionRead(code="KJV", name="King James Version", language="English"),
+        book="Psalms",
+        chapter=119,
+        verses=[
+            VerseWithBacklinks(
+                id=v,
+                version_code="KJV",
+                book="Psalms",
+                chapter=119,
+                verse=v,
+                canonical_id=f"Psalms|119|{v}",
+                text=VERSE_TEXT,
+                backlinks=[
+                    BacklinkRead(
+                        note_id=v * 100 + b,
+                        note_title=f"Note {b} on verse {v}",
+                        note_owner_name="John Gill",
+                        note_owner_id=1,
+                        note_is_public=True,
+                        source_book="Romans",
+                        source_chapter=b + 1,
+                        source_verse=v % 30 + 1,
+                    )
+                    for b in range(backlinks_per_verse)
+                ],
+            )
+            for v in range(1, verses + 1)
+        ],
+    )
+
+
+def build_concordance(hits: int = 5000) -> ConcordanceResponse:
+    return ConcordanceResponse(
+        query="light",
+        version_code="KJV",
+        total=hits,
+        total_occurrences=hits * 2,
+        hits=[
+            ConcordanceHit(book="Genesis", chapter=i // 30 + 1, verse=i % 30 + 1, text=VERSE_TEXT, occurrences=2)
+            for i in range(hits)
+        ],
+    )
+
+
+def build_profile(notes: int = 2000) -> UserProfileRead:
+    now = datetime(2024, 1, 1)
+    return UserProfileRead(
+        id=1,
+        email="gill@example.com",
+        display_name="John Gill",
+        avatar_url="https://ui-avatars.com/api/?name=JG",
+        note_count=notes,
+        notes=[
+            NoteRead(
+                id=i,
+                title=f"Exposition {i}",
+                content_markdown=VERSE_TEXT * 4,
+                content_html=f"<p>{VERSE_TEXT * 4}</p>",
+                version_code="KJV",
+                start_verse_id=i,
+                end_verse_id=i + 2,
+                is_public=True,
+                owner_id=1,
+                owner_display_name="John Gill",
+                start_book="Genesis",
+                start_chapter=i // 30 + 1,
+                start_verse=i % 30 + 1,
+                end_book="Genesis",
+                end_chapter=i // 30 + 1,
+                end_verse=i % 30 + 3,
+                created_at=now + timedelta(minutes=i),
+                updated_at=now + timedelta(minutes=i),
+                cross_references=["Romans|5|1", "John|3|16"],
+                verses_text=[f"1:{n} {VERSE_TEXT}" for n in range(3)],
+                tags=["exposition", "gill"],
+            )
+            for i in range(notes)
+        ],
+    )
+
+
+def default_path(model) -> bytes:
+    # Mirrors FastAPI's serialize_response: revalidate against the response model, then encode
+    validated = type(model).validate(model)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def fast_path(model) -> bytes:
+    return FastJSONResponse(model).body
+
+
+def time_call(fn: Callable[[], bytes], repeat: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def wire_sizes(body: bytes) -> Dict[str, int]:
+    sizes = {"identity": len(body), "gzip": len(gzip.compress(body, compresslevel=6))}
+    if brotli is not None:
+        sizes["br"] = len(brotli.compress(body, quality=4))
+    return sizes
+
+
+def run(repeat: int) -> Dict[str, Dict[str, object]]:
+    payloads = {
+        "BibleChapterResponse": build_chapter(),
+        "ConcordanceResponse": build_concordance(),
+        "UserProfileRead": build_profile(),
+    }
+    results: Dict[str, Dict[str, object]] = {}
+    for name, model in payloads.items():
+        before = time_call(lambda: default_path(model), repeat)
+        after = time_call(lambda: fast_path(model), repeat)
+        results[name] = {
+            "before": {**before, "bytes": wire_sizes(default_path(model))},
+            "after": {**after, "bytes": wire_sizes(fast_path(model))},
+            "speedup": round(before["median_ms"] / after["median_ms"], 2) if after["median_ms"] else None,
+        }
+        logger.info(
+            "%-22s before %8.2f ms %9d B | after %8.2f ms %9d B (gzip %d, br %s) | x%s",
+            name,
+            before["median_ms"],
+            results[name]["before"]["bytes"]["identity"],
+            after["median_ms"],
+            results[name]["after"]["bytes"]["identity"],
+            results[name]["after"]["bytes"]["gzip"],
+            results[name]["after"]["bytes"].get("br", "n/a"),
+            results[name]["speedup"],
+        )
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark response serialization and compression")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed repetitions per payload")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run(args.repeat)
+    if args.json_path:
+        args.json_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        logger.info("Wrote %s", args.json_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Regression check: every query issued by the API endpoints is served by an index.
+
+Runs ``backend/tests/test_query_plans.py`` (part of the test suite) with its
+per-endpoint report logged: one line per endpoint, plus the ``EXPLAIN QUERY
+PLAN`` of every statement of an endpoint that scans a table without an index
+(of every statement with ``--verbose``).
+
+Exits non-zero when any endpoint regresses, so it can run in CI.
+
+Usage:
+    python backend/benchmarks/check_query_plans.py
+    python backend/benchmarks/check_query_plans.py --verbose
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+TEST_FILE = Path(__file__).resolve().parents[1] / "tests" / "test_query_plans.py"
+
+
+def run(verbose: bool) -> int:
+    # Only the report: quiet the libraries that log every request or migration
+    for name in ("alembic", "httpx", "passlib"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    return int(
+        pytest.main(
+            [
+                str(TEST_FILE),
+                "-q",
+                "-p",
+                "no:cacheprovider",
+                "-o",
+                "log_cli=true",
+                "--log-cli-format=%(message)s",
+                f"--log-cli-level={'DEBUG' if verbose else 'INFO'}",
+                "-W",
+                "ignore",
+            ]
+        )
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that API endpoint queries are index-backed")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and its plan")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sys.exit(run(args.verbose))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare two ``run.py`` result files and flag regressions.
+
+A benchmark regresses when its metric (median by default) in the candidate run
+is more than ``--threshold`` slower than in the baseline, or when it reports
+errors the baseline did not. Benchmarks or sizes missing from either file are
+listed but never fail the comparison.
+
+Exits 1 when anything regressed, so it can gate CI.
+
+Usage:
+    python backend/benchmarks/compare.py baseline.json candidate.json
+    python backend/benchmarks/compare.py baseline.json candidate.json --metric p95_ms --threshold 0.2
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRICS = ["median_ms", "p95_ms", "min_ms", "mean_ms"]
+
+
+def load(path: Path) -> Dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(baseline: Dict, candidate: Dict, metric: str, threshold: float) -> Tuple[List[str], List[str]]:
+    """(report lines, regressed "size/benchmark" labels)."""
+    lines, regressions = [], []
+    lines.append(
+        f"baseline {baseline['meta'].get('revision')} vs candidate {candidate['meta'].get('revision')} ({metric})"
+    )
+    for size in sorted(set(baseline["sizes"]) | set(candidate["sizes"])):
+        if size not in baseline["sizes"] or size not in candidate["sizes"]:
+            lines.append(f"{size:<7} only in {'baseline' if size in baseline['sizes'] else 'candidate'}")
+            continue
+        before_all = baseline["sizes"][size]["benchmarks"]
+        after_all = candidate["sizes"][size]["benchmarks"]
+        for name in sorted(set(before_all) | set(after_all)):
+            label = f"{size}/{name}"
+            if name not in before_all or name not in after_all:
+                lines.append(f"{size:<7} {name:<24} only in {'baseline' if name in before_all else 'candidate'}")
+                continue
+            before, after = before_all[name], after_all[name]
+            change = (after[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+            new_errors = after.get("errors", 0) > before.get("errors", 0)
+            status = "ok"
+            if change > threshold or new_errors:
+                status = "REGRESSED"
+                regressions.append(label)
+            elif change < -threshold:
+                status = "improved"
+            lines.append(
+                f"{size:<7} {name:<24} {before[metric]:10.3f} -> {after[metric]:10.3f} ms  {change:+7.1%}  {status}"
+                + (f" ({after['errors']} errors)" if new_errors else "")
+            )
+    return lines, regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", type=Path, help="Results of the reference run")
+    parser.add_argument("candidate", type=Path, help="Results of the run under test")
+    parser.add_argument("--metric", choices=METRICS, default="median_ms", help="Statistic to compare")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown as a fraction (0.10 = 10%%)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    lines, regressions = compare(load(args.baseline), load(args.candidate), args.metric, args.threshold)
+    for line in lines:
+        logger.info(line)
+    if regressions:
+        logger.error("%d benchmark(s) regressed by more than %.0f%%: %s", len(regressions), args.threshold * 100,
+                     ", ".join(regressions))
+        sys.exit(1)
+    logger.info("No regressions beyond %.0f%%", args.threshold * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Synthetic but realistically shaped databases for the benchmarks.
+
+A fixture has ``versions`` Bible versions over the same canonical verses,
+``users`` authors (a quarter of them subscribed to a handful of others),
+``notes`` notes with tags and parenthetical cross references, and a
+verse-by-verse commentary imported through the John Gill importer. Everything
+is derived from a fixed seed, so two runs at the same size build identical
+databases.
+
+Usage:
+    python backend/benchmarks/fixtures.py /tmp/bench.db --size medium
+"""
+
+import argparse
+import logging
+import random
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+try:
+    from backend.app.auth import get_password_hash
+    from backend.app.database import init_db, seed_engine
+    from backend.app.models import BibleVersion, Note, NoteCrossReference, User, UserNoteSubscription, Verse
+    from backend.app.utils.author_index import rebuild_author_index
+    from backend.app.utils.markdown import render_markdown
+    from backend.app.utils.reference_parser import extract_canonical_ids
+    from backend.seeds.import_john_gill import insert_entries, parse_john_gill_text
+except ModuleNotFoundError:
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from backend.app.auth import get_password_hash
+    from backend.app.database import init_db, seed_engine
+    from backend.app.models import BibleVersion, Note, NoteCrossReference, User, UserNoteSubscription, Verse
+    from backend.app.utils.author_index import rebuild_author_index
+    from backend.app.utils.markdown import render_markdown
+    from backend.app.utils.reference_parser import extract_canonical_ids
+    from backend.seeds.import_john_gill import insert_entries, parse_john_gill_text
+
+logger = logging.getLogger(__name__)
+
+BOOKS = ["Genesis", "Exodus", "Psalms", "Isaiah", "Matthew", "John", "Romans", "Revelation"]
+VERSION_CODES = ["KJV", "ASV", "WEB", "YLT", "DBY"]
+WORDS = (
+    "and the of unto in that he shall said lord god land people house went came king son day "
+    "heart light word spirit grace faith hope water earth heaven"
+).split()
+TAGS = ["prayer", "covenant", "grace", "prophecy", "law", "wisdom", "gospel", "creation", "sermon", "study"]
+# Rare words give the concordance selective searches alongside the common ones
+RARE_WORDS = ["jubilee", "tabernacle", "ephod", "shewbread"]
+PASSWORD = "bench-password"
+COMMENTARY_BOOK = "Genesis"
+
+
+@dataclass(frozen=True)
+class FixtureSize:
+    versions: int
+    users: int
+    notes: int
+    chapters: int
+    verses: int
+    subscriptions_per_user: int = 5
+
+
+SIZES: Dict[str, FixtureSize] = {
+    "small": FixtureSize(versions=1, users=20, notes=500, chapters=10, verses=20),
+    "medium": FixtureSize(versions=2, users=200, notes=10_000, chapters=30, verses=25),
+    "large": FixtureSize(versions=3, users=1_000, notes=50_000, chapters=50, verses=30),
+}
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """What the benchmarks need to address the generated data."""
+
+    size: FixtureSize
+    version_codes: List[str]
+    books: List[str]
+    # The most connected user: owns notes and subscribes to other authors
+    bench_user_id: int
+    # A verse that many notes cross-reference: (book, chapter, verse)
+    hot_verse: Tuple[str, int, int]
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def _reference(rng: random.Random, size: FixtureSize) -> str:
+    book = rng.choice(BOOKS)
+    chapter = rng.randint(1, size.chapters)
+    start = rng.randint(1, size.verses)
+    if rng.random() < 0.3 and start < size.verses:
+        return f"{book} {chapter}:{start}-{min(size.verses, start + rng.randint(1, 3))}"
+    return f"{book} {chapter}:{start}"
+
+
+def _note_markdown(rng: random.Random, size: FixtureSize, hot_ref: str) -> str:
+    sentences = []
+    for _ in range(rng.randint(2, 5)):
+        sentences.append(" ".join(rng.choices(WORDS, k=rng.randint(8, 20))).capitalize() + ".")
+    refs = [_reference(rng, size) for _ in range(rng.randint(0, 3))]
+    if rng.random() < 0.2:
+        refs.append(hot_ref)
+    body = " ".join(sentences)
+    if refs:
+        body += f" See ({'; '.join(refs)})."
+    if rng.random() < 0.3:
+        body = f"## {rng.choice(WORDS).title()}\n\n{body}\n\n- **{rng.choice(WORDS)}**\n- _{rng.choice(WORDS)}_"
+    return body
+
+
+def _seed_verses(session: Session, size: FixtureSize, rng: random.Random) -> List[str]:
+    codes = VERSION_CODES[: size.versions]
+    for code in codes:
+        session.add(BibleVersion(code=code, name=f"{code} (synthetic)", language="English"))
+    session.commit()
+    for code in codes:
+        rows = [
+            {
+                "version_code": code,
+                "book": book,
+                "chapter": chapter,
+                "verse": verse,
+                "canonical_id": f"{book}|{chapter}|{verse}",
+                "text": " ".join(
+                    rng.choices(WORDS, k=rng.randint(12, 30)) + ([rng.choice(RARE_WORDS)] if rng.random() < 0.01 else [])
+                ),
+            }
+            for book in BOOKS
+            for chapter in range(1, size.chapters + 1)
+            for verse in range(1, size.verses + 1)
+        ]
+        session.execute(insert(Verse), rows)
+    session.commit()
+    return codes
+
+
+def _seed_users(session: Session, size: FixtureSize, rng: random.Random) -> List[int]:
+    # One bcrypt hash shared by every synthetic user keeps fixture builds fast
+    hashed = get_password_hash(PASSWORD)
+    session.execute(
+        insert(User),
+        [
+            {"email": f"user{i}@bench.example", "hashed_password": hashed, "display_name": f"Reader {i}"}
+            for i in range(1, size.users + 1)
+        ],
+    )
+    session.commit()
+    user_ids = list(session.exec(select(User.id).order_by(User.id)).all())
+    subscribers = user_ids[: max(1, len(user_ids) // 4)]
+    rows = []
+    for subscriber in subscribers:
+        authors = [uid for uid in user_ids if uid != subscriber]
+        for author in rng.sample(authors, min(size.subscriptions_per_user, len(authors))):
+            rows.append({"subscriber_id": subscriber, "author_id": author})
+    if rows:
+        session.execute(insert(UserNoteSubscription), rows)
+    session.commit()
+    return user_ids
+
+
+def _seed_notes(
+    session: Session, size: FixtureSize, rng: random.Random, codes: List[str], user_ids: List[int], hot_ref: str
+) -> None:
+    verse_ids: Dict[Tuple[str, str], int] = {
+        (code, canonical_id): verse_id
+        for verse_id, code, canonical_id in session.exec(select(Verse.id, Verse.version_code, Verse.canonical_id)).all()
+    }
+    canonical_ids = sorted({canonical_id for _, canonical_id in verse_ids})
+    # Activity is skewed: the first tenth of users write half the notes
+    prolific = user_ids[: max(1, len(user_ids) // 10)]
+    started = datetime(2024, 1, 1)
+    batch = 2_000
+    for offset in range(0, size.notes, batch):
+        notes, markdowns = [], []
+        for i in range(offset, min(size.notes, offset + batch)):
+            code = rng.choice(codes)
+            start = rng.choice(canonical_ids)
+            markdown = _note_markdown(rng, size, hot_ref)
+            created = started + timedelta(minutes=i * 7)
+            notes.append(
+                {
+                    "owner_id": rng.choice(prolific) if rng.random() < 0.5 else rng.choice(user_ids),
+                    "title": " ".join(rng.choices(WORDS, k=3)).title() if rng.random() < 0.7 else None,
+                    "content_markdown": markdown,
+                    "content_html": render_markdown(markdown),
+                    "version_code": code,
+                    "start_verse_id": verse_ids[(code, start)],
+                    "end_verse_id": verse_ids[(code, start)],
+                    "is_public": rng.random() < 0.7,
+                    "tags_text": ",".join(sorted(rng.sample(TAGS, rng.randint(0, 3)))),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+            markdowns.append(markdown)
+        result = session.execute(insert(Note).returning(Note.id, Note.version_code), notes)
+        refs = []
+        for (note_id, code), markdown in zip(result.all(), markdowns):
+            for canonical_id in dict.fromkeys(extract_canonical_ids(markdown)):
+                target = verse_ids.get((code, canonical_id))
+                if target:
+                    refs.append({"note_id": note_id, "canonical_id": canonical_id, "target_verse_id": target})
+        if refs:
+            session.execute(insert(NoteCrossReference), refs)
+        session.commit()
+
+
+def _commentary_text(rng: random.Random, size: FixtureSize, hot_ref: str) -> str:
+    # No chapter headings: the importer starts a new chapter at each "Ver. 1."
+    lines = []
+    for _ in range(size.chapters):
+        for verse in range(1, size.verses + 1):
+            lines.append(f"Ver. {verse}. {_note_markdown(rng, size, hot_ref)}")
+    return "\n".join(lines)
+
+
+def _import_commentary(session: Session, size: FixtureSize, rng: random.Random, codes: List[str], hot_ref: str) -> None:
+    user = User(email="commentary@bench.example", hashed_password=get_password_hash(PASSWORD), display_name="Commentary")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    entries = parse_john_gill_text(_commentary_text(rng, size, hot_ref))
+    insert_entries(session, user=user, version_code=codes[0], book=COMMENTARY_BOOK, entries=entries)
+
+
+def build_fixture(db_path: Path, size: FixtureSize, seed: int = 7) -> Fixture:
+    """Create ``db_path`` (which must not exist yet) and fill it for ``size``."""
+    if db_path.exists():
+        raise FileExistsError(f"{db_path} already exists")
+    rng = random.Random(seed)
+    engine = seed_engine(db_path)
+    init_db(engine)
+    hot_verse = ("John", 1, 1)
+    hot_ref = f"{hot_verse[0]} {hot_verse[1]}:{hot_verse[2]}"
+    with Session(engine) as session:
+        codes = _seed_verses(session, size, rng)
+        user_ids = _seed_users(session, size, rng)
+        _seed_notes(session, size, rng, codes, user_ids, hot_ref)
+        _import_commentary(session, size, rng, codes, hot_ref)
+        # The Core bulk inserts above bypass the ORM listeners that maintain it
+        rebuild_author_index(session.connection())
+        session.commit()
+    engine.dispose()
+    return Fixture(size=size, version_codes=codes, books=BOOKS, bench_user_id=user_ids[0], hot_verse=hot_verse)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build a synthetic benchmark database")
+    parser.add_argument("db", type=Path, help="SQLite database file to create")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Fixture size preset")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    fixture = build_fixture(args.db, SIZES[args.size], seed=args.seed)
+    logger.info("Built %s fixture at %s: %s", args.size, args.db, fixture.to_dict())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Load test: a reader/writer traffic mix against a locally launched API.
+
+Builds a synthetic database (``fixtures.py``), starts the app under uvicorn on
+a free local port and runs ``--users`` virtual users for ``--duration``
+seconds. Each virtual user logs in once, then loops: pick an operation from
+the weighted mix, run it, optionally pause ``--think-ms``. Operations:
+
+    chapter        anonymous chapter read
+    note_crud      create, update and delete one of the user's own notes
+    concordance    concordance search (common and rare words)
+    subscriptions  the user's subscription feed
+    login          password login (bcrypt)
+
+The report gives throughput, p50/p95/p99 latency and error rate per endpoint,
+both logged and (with ``--json``) written to a file. Nothing outside this
+machine is contacted.
+
+Usage:
+    python backend/benchmarks/loadtest.py
+    python backend/benchmarks/loadtest.py --users 50 --duration 60 --size medium --workers 2
+    python backend/benchmarks/loadtest.py --mix chapter=70,note_crud=10,concordance=5,subscriptions=10,login=5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+try:
+    from backend.benchmarks.bench_async_mixed import free_port, percentile, wait_ready
+    from backend.benchmarks.fixtures import PASSWORD, SIZES, WORDS, Fixture, build_fixture
+except ModuleNotFoundError:
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from backend.benchmarks.bench_async_mixed import free_port, percentile, wait_ready
+    from backend.benchmarks.fixtures import PASSWORD, SIZES, WORDS, Fixture, build_fixture
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ["chapter", "note_crud", "concordance", "subscriptions", "login"]
+DEFAULT_MIX = "chapter=50,note_crud=15,concordance=10,subscriptions=15,login=10"
+SEARCH_TERMS = ["grace", "light", "spirit", "jubilee", "tabernacle", "ephod"]
+
+
+class Recorder:
+    """Latency samples (ms) and error counts per endpoint label."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    async def request(
+        self, client: httpx.AsyncClient, label: str, method: str, url: str, expect: int = 200, **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed = (time.perf_counter() - started) * 1000
+        if self.recording:
+            self.samples[label].append(elapsed)
+            if response is None or response.status_code != expect:
+                self.errors[label] += 1
+        return response
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        summary: Dict[str, Dict[str, float]] = {}
+        for label in sorted(self.samples):
+            values = self.samples[label]
+            summary[label] = {
+                "requests": len(values),
+                "rps": round(len(values) / duration, 1),
+                "error_rate": round(self.errors[label] / len(values), 4),
+                "p50_ms": round(statistics.median(values), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+            }
+        return summary
+
+
+class VirtualUser:
+    def __init__(self, index: int, client: httpx.AsyncClient, fixture: Fixture, recorder: Recorder) -> None:
+        self.rng = random.Random(index)
+        self.client = client
+        self.fixture = fixture
+        self.recorder = recorder
+        self.email = f"user{index % fixture.size.users + 1}@bench.example"
+        self.headers: Dict[str, str] = {}
+
+    async def login(self) -> None:
+        response = await self.recorder.request(
+            self.client, "POST /auth/login", "POST", "/auth/login", json={"email": self.email, "password": PASSWORD}
+        )
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def chapter(self) -> None:
+        size = self.fixture.size
+        path = (
+            f"/bible/{self.rng.choice(self.fixture.version_codes)}/{self.rng.choice(self.fixture.books)}"
+            f"/{self.rng.randint(1, size.chapters)}"
+        )
+        await self.recorder.request(self.client, "GET /bible/{version}/{book}/{chapter}", "GET", path)
+
+    async def note_crud(self) -> None:
+        size = self.fixture.size
+        verse_id = self.rng.randint(1, len(self.fixture.books) * size.chapters * size.verses)
+        body = {
+            "title": "Load test",
+            "content_markdown": f"{' '.join(self.rng.choices(WORDS, k=40))} (John 3:16; Rom 8:28)",
+            "version_code": self.fixture.version_codes[0],
+            "start_verse_id": verse_id,
+            "end_verse_id": verse_id,
+            "is_public": self.rng.random() < 0.5,
+            "tags": "loadtest",
+        }
+        created = await self.recorder.request(
+            self.client, "POST /notes", "POST", "/notes", expect=201, json=body, headers=self.headers
+        )
+        if created is None or created.status_code != 201:
+            return
+        note_id = created.json()["id"]
+        await self.recorder.request(
+            self.client,
+            "PUT /notes/{id}",
+            "PUT",
+            f"/notes/{note_id}",
+            json={"content_markdown": body["content_markdown"] + " (Gen 1:1)"},
+            headers=self.headers,
+        )
+        await self.recorder.request(
+            self.client, "DELETE /notes/{id}", "DELETE", f"/notes/{note_id}", expect=204, headers=self.headers
+        )
+
+    async def concordance(self) -> None:
+        await self.recorder.request(
+            self.client,
+            "GET /bible/{version}/concordance",
+            "GET",
+            f"/bible/{self.fixture.version_codes[0]}/concordance",
+            params={"q": self.rng.choice(SEARCH_TERMS), "limit": 50},
+        )
+
+    async def subscriptions(self) -> None:
+        await self.recorder.request(
+            self.client, "GET /notes/subscriptions/notes", "GET", "/notes/subscriptions/notes", headers=self.headers
+        )
+
+    def operations(self) -> Dict[str, Callable[[], Awaitable[None]]]:
+        return {
+            "chapter": self.chapter,
+            "note_crud": self.note_crud,
+            "concordance": self.concordance,
+            "subscriptions": self.subscriptions,
+            "login": self.login,
+        }
+
+    async def run(self, mix: Dict[str, int], stop_at: float, think_ms: float) -> None:
+        operations = self.operations()
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        while time.monotonic() < stop_at:
+            await operations[self.rng.choices(names, weights)[0]]()
+            if think_ms:
+                await asyncio.sleep(self.rng.expovariate(1000 / think_ms))
+
+
+def parse_mix(raw: str) -> Dict[str, int]:
+    """Parse "operation=weight,..." into weights, rejecting unknown operations."""
+    mix: Dict[str, int] = {}
+    for item in raw.split(","):
+        name, sep, weight = item.partition("=")
+        name = name.strip()
+        if not sep or name not in OPERATIONS or not weight.strip().isdigit():
+            raise SystemExit(f"Bad mix entry '{item}'. Use operation=weight with operations: {', '.join(OPERATIONS)}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise SystemExit("The traffic mix needs at least one positive weight")
+    return mix
+
+
+def start_server(db_path: Path, port: int, workers: int, extra_env: Dict[str, str], log_file) -> subprocess.Popen:
+    # Virtual users share one client IP and write notes far faster than people do;
+    # pass --env RATE_LIMIT_NOTES_PER_MINUTE=10 to load-test with the limiter on
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        RATE_LIMIT_NOTES_PER_MINUTE="0",
+        RATE_LIMIT_AUTH_PER_MINUTE="0",
+    )
+    env.update(extra_env)
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT_DIR,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+
+
+async def run_load(base_url: str, fixture: Fixture, args: argparse.Namespace, mix: Dict[str, int]) -> Recorder:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        await wait_ready(client)
+        users = [VirtualUser(i, client, fixture, recorder) for i in range(args.users)]
+        # Setup logins are not part of the measured mix
+        await asyncio.gather(*(user.login() for user in users))
+        recorder.recording = True
+        stop_at = time.monotonic() + args.duration
+        await asyncio.gather(*(user.run(mix, stop_at, args.think_ms) for user in users))
+    return recorder
+
+
+def run(args: argparse.Namespace) -> Dict:
+    mix = parse_mix(args.mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "loadtest.db"
+        logger.info("Building %s fixture", args.size)
+        fixture = build_fixture(db_path, SIZES[args.size], seed=args.seed)
+        port = free_port()
+        extra_env = dict(item.split("=", 1) for item in args.env) if args.env else {}
+        # Server output (slow-request warnings, tracebacks) goes to a file, shown only on errors
+        log_path = Path(tmp) / "server.log"
+        with log_path.open("w", encoding="utf-8") as log_file:
+            server = start_server(db_path, port, args.workers, extra_env, log_file)
+            try:
+                started = time.monotonic()
+                recorder = asyncio.run(run_load(f"http://127.0.0.1:{port}", fixture, args, mix))
+                wall_seconds = time.monotonic() - started
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+        if sum(recorder.errors.values()):
+            logger.warning("Server log (last 40 lines):\n%s", "\n".join(log_path.read_text(encoding="utf-8").splitlines()[-40:]))
+    endpoints = recorder.summary(args.duration)
+    total = sum(stats["requests"] for stats in endpoints.values())
+    errors = sum(recorder.errors.values())
+    for label, stats in endpoints.items():
+        logger.info(
+            "%-36s %6d req %7.1f rps  err %5.1f%% | p50 %8.1f ms  p95 %8.1f ms  p99 %8.1f ms",
+            label,
+            stats["requests"],
+            stats["rps"],
+            stats["error_rate"] * 100,
+            stats["p50_ms"],
+            stats["p95_ms"],
+            stats["p99_ms"],
+        )
+    logger.info(
+        "total %d requests in %.0f s: %.1f rps, %d errors (%.2f%%)",
+        total,
+        args.duration,
+        total / args.duration,
+        errors,
+        100 * errors / total if total else 0.0,
+    )
+    return {
+        "config": {
+            "size": args.size,
+            "users": args.users,
+            "duration": args.duration,
+            "think_ms": args.think_ms,
+            "workers": args.workers,
+            "mix": mix,
+            "env": extra_env,
+            "wall_seconds": round(wall_seconds, 1),
+        },
+        "total": {"requests": total, "rps": round(total / args.duration, 1), "errors": errors},
+        "endpoints": endpoints,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a reader/writer traffic mix against a local API instance")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Fixture size preset")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of measured load")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between a user's operations")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights, e.g. chapter=50,login=10")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--env", action="append", help="Extra NAME=VALUE for the server (repeatable)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=7, help="Fixture random seed")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("passlib").setLevel(logging.ERROR)
+    logging.getLogger("backend.seeds.import_john_gill").setLevel(logging.WARNING)
+    results = run(args)
+    if args.json_path:
+        args.json_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        logger.info("Wrote %s", args.json_path)
+
+
+if __name__ == "__main__":
+    main()
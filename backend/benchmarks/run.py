@@ -0,0 +1,296 @@
+"""Benchmark the API hot paths against synthetic databases of several sizes.
+
+For each size preset in ``fixtures.SIZES`` a fresh worker process builds the
+fixture, points the app at it (``DATABASE_URL``) and times each benchmark
+through the full ASGI stack with ``TestClient``; ``render_markdown`` and
+``tokenize_reference_text`` are timed as plain function calls. The chapter
+cache is disabled unless ``--chapter-cache`` is given so chapter reads measure
+the database path.
+
+Results (per size, per benchmark: min/median/p95/mean in milliseconds) are
+written as JSON together with the git revision, so two runs can be compared
+with ``compare.py``.
+
+Usage:
+    python backend/benchmarks/run.py
+    python backend/benchmarks/run.py --sizes small,medium,large --iterations 200 --json bench.json
+    python backend/benchmarks/run.py --only read_chapter,concordance
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS = [
+    "read_chapter",
+    "concordance",
+    "list_notes",
+    "list_subscribed_notes",
+    "list_chapter_authors",
+    "read_my_profile",
+    "get_backlinks",
+    "create_note",
+    "render_markdown",
+    "tokenize_reference_text",
+]
+DEFAULT_SIZES = "small,medium"
+# Calls averaged into each sample for the in-process function benchmarks
+LOOPS = {"render_markdown": 10, "tokenize_reference_text": 500}
+CONCORDANCE_TERMS = ["grace", "light", "jubilee", "tabernacle"]
+REFERENCE_TEXTS = [
+    "John 3:16",
+    "Rom 8:28-30; 1 Cor 13:4-7",
+    "Gen 1:1-2:3, Ps 23",
+    "Matthew 5:3-12; Luke 6:20-23; Isa 61:1",
+    "see Revelation 21:1-4 and Ex 20",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples_ms: List[float], errors: int) -> Dict[str, float]:
+    return {
+        "iterations": len(samples_ms),
+        "errors": errors,
+        "min_ms": round(min(samples_ms), 4),
+        "median_ms": round(statistics.median(samples_ms), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "mean_ms": round(statistics.fmean(samples_ms), 4),
+        "stdev_ms": round(statistics.stdev(samples_ms), 4) if len(samples_ms) > 1 else 0.0,
+    }
+
+
+def measure(call: Callable[[int], bool], iterations: int, warmup: int, loops: int = 1) -> Dict[str, float]:
+    """Time ``call(i)`` after ``warmup`` untimed calls; it returns False on error.
+
+    Each of the ``iterations`` samples is the mean of ``loops`` back-to-back calls,
+    which keeps microsecond-scale functions above the timer's noise floor.
+    """
+    for i in range(warmup):
+        call(i)
+    samples, errors = [], 0
+    i = warmup
+    for _ in range(iterations):
+        started = time.perf_counter()
+        for _ in range(loops):
+            errors += not call(i)
+            i += 1
+        samples.append((time.perf_counter() - started) * 1000 / loops)
+    return summarize(samples, errors)
+
+
+def build_calls(client, fixture, rng: random.Random) -> Dict[str, Callable[[int], bool]]:
+    from backend.app.auth import create_access_token
+    from backend.app.utils.markdown import render_markdown
+    from backend.app.utils.reference_parser import tokenize_reference_text
+    from backend.benchmarks.fixtures import WORDS
+
+    size = fixture.size
+    auth = {"Authorization": f"Bearer {create_access_token(fixture.bench_user_id)}"}
+    code = fixture.version_codes[0]
+    hot_book, hot_chapter, hot_verse = fixture.hot_verse
+
+    def chapter_path(prefix: str) -> str:
+        return f"{prefix}/{rng.choice(fixture.version_codes)}/{rng.choice(fixture.books)}/{rng.randint(1, size.chapters)}"
+
+    def get(path: str, **kwargs) -> bool:
+        return client.get(path, **kwargs).status_code == 200
+
+    def create_note(i: int) -> bool:
+        # Verse ids of the first version are 1..len(books) * chapters * verses
+        verse_id = rng.randint(1, len(fixture.books) * size.chapters * size.verses)
+        body = {
+            "title": f"Benchmark note {i}",
+            "content_markdown": f"Note {i}: {' '.join(rng.choices(WORDS, k=30))} (John 3:16; Rom 8:28)",
+            "version_code": code,
+            "start_verse_id": verse_id,
+            "end_verse_id": verse_id,
+            "is_public": True,
+            "tags": "benchmark,study",
+        }
+        return client.post("/notes", json=body, headers=auth).status_code == 201
+
+    def render(i: int) -> bool:
+        # A distinct source per call so the render cache never answers
+        render_markdown(f"## Note {i}\n\n{' '.join(rng.choices(WORDS, k=60))} (John 3:16; Gen 1:1-3)\n\n- **one**\n- two")
+        return True
+
+    def tokenize(i: int) -> bool:
+        tokenize_reference_text(REFERENCE_TEXTS[i % len(REFERENCE_TEXTS)])
+        return True
+
+    return {
+        "read_chapter": lambda i: get(chapter_path("/bible"), headers=auth),
+        "concordance": lambda i: get(
+            f"/bible/{code}/concordance", params={"q": CONCORDANCE_TERMS[i % len(CONCORDANCE_TERMS)], "limit": 50}
+        ),
+        "list_notes": lambda i: get(chapter_path("/notes"), headers=auth),
+        "list_subscribed_notes": lambda i: get("/notes/subscriptions/notes", headers=auth),
+        "list_chapter_authors": lambda i: get(
+            "/notes/authors/public",
+            params={
+                "version_code": rng.choice(fixture.version_codes),
+                "book": rng.choice(fixture.books),
+                "chapter": rng.randint(1, size.chapters),
+            },
+        ),
+        "read_my_profile": lambda i: get("/users/me/profile", headers=auth),
+        "get_backlinks": lambda i: get(f"/notes/backlinks/{code}/{hot_book}/{hot_chapter}/{hot_verse}"),
+        "create_note": create_note,
+        "render_markdown": render,
+        "tokenize_reference_text": tokenize,
+    }
+
+
+def run_worker(size_name: str, db_path: Path, names: List[str], iterations: int, warmup: int, seed: int) -> Dict:
+    """Build the fixture and time ``names`` in this process. DATABASE_URL must already point at ``db_path``."""
+    from fastapi.testclient import TestClient
+
+    from backend.benchmarks.fixtures import SIZES, build_fixture
+
+    started = time.perf_counter()
+    fixture = build_fixture(db_path, SIZES[size_name], seed=seed)
+    build_seconds = time.perf_counter() - started
+
+    from backend.app.main import app
+
+    results: Dict[str, Dict[str, float]] = {}
+    # Failed requests are counted as errors rather than aborting the run
+    with TestClient(app, raise_server_exceptions=False) as client:
+        calls = build_calls(client, fixture, random.Random(seed))
+        for name in names:
+            results[name] = measure(calls[name], iterations, warmup, LOOPS.get(name, 1))
+            stats = results[name]
+            logger.info(
+                "%-7s %-24s median %8.3f ms  p95 %8.3f ms  min %8.3f ms%s",
+                size_name,
+                name,
+                stats["median_ms"],
+                stats["p95_ms"],
+                stats["min_ms"],
+                f"  ({stats['errors']} errors)" if stats["errors"] else "",
+            )
+    return {
+        "fixture": fixture.to_dict(),
+        "fixture_build_seconds": round(build_seconds, 2),
+        "db_bytes": db_path.stat().st_size,
+        "benchmarks": results,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> Dict:
+    names = [name for name in args.only.split(",") if name] if args.only else BENCHMARKS
+    unknown = sorted(set(names) - set(BENCHMARKS))
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)}. Choose from: {', '.join(BENCHMARKS)}")
+    report: Dict = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "chapter_cache": args.chapter_cache,
+        },
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_name in [name for name in args.sizes.split(",") if name]:
+            db_path = Path(tmp) / f"bench-{size_name}.db"
+            out_path = Path(tmp) / f"bench-{size_name}.json"
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{db_path}",
+                CHAPTER_CACHE_SIZE=os.environ.get("CHAPTER_CACHE_SIZE", "512") if args.chapter_cache else "0",
+                # create_note runs far more often than any per-user limit allows
+                RATE_LIMIT_NOTES_PER_MINUTE="0",
+                RATE_LIMIT_AUTH_PER_MINUTE="0",
+            )
+            command = [
+                sys.executable,
+                __file__,
+                "--worker",
+                size_name,
+                "--worker-db",
+                str(db_path),
+                "--json",
+                str(out_path),
+                "--only",
+                ",".join(names),
+                "--iterations",
+                str(args.iterations),
+                "--warmup",
+                str(args.warmup),
+                "--seed",
+                str(args.seed),
+            ]
+            logger.info("Building %s fixture and running %d benchmark(s)", size_name, len(names))
+            subprocess.run(command, cwd=ROOT_DIR, env=env, check=True)
+            report["sizes"][size_name] = json.loads(out_path.read_text(encoding="utf-8"))
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths on synthetic databases")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated fixture sizes (small, medium, large)")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--iterations", type=int, default=100, help="Timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed calls before timing")
+    parser.add_argument("--seed", type=int, default=7, help="Fixture and workload random seed")
+    parser.add_argument("--chapter-cache", action="store_true", help="Keep the chapter cache enabled")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-db", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("passlib").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("backend.seeds.import_john_gill").setLevel(logging.WARNING)
+    if args.worker:
+        names = [name for name in args.only.split(",") if name]
+        result = run_worker(args.worker, args.worker_db, names, args.iterations, args.warmup, args.seed)
+        args.json_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        return
+    report = run(args)
+    if args.json_path:
+        args.json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info("Wrote %s", args.json_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+from backend.app import models  # noqa: F401  (registers tables on SQLModel.metadata)
+from backend.app.config import get_settings
+from backend.app.database import create_db_engine, is_sqlite_url
+from backend.app.utils.fulltext import NOTE_FTS_TABLE, NOTE_TSV_COLUMN, VERSE_TSV_COLUMN
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or get_settings().database_url
+
+
+# Search structures created by install_search_indexes (migrations 0003 and 0004), not from
+# the models: the SQLite FTS5 note index with its shadow tables, and PostgreSQL's generated
+# tsvector columns with their GIN and trigram indexes. Autogenerate would emit drops for them.
+SEARCH_COLUMNS = {VERSE_TSV_COLUMN, NOTE_TSV_COLUMN}
+SEARCH_INDEXES = {f"ix_verse_{VERSE_TSV_COLUMN}", f"ix_note_{NOTE_TSV_COLUMN}"}
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not (name or "").startswith(NOTE_FTS_TABLE)
+    if type_ == "column":
+        return name not in SEARCH_COLUMNS
+    if type_ == "index":
+        return name not in SEARCH_INDEXES and not (name or "").endswith("_trgm")
+    return True
+
+
+def run_migrations_offline() -> None:
+    url = database_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=is_sqlite_url(url),
+        include_name=include_name,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    url = database_url()
+    connectable = create_db_engine(url)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=is_sqlite_url(url),
+            include_name=include_name,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,148 @@
+"""Baseline schema as created by SQLModel.metadata.create_all before migrations existed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 05:35:18
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('bibleversion',
+    sa.Column('code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('language', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('code')
+    )
+    op.create_table('manuscriptedition',
+    sa.Column('code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('language', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('license_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('license_url', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('source_url', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('code')
+    )
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('display_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+    op.create_table('manuscriptbookcoverage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('edition_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['edition_code'], ['manuscriptedition.code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_manuscriptbookcoverage_book', 'manuscriptbookcoverage', ['book'], unique=False)
+
+    op.create_table('manuscriptverse',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('edition_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('chapter', sa.Integer(), nullable=False),
+    sa.Column('verse', sa.Integer(), nullable=False),
+    sa.Column('canonical_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['edition_code'], ['manuscriptedition.code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_manuscriptverse_book', 'manuscriptverse', ['book'], unique=False)
+    op.create_index('ix_manuscriptverse_canonical_id', 'manuscriptverse', ['canonical_id'], unique=False)
+    op.create_index('ix_manuscriptverse_chapter', 'manuscriptverse', ['chapter'], unique=False)
+    op.create_index('ix_manuscriptverse_verse', 'manuscriptverse', ['verse'], unique=False)
+
+    op.create_table('usernotesubscription',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('subscriber_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['subscriber_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('verse',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('chapter', sa.Integer(), nullable=False),
+    sa.Column('verse', sa.Integer(), nullable=False),
+    sa.Column('canonical_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['version_code'], ['bibleversion.code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_verse_book', 'verse', ['book'], unique=False)
+    op.create_index('ix_verse_canonical_id', 'verse', ['canonical_id'], unique=False)
+    op.create_index('ix_verse_chapter', 'verse', ['chapter'], unique=False)
+    op.create_index('ix_verse_verse', 'verse', ['verse'], unique=False)
+
+    op.create_table('note',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('content_markdown', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('content_html', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('version_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('start_verse_id', sa.Integer(), nullable=False),
+    sa.Column('end_verse_id', sa.Integer(), nullable=False),
+    sa.Column('is_public', sa.Boolean(), nullable=False),
+    sa.Column('tags_text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['end_verse_id'], ['verse.id'], ),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['start_verse_id'], ['verse.id'], ),
+    sa.ForeignKeyConstraint(['version_code'], ['bibleversion.code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('notecrossreference',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('note_id', sa.Integer(), nullable=False),
+    sa.Column('canonical_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('target_verse_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['note_id'], ['note.id'], ),
+    sa.ForeignKeyConstraint(['target_verse_id'], ['verse.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notecrossreference_canonical_id', 'notecrossreference', ['canonical_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notecrossreference_canonical_id', table_name='notecrossreference')
+    op.drop_table('notecrossreference')
+    op.drop_table('note')
+    op.drop_index('ix_verse_verse', table_name='verse')
+    op.drop_index('ix_verse_chapter', table_name='verse')
+    op.drop_index('ix_verse_canonical_id', table_name='verse')
+    op.drop_index('ix_verse_book', table_name='verse')
+    op.drop_table('verse')
+    op.drop_table('usernotesubscription')
+    op.drop_index('ix_manuscriptverse_verse', table_name='manuscriptverse')
+    op.drop_index('ix_manuscriptverse_chapter', table_name='manuscriptverse')
+    op.drop_index('ix_manuscriptverse_canonical_id', table_name='manuscriptverse')
+    op.drop_index('ix_manuscriptverse_book', table_name='manuscriptverse')
+    op.drop_table('manuscriptverse')
+    op.drop_index('ix_manuscriptbookcoverage_book', table_name='manuscriptbookcoverage')
+    op.drop_table('manuscriptbookcoverage')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_table('user')
+    op.drop_table('manuscriptedition')
+    op.drop_table('bibleversion')
@@ -0,0 +1,46 @@
+"""Composite indexes for the hot read queries.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 05:35:37
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) - kept in step with __table_args__ in backend/app/models.py
+INDEXES = [
+    # Chapter, passage, parallel and single-verse lookups; concordance order within a version
+    ('ix_verse_version_book_chapter_verse', 'verse', ['version_code', 'book', 'chapter', 'verse']),
+    # Cross-reference resolution and note verse text by canonical id
+    ('ix_verse_version_canonical_id', 'verse', ['version_code', 'canonical_id']),
+    # Author/profile listings ordered by created_at, /notes/me ordered by updated_at
+    ('ix_note_owner_id_created_at', 'note', ['owner_id', 'created_at']),
+    ('ix_note_owner_id_updated_at', 'note', ['owner_id', 'updated_at']),
+    # Notes anchored in a chapter
+    ('ix_note_start_verse_id_version_code', 'note', ['start_verse_id', 'version_code']),
+    # Public author listing
+    ('ix_note_is_public_owner_id', 'note', ['is_public', 'owner_id']),
+    ('ix_notecrossreference_note_id', 'notecrossreference', ['note_id']),
+    ('ix_notecrossreference_target_verse_id', 'notecrossreference', ['target_verse_id']),
+    ('ix_notecrossreference_canonical_id_note_id', 'notecrossreference', ['canonical_id', 'note_id']),
+    ('ix_usernotesubscription_subscriber_id_author_id', 'usernotesubscription', ['subscriber_id', 'author_id']),
+    ('ix_usernotesubscription_author_id', 'usernotesubscription', ['author_id']),
+    ('ix_manuscriptverse_edition_book_chapter_verse', 'manuscriptverse', ['edition_code', 'book', 'chapter', 'verse']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""PostgreSQL full-text (tsvector + GIN) and trigram search indexes; no-op on SQLite.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 05:52:10
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from backend.app.utils.fulltext import NOTE_TSV_COLUMN, VERSE_TSV_COLUMN, postgres_search_ddl
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    for statement in postgres_search_ddl():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS ix_user_author_label_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_user_email_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_user_display_name_trgm')
+    op.execute(f'DROP INDEX IF EXISTS ix_note_{NOTE_TSV_COLUMN}')
+    op.execute(f'ALTER TABLE "note" DROP COLUMN IF EXISTS {NOTE_TSV_COLUMN}')
+    op.execute(f'DROP INDEX IF EXISTS ix_verse_{VERSE_TSV_COLUMN}')
+    op.execute(f'ALTER TABLE "verse" DROP COLUMN IF EXISTS {VERSE_TSV_COLUMN}')
@@ -0,0 +1,58 @@
+"""Note full-text search: SQLite FTS5 index with sync triggers; tags join the PostgreSQL note tsvector.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:12:44
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from backend.app.utils.fulltext import (
+    NOTE_TSV_COLUMN,
+    TS_CONFIG,
+    postgres_search_ddl,
+    rebuild_note_search_index,
+    sqlite_search_ddl,
+    sqlite_search_drop_ddl,
+)
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_note_tsv() -> None:
+    # A generated column's expression cannot be altered in place
+    op.execute(f'DROP INDEX IF EXISTS ix_note_{NOTE_TSV_COLUMN}')
+    op.execute(f'ALTER TABLE "note" DROP COLUMN IF EXISTS {NOTE_TSV_COLUMN}')
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        for statement in sqlite_search_ddl():
+            op.execute(statement)
+        rebuild_note_search_index(op.get_bind())
+    elif dialect == 'postgresql':
+        _drop_note_tsv()
+        for statement in postgres_search_ddl():
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        for statement in sqlite_search_drop_ddl():
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        # Title and body only, as created by 0003
+        _drop_note_tsv()
+        op.execute(
+            f'ALTER TABLE "note" ADD COLUMN {NOTE_TSV_COLUMN} tsvector GENERATED ALWAYS AS ('
+            f"setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{TS_CONFIG}', coalesce(content_markdown, '')), 'B')) STORED"
+        )
+        op.execute(f'CREATE INDEX ix_note_{NOTE_TSV_COLUMN} ON "note" USING GIN ({NOTE_TSV_COLUMN})')
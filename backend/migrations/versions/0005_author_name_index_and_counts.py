@@ -0,0 +1,52 @@
+"""Name token index for user/author search and maintained public note counts per author.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:41:07
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from backend.app.utils.author_index import rebuild_name_tokens
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('usernametoken',
+    sa.Column('token', sa.String().with_variant(sa.String(collation='C'), 'postgresql'), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('token', 'user_id')
+    )
+    op.create_index('ix_usernametoken_user_id_token', 'usernametoken', ['user_id', 'token'], unique=False)
+    op.create_table('authornotecount',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('public_note_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('author_id')
+    )
+    op.create_index(
+        'ix_authornotecount_public_note_count_author_id',
+        'authornotecount',
+        ['public_note_count', 'author_id'],
+        unique=False,
+    )
+    rebuild_name_tokens(op.get_bind())
+    op.execute(
+        'INSERT INTO authornotecount (author_id, public_note_count) '
+        'SELECT owner_id, count(*) FROM note WHERE is_public GROUP BY owner_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_authornotecount_public_note_count_author_id', table_name='authornotecount')
+    op.drop_table('authornotecount')
+    op.drop_index('ix_usernametoken_user_id_token', table_name='usernametoken')
+    op.drop_table('usernametoken')
@@ -0,0 +1,67 @@
+"""Maintained public note counts per author and version, and per author and chapter.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:03:26
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+from backend.app.utils.author_index import rebuild_note_counts
+
+
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('authorversionnotecount',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('version_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('public_note_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['version_code'], ['bibleversion.code'], ),
+    sa.PrimaryKeyConstraint('author_id', 'version_code')
+    )
+    op.create_index(
+        'ix_authorversionnotecount_version_count_author',
+        'authorversionnotecount',
+        ['version_code', 'public_note_count', 'author_id'],
+        unique=False,
+    )
+    op.create_table('authorchapternotecount',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('version_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('chapter', sa.Integer(), nullable=False),
+    sa.Column('public_note_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['version_code'], ['bibleversion.code'], ),
+    sa.PrimaryKeyConstraint('author_id', 'version_code', 'book', 'chapter')
+    )
+    op.create_index(
+        'ix_authorchapternotecount_chapter_count_author',
+        'authorchapternotecount',
+        ['version_code', 'book', 'chapter', 'public_note_count', 'author_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_authorchapternotecount_book_chapter_author',
+        'authorchapternotecount',
+        ['book', 'chapter', 'author_id'],
+        unique=False,
+    )
+    rebuild_note_counts(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_index('ix_authorchapternotecount_book_chapter_author', table_name='authorchapternotecount')
+    op.drop_index('ix_authorchapternotecount_chapter_count_author', table_name='authorchapternotecount')
+    op.drop_table('authorchapternotecount')
+    op.drop_index('ix_authorversionnotecount_version_count_author', table_name='authorversionnotecount')
+    op.drop_table('authorversionnotecount')
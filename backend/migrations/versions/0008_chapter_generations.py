@@ -0,0 +1,30 @@
+"""Per-chapter generation counters behind chapter ETags.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 18:02:37
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('chaptergeneration',
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('chapter', sa.Integer(), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('book', 'chapter')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('chaptergeneration')
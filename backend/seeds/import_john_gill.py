@@ -5,21 +5,26 @@ import sys
 from pathlib import Path
 from typing import Iterator, List, Optional, Tuple
 
-from sqlmodel import Session, SQLModel, create_engine, select, delete
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
 
 # Support running directly (python backend/seeds/import_john_gill.py)
 try:
     from backend.app.auth import get_password_hash
+    from backend.app.database import init_db, seed_engine
     from backend.app.models import Note, NoteCrossReference, User, Verse
     from backend.app.utils.markdown import render_markdown
+    from backend.app.utils.reference_graph import reference_graph
     from backend.app.utils.reference_parser import extract_canonical_ids
 except ModuleNotFoundError:
     ROOT_DIR = Path(__file__).resolve().parents[2]
     if str(ROOT_DIR) not in sys.path:
         sys.path.insert(0, str(ROOT_DIR))
     from backend.app.auth import get_password_hash
+    from backend.app.database import init_db, seed_engine
     from backend.app.models import Note, NoteCrossReference, User, Verse
     from backend.app.utils.markdown import render_markdown
+    from backend.app.utils.reference_graph import reference_graph
     from backend.app.utils.reference_parser import extract_canonical_ids
 
 logger = logging.getLogger(__name__)
@@ -156,9 +161,11 @@ def ensure_user(session: Session, *, email: str, display_name: str, password: st
 
 
 def delete_existing_author_notes_for_book(session: Session, author_id: int, version_code: str, book: str) -> int:
-    # Delete only notes for this author within the book for the given version
-    to_delete = session.exec(
-        select(Note.id)
+    # Delete only notes for this author within the book for the given version. Through the
+    # session, so cross references cascade and the ORM listeners update the author counters.
+    notes = session.exec(
+        select(Note)
+        .options(selectinload(Note.cross_references))
         .join(Verse, Note.start_verse_id == Verse.id)
         .where(
             Note.owner_id == author_id,
@@ -166,11 +173,14 @@ def delete_existing_author_notes_for_book(session: Session, author_id: int, vers
             Verse.book == book,
         )
     ).all()
-    if not to_delete:
+    if not notes:
         return 0
-    session.exec(delete(Note).where(Note.id.in_(to_delete)))
+    for note in notes:
+        session.delete(note)
+    # Running servers reload their reference graph when the generation moves
+    reference_graph.bump(session)
     session.commit()
-    return len(to_delete)
+    return len(notes)
 
 
 def insert_entries(
@@ -234,14 +244,16 @@ def insert_entries(
         inserted += 1
         # Commit periodically to keep memory low
         if inserted % 200 == 0:
+            reference_graph.bump(session)
             session.commit()
+    reference_graph.bump(session)
     session.commit()
     return inserted, skipped
 
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Import John Gill commentary (Genesis) into verse-anchored notes")
-    p.add_argument("--db", type=Path, default=Path("backend/bible_notes.db"), help="Path to SQLite database")
+    p.add_argument("--db", type=Path, help="SQLite database file (defaults to DATABASE_URL)")
     p.add_argument("--input-dir", type=Path, default=Path("commentators/John_Gill"), help="Directory of John Gill PDFs")
     p.add_argument("--version", default="KJV", help="Bible version code to anchor notes (e.g., KJV)")
     p.add_argument("--book", default="Genesis", help="Book name (default: Genesis)")
@@ -257,11 +269,8 @@ def main() -> None:
     args = parse_args()
     configure_logging(args.verbose)
 
-    db_path: Path = args.db.resolve()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
-    SQLModel.metadata.create_all(engine)
+    engine = seed_engine(args.db)
+    init_db(engine)
 
     # Collect PDFs
     input_dir: Path = args.input_dir.resolve()
@@ -0,0 +1,60 @@
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+try:
+    from backend.app.database import init_db, seed_engine
+    from backend.app.utils.author_index import rebuild_author_index
+    from backend.app.utils.fulltext import rebuild_note_search_index
+except ModuleNotFoundError:
+    ROOT_DIR = Path(__file__).resolve().parents[2]
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from backend.app.database import init_db, seed_engine
+    from backend.app.utils.author_index import rebuild_author_index
+    from backend.app.utils.fulltext import rebuild_note_search_index
+
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging(verbose: bool) -> None:
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(levelname)s %(message)s",
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the note full-text index (SQLite FTS5) and the author name and note count index"
+    )
+    parser.add_argument("--db", type=Path, help="SQLite database file (defaults to DATABASE_URL)")
+    parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    configure_logging(args.verbose)
+
+    engine = seed_engine(args.db)
+    init_db(engine)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_author_index(conn)
+    logger.info("Rebuilt the author index in %.1fs", time.perf_counter() - started)
+
+    if engine.dialect.name != "sqlite":
+        logger.info("Note search needs no rebuild: the PostgreSQL note tsvector is a generated column")
+        return
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_note_search_index(conn)
+    logger.info("Rebuilt the note search index in %.1fs", time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
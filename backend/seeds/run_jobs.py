@@ -0,0 +1,85 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+try:
+    from backend.app import job_handlers  # noqa: F401 - registers every job handler
+    from backend.app.database import engine, init_db
+    from backend.app.jobs import enqueue, job_runner
+    from backend.app.models import Job
+except ModuleNotFoundError:
+    ROOT_DIR = Path(__file__).resolve().parents[2]
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from backend.app import job_handlers  # noqa: F401 - registers every job handler
+    from backend.app.database import engine, init_db
+    from backend.app.jobs import enqueue, job_runner
+    from backend.app.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# Maintenance jobs that can be queued from here, with what they do
+MAINTENANCE_JOBS = {
+    "refresh_notes": "re-render every note's Markdown and re-resolve its cross references",
+    "rebuild_search_index": "rebuild the SQLite FTS5 note search index",
+    "rebuild_author_index": "recompute author name tokens and public note counters",
+}
+
+
+def configure_logging(verbose: bool) -> None:
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(levelname)s %(message)s",
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Queue maintenance jobs, run queued jobs, or report the job queue (database from DATABASE_URL)",
+        epilog="Jobs: " + "; ".join(f"{kind}: {what}" for kind, what in MAINTENANCE_JOBS.items()),
+    )
+    parser.add_argument(
+        "--enqueue", action="append", choices=sorted(MAINTENANCE_JOBS), default=[], help="Queue a job (repeatable)"
+    )
+    parser.add_argument("--version-code", help="Limit refresh_notes to one Bible version")
+    parser.add_argument(
+        "--run", action="store_true", help="Run due jobs in this process until the queue is empty, instead of leaving them to the server"
+    )
+    parser.add_argument("--status", action="store_true", help="Print job counts by kind and status")
+    parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    configure_logging(args.verbose)
+    init_db()
+
+    for kind in args.enqueue:
+        payload = {"version_code": args.version_code} if kind == "refresh_notes" and args.version_code else {}
+        with engine.begin() as conn:
+            job_id = enqueue(conn, kind, payload)
+        logger.info("Queued %s as job %d %s", kind, job_id, json.dumps(payload) if payload else "")
+
+    if args.run:
+        started = time.perf_counter()
+        ran = job_runner.run_pending()
+        logger.info("Ran %d job(s) in %.1fs", ran, time.perf_counter() - started)
+
+    if args.status:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status).order_by(Job.kind, Job.status)
+            ).all()
+        for kind, status, count in rows:
+            logger.info("%-22s %-10s %d", kind, status, count)
+
+
+if __name__ == "__main__":
+    main()
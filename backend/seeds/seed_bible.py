@@ -4,15 +4,17 @@ import sys
 from pathlib import Path
 from typing import Iterable, List, Optional
 
-from sqlmodel import Session, SQLModel, create_engine, delete, select
+from sqlmodel import Session, delete, select
 
 try:
+    from backend.app.database import init_db, seed_engine
     from backend.app.models import BibleVersion, Verse
     from backend.app.utils.bible_loader import BibleLoader
 except ModuleNotFoundError:
     ROOT_DIR = Path(__file__).resolve().parents[2]
     if str(ROOT_DIR) not in sys.path:
         sys.path.insert(0, str(ROOT_DIR))
+    from backend.app.database import init_db, seed_engine
     from backend.app.models import BibleVersion, Verse
     from backend.app.utils.bible_loader import BibleLoader
 
@@ -154,8 +156,8 @@ def seed_version(
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Seed Bible data into the SQLite database")
-    parser.add_argument("--db", type=Path, default=Path("backend/bible_notes.db"), help="Path to SQLite database")
+    parser = argparse.ArgumentParser(description="Seed Bible data into the configured database")
+    parser.add_argument("--db", type=Path, help="SQLite database file (defaults to DATABASE_URL)")
     parser.add_argument("--version", help="Specific Bible version code to seed")
     parser.add_argument("--all", action="store_true", help="Seed every Bible version found in assets directory")
     parser.add_argument("--assets-dir", type=Path, help="Override the default Bible assets directory")
@@ -171,16 +173,13 @@ def main() -> None:
     args = parse_args()
     configure_logging(args.verbose)
 
-    db_path = args.db.resolve()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
     assets_dir = args.assets_dir.resolve() if args.assets_dir else None
     loader = BibleLoader(assets_dir)
 
     versions = resolve_versions(loader, args.version, args.all)
 
-    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
-    SQLModel.metadata.create_all(engine)
+    engine = seed_engine(args.db)
+    init_db(engine)
 
     with Session(engine) as session:
         total_inserted = 0
@@ -4,9 +4,10 @@ import sys
 from pathlib import Path
 from typing import Iterable, List, Optional
 
-from sqlmodel import Session, SQLModel, create_engine, delete, select
+from sqlmodel import Session, delete, select
 
 try:
+    from backend.app.database import init_db, seed_engine
     from backend.app.models import ManuscriptBookCoverage, ManuscriptEdition, ManuscriptVerse
     from backend.app.utils.manuscript_loader import ManuscriptLoader
     from backend.app.utils.reference_parser import normalize_book
@@ -14,6 +15,7 @@ except ModuleNotFoundError:
     ROOT_DIR = Path(__file__).resolve().parents[2]
     if str(ROOT_DIR) not in sys.path:
         sys.path.insert(0, str(ROOT_DIR))
+    from backend.app.database import init_db, seed_engine
     from backend.app.models import ManuscriptBookCoverage, ManuscriptEdition, ManuscriptVerse
     from backend.app.utils.manuscript_loader import ManuscriptLoader
     from backend.app.utils.reference_parser import normalize_book
@@ -182,8 +184,8 @@ def seed_edition(
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Seed manuscript data into the SQLite database")
-    parser.add_argument("--db", type=Path, default=Path("backend/bible_notes.db"), help="Path to SQLite database")
+    parser = argparse.ArgumentParser(description="Seed manuscript data into the configured database")
+    parser.add_argument("--db", type=Path, help="SQLite database file (defaults to DATABASE_URL)")
     parser.add_argument("--edition", help="Specific manuscript edition code to seed")
     parser.add_argument("--all", action="store_true", help="Seed every manuscript edition found in assets directory")
     parser.add_argument("--assets-dir", type=Path, help="Override the default manuscript assets directory")
@@ -196,16 +198,13 @@ def main() -> None:
     args = parse_args()
     configure_logging(args.verbose)
 
-    db_path = args.db.resolve()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
     assets_dir = args.assets_dir.resolve() if args.assets_dir else None
     loader = ManuscriptLoader(assets_dir)
 
     editions = resolve_editions(loader, args.edition, args.all)
 
-    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
-    SQLModel.metadata.create_all(engine)
+    engine = seed_engine(args.db)
+    init_db(engine)
 
     with Session(engine) as session:
         total_inserted = 0
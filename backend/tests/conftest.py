@@ -0,0 +1,115 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Settings are read when the app is imported, so the database is chosen here.
+# TEST_DATABASE_URL may point at a disposable PostgreSQL database (its tables are
+# dropped and recreated); without it the suite runs on a fresh SQLite file.
+_test_database_url = os.environ.get("TEST_DATABASE_URL")
+if not _test_database_url:
+    _test_database_url = f"sqlite:///{tempfile.mkdtemp(prefix='bible-notes-tests-')}/test.db"
+os.environ["DATABASE_URL"] = _test_database_url
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("RATE_LIMIT_NOTES_PER_MINUTE", "0")
+os.environ.setdefault("RATE_LIMIT_AUTH_PER_MINUTE", "0")
+# Tests run queued jobs themselves with job_runner.run_pending()
+os.environ.setdefault("JOB_WORKERS", "0")
+
+VERSIONS = ("KJV", "ESV")
+BOOKS = ("Genesis", "John", "Romans")
+CHAPTERS = 5
+VERSES_PER_CHAPTER = 20
+
+
+def _seed_bible(db_engine) -> None:
+    from sqlmodel import Session
+
+    from backend.app.models import BibleVersion, Verse
+
+    with Session(db_engine) as session:
+        for code in VERSIONS:
+            session.add(BibleVersion(code=code, name=code, language="English"))
+            for book in BOOKS:
+                for chapter in range(1, CHAPTERS + 1):
+                    for verse in range(1, VERSES_PER_CHAPTER + 1):
+                        session.add(
+                            Verse(
+                                version_code=code,
+                                book=book,
+                                chapter=chapter,
+                                verse=verse,
+                                canonical_id=f"{book}|{chapter}|{verse}",
+                                text=f"{book} {chapter}:{verse} grace and peace",
+                            )
+                        )
+        session.commit()
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    from sqlmodel import SQLModel
+
+    from backend.app.database import engine, init_db
+
+    if engine.dialect.name != "sqlite":
+        SQLModel.metadata.drop_all(engine)
+    init_db()
+    _seed_bible(engine)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(db_engine):
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def signup(client):
+    """Create a user and return the Authorization header for them."""
+    created = {}
+
+    def _signup(name: str) -> dict:
+        if name not in created:
+            response = client.post(
+                "/auth/signup",
+                json={"email": f"{name}@example.com", "password": "password123", "display_name": name.title()},
+            )
+            assert response.status_code == 201, response.text
+            created[name] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return created[name]
+
+    return _signup
+
+
+@pytest.fixture(scope="session")
+def verse_id(db_engine):
+    """Id of a seeded verse."""
+    from sqlmodel import Session, select
+
+    from backend.app.models import Verse
+
+    def _verse_id(book: str, chapter: int, verse: int, version_code: str = "KJV") -> int:
+        with Session(db_engine) as session:
+            return session.exec(
+                select(Verse.id).where(
+                    Verse.version_code == version_code,
+                    Verse.book == book,
+                    Verse.chapter == chapter,
+                    Verse.verse == verse,
+                )
+            ).one()
+
+    return _verse_id
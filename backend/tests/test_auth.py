@@ -0,0 +1,13 @@
+from backend.app.auth import create_access_token
+
+
+def test_current_user_requires_a_valid_token_for_an_existing_user(client, signup):
+    headers = signup("auth")
+    assert client.get("/users/me/profile", headers=headers).status_code == 200
+    # Served from the token cache the second time
+    assert client.get("/users/me/profile", headers=headers).status_code == 200
+
+    for token in ("not-a-jwt", create_access_token(999999)):
+        response = client.get("/users/me/profile", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid token"
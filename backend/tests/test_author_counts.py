@@ -0,0 +1,113 @@
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from backend.app.models import AuthorChapterNoteCount, AuthorNoteCount, AuthorVersionNoteCount, Note, User, Verse
+from backend.seeds.import_john_gill import delete_existing_author_notes_for_book
+
+
+def _counters(conn):
+    def nonzero(stmt):
+        return {tuple(row[:-1]): row[-1] for row in conn.execute(stmt) if row[-1]}
+
+    return (
+        nonzero(select(AuthorNoteCount.author_id, AuthorNoteCount.public_note_count)),
+        nonzero(
+            select(
+                AuthorVersionNoteCount.author_id,
+                AuthorVersionNoteCount.version_code,
+                AuthorVersionNoteCount.public_note_count,
+            )
+        ),
+        nonzero(
+            select(
+                AuthorChapterNoteCount.author_id,
+                AuthorChapterNoteCount.version_code,
+                AuthorChapterNoteCount.book,
+                AuthorChapterNoteCount.chapter,
+                AuthorChapterNoteCount.public_note_count,
+            )
+        ),
+    )
+
+
+def _brute_force(conn):
+    public = Note.is_public.is_(True)
+    by_chapter = (
+        select(Note.owner_id, Note.version_code, Verse.book, Verse.chapter, func.count())
+        .join(Verse, Verse.id == Note.start_verse_id)
+        .where(public)
+        .group_by(Note.owner_id, Note.version_code, Verse.book, Verse.chapter)
+    )
+    return (
+        {(row[0],): row[1] for row in conn.execute(select(Note.owner_id, func.count()).where(public).group_by(Note.owner_id))},
+        {
+            (row[0], row[1]): row[2]
+            for row in conn.execute(
+                select(Note.owner_id, Note.version_code, func.count()).where(public).group_by(Note.owner_id, Note.version_code)
+            )
+        },
+        {tuple(row[:-1]): row[-1] for row in conn.execute(by_chapter)},
+    )
+
+
+def assert_counters_match(db_engine):
+    with db_engine.connect() as conn:
+        assert _counters(conn) == _brute_force(conn)
+
+
+def test_counters_follow_note_writes(client, signup, verse_id, db_engine):
+    headers = signup("counted")
+
+    def create(book, chapter, verse, is_public=True, version_code="KJV"):
+        start = verse_id(book, chapter, verse, version_code)
+        response = client.post(
+            "/notes",
+            json={
+                "content_markdown": f"On {book} {chapter}:{verse}",
+                "version_code": version_code,
+                "start_verse_id": start,
+                "end_verse_id": start,
+                "is_public": is_public,
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    first = create("John", 1, 1)
+    second = create("John", 1, 2)
+    create("Romans", 2, 1, version_code="ESV")
+    hidden = create("Genesis", 3, 4, is_public=False)
+    assert_counters_match(db_engine)
+
+    assert client.put(f"/notes/{first}", json={"content_markdown": "Edited"}, headers=headers).status_code == 200
+    assert_counters_match(db_engine)
+
+    # Privatize and publish
+    assert client.put(f"/notes/{second}", json={"is_public": False}, headers=headers).status_code == 200
+    assert client.put(f"/notes/{hidden}", json={"is_public": True}, headers=headers).status_code == 200
+    assert_counters_match(db_engine)
+
+    assert client.delete(f"/notes/{first}", headers=headers).status_code == 204
+    assert client.delete(f"/notes/{second}", headers=headers).status_code == 204
+    assert_counters_match(db_engine)
+
+
+def test_seed_clear_keeps_counters_current(client, signup, verse_id, db_engine):
+    headers = signup("commentator")
+    for verse in range(1, 6):
+        start = verse_id("Genesis", 5, verse)
+        response = client.post(
+            "/notes",
+            json={"content_markdown": "Comment", "version_code": "KJV", "start_verse_id": start, "end_verse_id": start, "is_public": True},
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+
+    with Session(db_engine) as session:
+        author_id = session.scalars(select(User.id).where(User.email == "commentator@example.com")).one()
+        assert delete_existing_author_notes_for_book(session, author_id, "KJV", "Genesis") == 5
+
+    assert_counters_match(db_engine)
+    authors = client.get("/notes/authors/public").json()["authors"]
+    assert author_id not in {author["author_id"] for author in authors}
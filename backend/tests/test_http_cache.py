@@ -0,0 +1,65 @@
+from backend.app.utils.http_cache import chapter_generations
+
+
+def _revalidate(client, path, etag, **headers):
+    return client.get(path, headers={"If-None-Match": etag, **headers})
+
+
+def test_chapter_etag_follows_note_writes(client, signup, verse_id):
+    headers = signup("etag")
+    etag = client.get("/bible/KJV/John/4").headers["etag"]
+    assert _revalidate(client, "/bible/KJV/John/4", etag).status_code == 304
+
+    response = client.post(
+        "/notes",
+        json={
+            "content_markdown": "See (John 4:14)",
+            "version_code": "KJV",
+            "start_verse_id": verse_id("Genesis", 1, 3),
+            "end_verse_id": verse_id("Genesis", 1, 3),
+            "is_public": True,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    fresh = _revalidate(client, "/bible/KJV/John/4", etag)
+    assert fresh.status_code == 200
+    assert fresh.json()["verses"][13]["backlinks"]
+
+
+def test_chapter_etag_follows_writes_of_other_processes(client, db_engine):
+    etag = client.get("/bible/KJV/Romans/2").headers["etag"]
+    parallel_etag = client.get("/bible/parallel", params={"versions": "KJV,ESV", "book": "Romans", "chapter": 2}).headers[
+        "etag"
+    ]
+
+    # Another worker commits a note touching Romans 2: only the database knows
+    with db_engine.begin() as conn:
+        chapter_generations.bump_canonical(conn, ["Romans|2|5"])
+
+    assert _revalidate(client, "/bible/KJV/Romans/2", etag).status_code == 200
+    assert (
+        client.get(
+            "/bible/parallel",
+            params={"versions": "KJV,ESV", "book": "Romans", "chapter": 2},
+            headers={"If-None-Match": parallel_etag},
+        ).status_code
+        == 200
+    )
+
+
+def test_not_modified_repeats_the_compressed_validator(client):
+    compressed = client.get("/bible/KJV/John/5", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    weak = compressed.headers["etag"]
+    assert weak.startswith("W/")
+
+    not_modified = _revalidate(client, "/bible/KJV/John/5", weak, **{"Accept-Encoding": "gzip"})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == weak
+    assert "Accept-Encoding" in not_modified.headers["vary"]
+
+    identity = client.get("/bible/KJV/John/5", headers={"Accept-Encoding": "identity"})
+    strong = identity.headers["etag"]
+    assert strong == weak.removeprefix("W/")
+    assert _revalidate(client, "/bible/KJV/John/5", strong, **{"Accept-Encoding": "identity"}).headers["etag"] == strong
@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from backend.app.jobs import JobRunner, _handlers, enqueue, job_handler, job_runner
+from backend.app.models import Job
+
+
+@pytest.fixture
+def runner(db_engine):
+    # Leave only the test's job due
+    job_runner.run_pending()
+    runner = JobRunner(db_engine, workers=0, poll_interval=0.1, retry_delay=0, lease_seconds=1)
+    yield runner
+    _handlers.pop("test_slow", None)
+
+
+def _job(db_engine, job_id):
+    with db_engine.connect() as conn:
+        return conn.execute(select(Job.__table__).where(Job.id == job_id)).one()
+
+
+def test_running_job_keeps_its_lease(runner, db_engine):
+    observed = {}
+
+    @job_handler("test_slow")
+    def slow(ctx, payload):
+        started = _job(db_engine, ctx.job_id).updated_at
+        time.sleep(2)
+        # Another worker looking for lost jobs must leave this one alone
+        with db_engine.begin() as conn:
+            JobRunner(db_engine, 0, 0.1, 0, lease_seconds=1)._reclaim_expired(conn, datetime.utcnow())
+        job = _job(db_engine, ctx.job_id)
+        observed.update(status=job.status, refreshed=job.updated_at > started)
+
+    with db_engine.begin() as conn:
+        job_id = enqueue(conn, "test_slow")
+    assert runner.run_one()
+
+    assert observed == {"status": "running", "refreshed": True}
+    assert _job(db_engine, job_id).status == "succeeded"
+
+
+def test_stale_attempt_cannot_finish_the_job(runner, db_engine):
+    with db_engine.begin() as conn:
+        job_id = enqueue(conn, "test_slow")
+    stale = runner._claim()
+    assert stale.id == job_id
+
+    # The lease ran out: the job was requeued and claimed again elsewhere
+    with db_engine.begin() as conn:
+        conn.execute(
+            update(Job).where(Job.id == job_id).values(updated_at=datetime.utcnow() - timedelta(seconds=5))
+        )
+        runner._last_reclaim = 0.0
+        runner._reclaim_expired(conn, datetime.utcnow())
+    current = runner._claim()
+    assert current.attempts == stale.attempts + 1
+
+    runner._finish(stale, {"status": "failed", "error": "late", "finished_at": datetime.utcnow()})
+    job = _job(db_engine, job_id)
+    assert (job.status, job.error) == ("running", "Worker lost; requeued")
+
+    runner._finish(current, {"status": "succeeded", "error": None, "finished_at": datetime.utcnow()})
+    assert _job(db_engine, job_id).status == "succeeded"
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from backend.app.metrics import PoolMetrics
+
+
+@pytest.fixture
+def small_engine(tmp_path):
+    db_engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    yield db_engine
+    db_engine.dispose()
+
+
+def test_pool_metrics_survive_dispose(small_engine):
+    metrics = PoolMetrics()
+    metrics.instrument("primary", small_engine)
+    metrics.instrument("primary", small_engine)
+    with small_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    small_engine.dispose()
+    with small_engine.begin() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert metrics.checkouts["primary"] == 2
+    assert metrics.waits["primary"].total == 2
+    assert metrics.pools() == [("primary", small_engine.pool)]
+
+
+def test_pool_metrics_count_timeouts_and_shared_pools(small_engine):
+    metrics = PoolMetrics()
+    metrics.instrument("primary", small_engine)
+    readonly = small_engine.execution_options(isolation_level="AUTOCOMMIT")
+    metrics.instrument("read", readonly)
+
+    with small_engine.connect():
+        with pytest.raises(SQLAlchemyTimeoutError):
+            readonly.connect()
+    with readonly.connect():
+        pass
+
+    assert [name for name, _ in metrics.pools()] == ["primary"]
+    assert metrics.timeouts["primary"] == 1
+    assert metrics.checkouts["primary"] == 2
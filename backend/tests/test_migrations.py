@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+
+from backend.app.utils.fulltext import install_search_indexes
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "migrations"
+
+
+def test_migrations_match_the_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    # No ini file, so alembic leaves the test run's logging configuration alone
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+    # Search structures outside the models (FTS5 shadow tables) must not count as drift
+    db_engine = create_engine(url)
+    install_search_indexes(db_engine)
+    db_engine.dispose()
+    command.check(config)
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.app.jobs import job_runner
+from backend.app.models import Note
+from backend.app.utils.note_transfer import note_importer
+
+
+@pytest.fixture
+def importer(monkeypatch):
+    """The app's importer rendering in-process, in chunks of two lines, retrying failures at once."""
+    job_runner.run_pending()
+    monkeypatch.setattr(note_importer, "render_workers", 0)
+    monkeypatch.setattr(note_importer, "chunk_size", 2)
+    monkeypatch.setattr(job_runner, "retry_delay", 0)
+    return note_importer
+
+
+def _record(chapter, verse, content, **fields):
+    record = {"content_markdown": content, "version_code": "KJV", "book": "John", "start_chapter": chapter, "start_verse": verse}
+    return json.dumps({**record, **fields})
+
+
+def _import(client, headers, lines):
+    response = client.post("/notes/import", content="\n".join(lines) + "\n", headers=headers)
+    assert response.status_code == 202, response.text
+    job_runner.run_pending()
+    return client.get(f"/notes/import/{response.json()['id']}", headers=headers).json()
+
+
+def _export(client, headers):
+    response = client.get("/notes/export", headers=headers)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_then_import_round_trips(client, signup, verse_id, importer):
+    author, reader = signup("exporter"), signup("importer")
+    for start, end, fields in [
+        (("John", 1, 1), ("John", 1, 3), {"title": "Word", "tags": "logos,creation", "is_public": True}),
+        (("John", 2, 19), ("John", 3, 2), {"content_markdown": "Temple; see (Romans 1:4)", "is_public": False}),
+    ]:
+        response = client.post(
+            "/notes",
+            json={
+                "content_markdown": "In the beginning",
+                "version_code": "KJV",
+                "start_verse_id": verse_id(*start),
+                "end_verse_id": verse_id(*end),
+                **fields,
+            },
+            headers=author,
+        )
+        assert response.status_code == 201, response.text
+    exported = _export(client, author)
+
+    job = _import(client, reader, [json.dumps(record) for record in exported])
+    assert (job["status"], job["imported"], job["skipped"], job["errors"]) == ("succeeded", 2, 0, [])
+
+    # Everything but the new ids, timestamps included
+    assert [{**record, "id": None} for record in _export(client, reader)] == [{**record, "id": None} for record in exported]
+
+
+def test_rejected_lines_are_reported(client, signup, importer):
+    headers = signup("rejected")
+    job = _import(
+        client,
+        headers,
+        [
+            _record(4, 1, "Fine"),
+            "{not json",
+            "",
+            _record(4, 2, "No version", version_code="XXX"),
+            _record(4, 9, "Backwards", end_chapter=4, end_verse=3),
+            json.dumps({"version_code": "KJV"}),
+            _record(4, 3, "Also fine"),
+        ],
+    )
+    assert (job["status"], job["imported"], job["skipped"], job["lines_read"]) == ("succeeded", 2, 4, 6)
+    errors = {error["line"]: error["detail"] for error in job["errors"]}
+    assert sorted(errors) == [2, 4, 5, 6]
+    assert errors[4] == "Unknown verse John 4:2 in XXX"
+    assert errors[5] == "Start verse must be before end verse"
+    assert errors[6].startswith("content_markdown:")
+
+
+def test_retry_resumes_after_the_last_committed_chunk(client, signup, db_engine, importer, monkeypatch):
+    headers = signup("resumed")
+    calls = []
+    import_chunk = importer._import_chunk
+
+    def flaky_chunk(ctx, progress, batch, last_line):
+        calls.append((ctx.attempt, last_line))
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        import_chunk(ctx, progress, batch, last_line)
+
+    monkeypatch.setattr(importer, "_import_chunk", flaky_chunk)
+    job = _import(
+        client,
+        headers,
+        [
+            _record(5, 1, "Resumed one"),
+            "{not json",
+            _record(5, 3, "Resumed three"),
+            # The chunk ending here fails on the first attempt, after the first chunk committed
+            _record(5, 4, "Resumed four"),
+            _record(99, 1, "Resumed missing"),
+            _record(5, 6, "Resumed six"),
+        ],
+    )
+    # Lines 1-3 are not read again: the retry starts with the chunk that failed
+    assert calls == [(1, 3), (1, 5), (2, 5), (2, 6)]
+    assert (job["status"], job["attempts"]) == ("succeeded", 2)
+    assert (job["imported"], job["skipped"], job["lines_read"]) == (4, 2, 6)
+    assert [error["line"] for error in job["errors"]] == [2, 5]
+
+    with db_engine.connect() as conn:
+        counts = dict(
+            conn.execute(
+                select(Note.content_markdown, func.count())
+                .where(Note.content_markdown.like("Resumed %"))
+                .group_by(Note.content_markdown)
+            ).all()
+        )
+    assert counts == {"Resumed one": 1, "Resumed three": 1, "Resumed four": 1, "Resumed six": 1}
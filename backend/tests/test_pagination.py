@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from backend.app.models import Note
+from backend.app.utils.pagination import _pack, encode_cursor, encode_name_cursor
+
+
+@pytest.fixture(scope="module")
+def paged_notes(client, signup, verse_id, db_engine):
+    """Seven notes of one author; four share an updated_at, as rows written in one batch do."""
+    headers = signup("pager")
+    ids = []
+    for verse in range(1, 8):
+        response = client.post(
+            "/notes",
+            json={
+                "content_markdown": "Pilgrim zephyrine notes",
+                "version_code": "KJV",
+                "start_verse_id": verse_id("Romans", 4, verse),
+                "end_verse_id": verse_id("Romans", 4, verse),
+                "is_public": True,
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+
+    tied = datetime(2026, 1, 1, 12, 0, 0)
+    updated = {ids[0]: datetime(2026, 1, 2), ids[5]: datetime(2025, 12, 31), ids[6]: datetime(2026, 1, 3)}
+    with db_engine.begin() as conn:
+        for note_id in ids:
+            conn.execute(update(Note).where(Note.id == note_id).values(updated_at=updated.get(note_id, tied)))
+    newest_first = sorted(ids, key=lambda note_id: (updated.get(note_id, tied), note_id), reverse=True)
+    return headers, newest_first
+
+
+def _page_through(client, path, params, headers, items, key):
+    """Ids in order across every page of a listing, and how many pages it took."""
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        seen += [item[key] for item in body[items]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.parametrize("limit, pages", [(1, 7), (3, 3), (7, 1), (50, 1)])
+def test_my_notes_page_to_the_end(client, paged_notes, limit, pages):
+    headers, newest_first = paged_notes
+    seen, page_count = _page_through(client, "/notes/me", {"limit": limit}, headers, "notes", "id")
+    # Ties on updated_at are broken by id: nothing repeated, nothing skipped
+    assert seen == newest_first
+    assert page_count == pages
+    assert client.get("/notes/me", params={"limit": 1}, headers=headers).json()["total"] == len(newest_first)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 7])
+def test_search_pages_to_the_end(client, paged_notes, limit):
+    headers, newest_first = paged_notes
+    # Identical bodies score the same, so every page boundary falls inside a tie
+    seen, _ = _page_through(client, "/notes/search", {"q": "zephyrine", "limit": limit}, headers, "hits", "note_id")
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(newest_first)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        _pack("yesterday", 1),
+        _pack(datetime(2026, 1, 1).isoformat(), "x"),
+        # A cursor of another listing
+        encode_name_cursor("pilgrim", 3),
+    ],
+)
+def test_bad_cursor_is_rejected(client, paged_notes, cursor):
+    headers, _ = paged_notes
+    response = client.get("/notes/me", params={"cursor": cursor}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_timestamp_cursor_is_rejected_by_search(client, paged_notes):
+    headers, _ = paged_notes
+    cursor = encode_cursor(datetime(2026, 1, 1), 5)
+    response = client.get("/notes/search", params={"q": "zephyrine", "cursor": cursor}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+from sqlmodel import Session
+
+from backend.app.models import BibleVersion, Verse
+
+
+@pytest.fixture(scope="module")
+def reseeded_version(db_engine):
+    # Chapters seeded out of order, as after re-seeding or patching part of a book
+    positions = [(chapter, verse) for chapter in (1, 2, 3) for verse in range(1, 11)]
+    random.Random(7).shuffle(positions)
+    with Session(db_engine) as session:
+        session.add(BibleVersion(code="RSD", name="Reseeded", language="English"))
+        for chapter, verse in positions:
+            session.add(
+                Verse(
+                    version_code="RSD",
+                    book="Romans",
+                    chapter=chapter,
+                    verse=verse,
+                    canonical_id=f"Romans|{chapter}|{verse}",
+                    text=f"Romans {chapter}:{verse}",
+                )
+            )
+        session.commit()
+    return "RSD"
+
+
+def _positions(verses):
+    return [(verse["chapter"], verse["verse"]) for verse in verses]
+
+
+def test_passage_does_not_depend_on_seed_order(client, reseeded_version):
+    response = client.get(f"/bible/{reseeded_version}/passage", params={"ref": "Romans 1:9-3:2"})
+    assert response.status_code == 200, response.text
+    expected = [(1, 9), (1, 10)] + [(2, verse) for verse in range(1, 11)] + [(3, 1), (3, 2)]
+    assert _positions(response.json()["passages"][0]["verses"]) == expected
+
+    # Chapter 2 was read in full and cached; the chapter endpoint serves it whole
+    chapter = client.get(f"/bible/{reseeded_version}/Romans/2").json()
+    assert _positions(chapter["verses"]) == [(2, verse) for verse in range(1, 11)]
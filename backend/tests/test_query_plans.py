@@ -0,0 +1,202 @@
+"""Regression test: every query issued by the API endpoints is served by an index.
+
+Calls each endpoint through the ASGI app while recording the SQL it runs and
+checks ``EXPLAIN QUERY PLAN`` for every statement. A plan step that scans a
+table without an index (``SCAN note`` rather than ``SEARCH note USING INDEX ...``)
+is a failure, except on the small lookup tables listed in ``SMALL_TABLES`` and
+the intentional full scans listed in ``ALLOWED_SCANS``. The test database is
+built by ``init_db``; ``test_migrations`` checks the migrations create the same
+indexes. ``backend/benchmarks/check_query_plans.py`` runs this test with the
+plans logged.
+"""
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from backend.app.database import engine, read_engine
+from backend.app.models import ManuscriptBookCoverage, ManuscriptEdition, ManuscriptVerse
+from backend.app.utils.chapter_cache import chapter_cache
+
+logger = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="reads SQLite query plans")
+
+# Lookup tables with a handful of rows; scanning them is cheaper than an index probe
+SMALL_TABLES = {"bibleversion", "manuscriptedition"}
+
+# (endpoint label, table) pairs whose scan is inherent to the endpoint
+ALLOWED_SCANS = {
+    # The LIKE fallback deliberately scans every verse of the version when the prefilter finds nothing
+    ("GET /bible/{version}/concordance (fallback)", "verse"),
+    # The reference graph loads every note when the graph generation moved, then serves from memory
+    ("GET /notes/graph/{book}/{chapter}", "note"),
+    # Filters other than version or version+chapter sum the per-chapter counters of the book first
+    ("GET /notes/authors/public (book)", "author_counts"),
+}
+
+_SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+Plan = List[Tuple[str, List[str]]]
+EndpointCall = Tuple[str, str, str, Optional[dict], Optional[dict]]
+
+
+def bare_scans(plan_rows: List[str]) -> List[str]:
+    """Tables read by a full table scan (no index at all) in an EXPLAIN QUERY PLAN."""
+    tables = []
+    for detail in plan_rows:
+        match = _SCAN_RE.match(detail.strip())
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+class QueryRecorder:
+    """Collects SELECT statements executed on the app's engines while active."""
+
+    def __init__(self) -> None:
+        self.statements: List[Tuple[str, tuple]] = []
+        self.active = False
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.active and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, tuple(parameters or ())))
+
+    def take(self) -> List[Tuple[str, tuple]]:
+        statements, self.statements = self.statements, []
+        return statements
+
+
+def explain(db_engine, statements: List[Tuple[str, tuple]]) -> Plan:
+    plans: Plan = []
+    with db_engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+@pytest.fixture(scope="module")
+def manuscript_edition(db_engine):
+    with Session(db_engine) as session:
+        session.add(ManuscriptEdition(code="WH", name="Westcott-Hort", language="Greek", scope="NT"))
+        session.add(ManuscriptBookCoverage(edition_code="WH", book="John"))
+        for verse in range(1, 11):
+            session.add(
+                ManuscriptVerse(
+                    edition_code="WH", book="John", chapter=1, verse=verse, canonical_id=f"John|1|{verse}", text="logos"
+                )
+            )
+        session.commit()
+    return "WH"
+
+
+def endpoint_calls(client, signup, verse_id) -> List[EndpointCall]:
+    """(label, method, path, json body, headers) for each endpoint, after creating users and notes."""
+    alice, bob = signup("alice"), signup("bob")
+    alice_id = client.get("/auth/me", headers=alice).json()["id"]
+    bob_id = client.get("/auth/me", headers=bob).json()["id"]
+    note = {
+        "content_markdown": "See (John 1:1) and (Romans 1:2)",
+        "version_code": "KJV",
+        "start_verse_id": verse_id("Genesis", 1, 1),
+        "end_verse_id": verse_id("Genesis", 1, 3),
+        "is_public": True,
+    }
+    note_id = client.post("/notes", json=note, headers=alice).json()["id"]
+    client.post(f"/notes/subscriptions/{alice_id}", headers=bob)
+    return [
+        ("POST /auth/login", "POST", "/auth/login", {"email": "alice@example.com", "password": "password123"}, None),
+        ("GET /auth/me", "GET", "/auth/me", None, alice),
+        ("GET /bible/versions", "GET", "/bible/versions", None, None),
+        ("GET /bible/{version}/{book}/{chapter}", "GET", "/bible/KJV/Romans/1", None, alice),
+        ("GET /bible/parallel", "GET", "/bible/parallel?versions=KJV,ESV&book=John&chapter=1&editions=WH", None, None),
+        ("GET /bible/{version}/passage", "GET", "/bible/KJV/passage?ref=John 1:2-2:3", None, None),
+        ("GET /bible/{version}/concordance", "GET", "/bible/KJV/concordance?q=grace", None, None),
+        ("GET /bible/{version}/concordance (fallback)", "GET", "/bible/KJV/concordance?q=zzz", None, None),
+        ("GET /notes/me", "GET", "/notes/me", None, alice),
+        ("GET /notes/export", "GET", "/notes/export", None, alice),
+        ("GET /notes/search", "GET", "/notes/search?q=romans", None, alice),
+        ("GET /notes/search (filtered)", "GET", f"/notes/search?q=romans&book=Genesis&author_id={alice_id}", None, None),
+        ("GET /notes/graph/{book}/{chapter}", "GET", "/notes/graph/Genesis/1", None, alice),
+        ("GET /notes/{version}/{book}/{chapter}", "GET", "/notes/KJV/Genesis/1", None, alice),
+        ("GET /notes/authors/public", "GET", "/notes/authors/public", None, None),
+        ("GET /notes/authors/public (name)", "GET", "/notes/authors/public?query=ali", None, None),
+        ("GET /notes/authors/public (version)", "GET", "/notes/authors/public?version_code=KJV", None, None),
+        (
+            "GET /notes/authors/public (chapter)",
+            "GET",
+            "/notes/authors/public?version_code=KJV&book=Genesis&chapter=1",
+            None,
+            None,
+        ),
+        ("GET /notes/authors/public (book)", "GET", "/notes/authors/public?book=Genesis&query=ali", None, None),
+        ("GET /notes/authors/{id}", "GET", f"/notes/authors/{alice_id}", None, None),
+        ("GET /notes/subscriptions", "GET", "/notes/subscriptions", None, bob),
+        ("GET /notes/subscriptions/notes", "GET", "/notes/subscriptions/notes", None, bob),
+        ("GET /notes/backlinks/...", "GET", "/notes/backlinks/KJV/John/1/1", None, None),
+        ("PUT /notes/{id}", "PUT", f"/notes/{note_id}", {"content_markdown": "Now (John 1:3)"}, alice),
+        ("POST /notes", "POST", "/notes", note, alice),
+        ("DELETE /notes/{id}", "DELETE", f"/notes/{note_id}", None, alice),
+        ("GET /users/me/profile", "GET", "/users/me/profile", None, alice),
+        ("GET /users/search", "GET", "/users/search?query=bo", None, None),
+        ("GET /users/{id}/subscriptions", "GET", f"/users/{bob_id}/subscriptions", None, None),
+        ("GET /manuscripts/editions", "GET", "/manuscripts/editions", None, None),
+        ("GET /manuscripts/available/{book}/{chapter}", "GET", "/manuscripts/available/John/1", None, None),
+        ("GET /manuscripts/{edition}/{book}/{chapter}", "GET", "/manuscripts/WH/John/1", None, None),
+    ]
+
+
+def unindexed_scans(client, db_engine, calls: List[EndpointCall]) -> Dict[str, List[str]]:
+    """Endpoint label -> tables its queries scan without an index, logging each endpoint's plans."""
+    recorder = QueryRecorder()
+    engines = {engine, read_engine}
+    for app_engine in engines:
+        event.listen(app_engine, "before_cursor_execute", recorder.before_cursor_execute)
+    failures: Dict[str, List[str]] = {}
+    try:
+        for label, method, path, body, headers in calls:
+            recorder.take()
+            recorder.active = True
+            response = client.request(method, path, json=body, headers=headers)
+            recorder.active = False
+            plans = explain(db_engine, recorder.take())
+            scanned = sorted(
+                {
+                    table
+                    for _, rows in plans
+                    for table in bare_scans(rows)
+                    if table not in SMALL_TABLES and (label, table) not in ALLOWED_SCANS
+                }
+            )
+            logger.info(
+                "%-4s %-48s %3d  %2d queries %s",
+                "FAIL" if scanned else "ok",
+                label,
+                response.status_code,
+                len(plans),
+                f"full scan of {', '.join(scanned)}" if scanned else "",
+            )
+            for statement, rows in plans:
+                level = logging.INFO if scanned else logging.DEBUG
+                logger.log(level, "       %s", " ".join(statement.split())[:160])
+                for detail in rows:
+                    logger.log(level, "         -> %s", detail)
+            if scanned:
+                failures[label] = scanned
+    finally:
+        for app_engine in engines:
+            event.remove(app_engine, "before_cursor_execute", recorder.before_cursor_execute)
+    return failures
+
+
+def test_endpoint_queries_use_an_index(client, signup, verse_id, db_engine, manuscript_edition, monkeypatch):
+    # Chapter reads must reach the database for their queries to be checked
+    monkeypatch.setattr(chapter_cache, "max_entries", 0)
+    chapter_cache.clear()
+
+    calls = endpoint_calls(client, signup, verse_id)
+    assert unindexed_scans(client, db_engine, calls) == {}
@@ -0,0 +1,145 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.app import dependencies, rate_limit
+from backend.app.dependencies import get_current_user, get_db
+from backend.app.rate_limit import MemoryBackend, RateLimit, RateLimiter, SQLiteBackend, limit_per_user
+
+# 3 in a burst, then one a second
+BURST = RateLimit(name="burst", per_minute=60, capacity=3)
+# One, then one every ten minutes
+SLOW = RateLimit(name="slow", per_minute=0.1, capacity=1)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(tmp_path / "rate_limits.db")
+
+
+def test_burst_is_exhausted_then_refills(backend):
+    assert [backend.hit("k", BURST, 0.0)[0] for _ in range(3)] == [True, True, True]
+    assert backend.hit("k", BURST, 0.0) == (False, 1.0)
+    assert backend.hit("k", BURST, 0.5) == (False, pytest.approx(0.5))
+    assert backend.hit("k", BURST, 1.0) == (True, 0.0)
+    assert backend.hit("k", BURST, 1.0)[0] is False
+    # Idle long enough to refill completely, but never past capacity
+    assert [backend.hit("k", BURST, 60.0)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_keys_have_separate_buckets(backend):
+    assert backend.hit("a", SLOW, 0.0)[0]
+    assert not backend.hit("a", SLOW, 0.0)[0]
+    assert backend.hit("b", SLOW, 0.0)[0]
+
+
+def test_refused_request_gets_retry_after():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBackend(), clock=clock)
+    asyncio.run(limiter.check("k", SLOW))
+    with pytest.raises(HTTPException) as refused:
+        asyncio.run(limiter.check("k", SLOW))
+    assert refused.value.status_code == 429
+    assert refused.value.headers["Retry-After"] == "600"
+    assert limiter.rejected == 1
+
+    # Rounded up, and never below a second
+    clock.now += 599.5
+    with pytest.raises(HTTPException) as refused:
+        asyncio.run(limiter.check("k", SLOW))
+    assert refused.value.headers["Retry-After"] == "1"
+    clock.now += 0.5
+    asyncio.run(limiter.check("k", SLOW))
+
+
+def test_memory_backend_evicts_only_refilled_keys():
+    backend = MemoryBackend()
+    backend.hit("slow", SLOW, 0.0)
+    backend.hit("fast", BURST, 1.0)
+    # "fast" is full again at 2s, "slow" only at 600s; "slow" is oldest and still limited
+    backend.hit("other", BURST, 10.0)
+    assert len(backend) == 3
+    assert backend.hit("slow", SLOW, 10.0)[0] is False
+
+    # Once "slow" has refilled, the idle keys ahead of the newest one go
+    backend.hit("other", BURST, 700.0)
+    assert len(backend) == 1
+    assert backend.hit("slow", SLOW, 700.0)[0] is True
+
+
+def test_memory_backend_bounds_its_keys():
+    backend = MemoryBackend(max_keys=2)
+    for index in range(5):
+        backend.hit(f"k{index}", SLOW, 0.0)
+    assert len(backend) == 2
+
+
+def test_sqlite_backend_purges_refilled_buckets(tmp_path):
+    backend = SQLiteBackend(tmp_path / "rate_limits.db")
+    backend.hit("slow", SLOW, 0.0)
+    for index in range(998):
+        backend.hit(f"k{index}", BURST, 0.0)
+    # The 1000th hit purges the buckets that were full again by then
+    backend.hit("last", BURST, 10.0)
+    keys = {row[0] for row in backend._conn.execute("SELECT key FROM rate_limit_bucket")}
+    assert keys == {"slow", "last"}
+    assert backend.hit("slow", SLOW, 10.0)[0] is False
+
+
+@pytest.fixture
+def opened_sessions(monkeypatch):
+    """Records each database session the request dependencies open."""
+    opened = []
+    original = dependencies.get_session
+
+    @contextmanager
+    def get_session():
+        opened.append(1)
+        with original() as session:
+            yield session
+
+    monkeypatch.setattr(dependencies, "get_session", get_session)
+    return opened
+
+
+def test_refused_request_never_opens_a_session(db_engine, signup, opened_sessions, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "limiter", RateLimiter(MemoryBackend(), clock=clock))
+
+    app = FastAPI()
+
+    @app.post("/write", dependencies=[Depends(limit_per_user(SLOW))])
+    def write(session=Depends(get_db), user=Depends(get_current_user)) -> dict:
+        return {"user_id": user.id}
+
+    headers = signup("limited")
+    opened_sessions.clear()
+    with TestClient(app) as client:
+        assert client.post("/write", headers=headers).status_code == 200
+        assert len(opened_sessions) == 1
+
+        refused = client.post("/write", headers=headers)
+        assert refused.status_code == 429
+        assert refused.headers["retry-after"] == "600"
+        assert len(opened_sessions) == 1
+
+        # Anonymous callers are limited per IP, separately from the user
+        assert client.post("/write").status_code == 401
+        assert client.post("/write").status_code == 429
+        assert len(opened_sessions) == 2
+
+        clock.now += 600
+        assert client.post("/write", headers=headers).status_code == 200
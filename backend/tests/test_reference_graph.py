@@ -0,0 +1,189 @@
+import json
+
+import pytest
+
+
+def _graph_ids(client, book, chapter, **params):
+    response = client.get(f"/notes/graph/{book}/{chapter}", params=params)
+    assert response.status_code == 200, response.text
+    return {node["id"] for node in response.json()["nodes"]}, response.json()["edges"]
+
+
+def test_range_note_reached_from_middle_verse(client, signup, verse_id):
+    headers = signup("grace")
+    response = client.post(
+        "/notes",
+        json={
+            "content_markdown": "Compare (Romans 5:8)",
+            "version_code": "KJV",
+            "start_verse_id": verse_id("John", 3, 16),
+            "end_verse_id": verse_id("John", 3, 18),
+            "is_public": True,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    note_id = response.json()["id"]
+
+    for verse in (16, 17, 18):
+        ids, edges = _graph_ids(client, "John", 3, verse=verse, depth=2)
+        assert f"note:{note_id}" in ids, verse
+        assert "verse:Romans|5|8" in ids
+        assert {
+            "source": f"note:{note_id}",
+            "target": f"verse:John|3|{verse}",
+            "kind": "anchors",
+        } in edges
+
+    ids, _ = _graph_ids(client, "John", 3, verse=19, depth=2)
+    assert f"note:{note_id}" not in ids
+
+
+def test_cross_chapter_range_note_reached_from_later_chapter(client, signup, verse_id):
+    headers = signup("grace")
+    response = client.post(
+        "/notes",
+        json={
+            "content_markdown": "Across chapters",
+            "version_code": "KJV",
+            "start_verse_id": verse_id("Genesis", 2, 18),
+            "end_verse_id": verse_id("Genesis", 4, 2),
+            "is_public": True,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    note_id = response.json()["id"]
+
+    assert f"note:{note_id}" in _graph_ids(client, "Genesis", 3, verse=10, depth=1)[0]
+    assert f"note:{note_id}" in _graph_ids(client, "Genesis", 3, depth=1)[0]
+    assert f"note:{note_id}" in _graph_ids(client, "Genesis", 4, verse=2, depth=1)[0]
+    assert f"note:{note_id}" not in _graph_ids(client, "Genesis", 4, verse=3, depth=1)[0]
+
+    client.delete(f"/notes/{note_id}", headers=headers)
+    assert f"note:{note_id}" not in _graph_ids(client, "Genesis", 3, depth=1)[0]
+
+
+def test_graph_follows_writes_of_other_workers(client, signup, verse_id, monkeypatch):
+    from backend.app.routers import notes
+    from backend.app.utils.reference_graph import ReferenceGraph
+
+    headers = signup("grace")
+
+    def create(verse):
+        response = client.post(
+            "/notes",
+            json={
+                "content_markdown": "See (Romans 1:1)",
+                "version_code": "KJV",
+                "start_verse_id": verse_id("John", 2, verse),
+                "end_verse_id": verse_id("John", 2, verse),
+                "is_public": True,
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+        return f"note:{response.json()['id']}"
+
+    published = create(5)
+    assert published in _graph_ids(client, "John", 2, depth=1)[0]
+
+    # Another worker process has its own graph; only the database connects them
+    with monkeypatch.context() as other_worker:
+        other_worker.setattr(notes, "reference_graph", ReferenceGraph())
+        note_id = published.split(":")[1]
+        assert client.put(f"/notes/{note_id}", json={"is_public": False}, headers=headers).status_code == 200
+        created = create(6)
+
+    ids = _graph_ids(client, "John", 2, depth=1)[0]
+    assert published not in ids
+    assert created in ids
+
+
+@pytest.fixture
+def separate_job_runner(monkeypatch):
+    """Jobs run as by ``seeds/run_jobs.py``: in a process with its own reference graph."""
+    from backend.app.jobs import job_runner
+    from backend.app.utils import note_processing, note_transfer
+    from backend.app.utils.reference_graph import ReferenceGraph
+
+    job_runner.run_pending()
+    worker_graph = ReferenceGraph()
+    monkeypatch.setattr(note_processing, "reference_graph", worker_graph)
+    monkeypatch.setattr(note_transfer, "reference_graph", worker_graph)
+    monkeypatch.setattr(note_transfer.note_importer, "render_workers", 0)
+    return job_runner
+
+
+def test_graph_follows_deferred_processing_in_another_process(client, signup, verse_id, separate_job_runner, monkeypatch):
+    from backend.app.routers import notes
+
+    monkeypatch.setattr(notes.settings, "defer_note_processing", True)
+    response = client.post(
+        "/notes",
+        json={
+            "content_markdown": "Deferred (Romans 3:5)",
+            "version_code": "KJV",
+            "start_verse_id": verse_id("John", 5, 1),
+            "end_verse_id": verse_id("John", 5, 1),
+            "is_public": True,
+        },
+        headers=signup("grace"),
+    )
+    assert response.status_code == 201, response.text
+    note = f"note:{response.json()['id']}"
+    # Committed before its cross references were resolved
+    assert note not in _graph_ids(client, "Romans", 3, verse=5, depth=1)[0]
+
+    assert separate_job_runner.run_pending() == 1
+    assert note in _graph_ids(client, "Romans", 3, verse=5, depth=1)[0]
+
+
+def test_graph_follows_refresh_in_another_process(client, signup, verse_id, db_engine, separate_job_runner):
+    from sqlalchemy import update
+
+    from backend.app.jobs import enqueue
+    from backend.app.models import Note
+
+    response = client.post(
+        "/notes",
+        json={
+            "content_markdown": "Before (Romans 3:8)",
+            "version_code": "KJV",
+            "start_verse_id": verse_id("John", 5, 2),
+            "end_verse_id": verse_id("John", 5, 2),
+            "is_public": True,
+        },
+        headers=signup("grace"),
+    )
+    note = f"note:{response.json()['id']}"
+    assert note not in _graph_ids(client, "Romans", 3, verse=9, depth=1)[0]
+
+    # As after a change to the reference parser: stored links no longer match the text
+    with db_engine.begin() as conn:
+        conn.execute(update(Note).where(Note.id == response.json()["id"]).values(content_markdown="After (Romans 3:9)"))
+        enqueue(conn, "refresh_notes", {"version_code": "KJV"})
+    separate_job_runner.run_pending()
+
+    assert note in _graph_ids(client, "Romans", 3, verse=9, depth=1)[0]
+    assert note not in _graph_ids(client, "Romans", 3, verse=8, depth=1)[0]
+
+
+def test_graph_follows_imports_in_another_process(client, signup, separate_job_runner):
+    headers = signup("grace")
+    assert "verse:John|5|3" not in _graph_ids(client, "Romans", 3, verse=12, depth=2)[0]
+
+    record = {
+        "content_markdown": "Imported (Romans 3:12)",
+        "version_code": "KJV",
+        "book": "John",
+        "start_chapter": 5,
+        "start_verse": 3,
+        "is_public": True,
+    }
+    response = client.post("/notes/import", content=json.dumps(record) + "\n", headers=headers)
+    assert response.status_code == 202, response.text
+    separate_job_runner.run_pending()
+
+    # Romans 3:12 -> the imported note citing it -> its anchor
+    assert "verse:John|5|3" in _graph_ids(client, "Romans", 3, verse=12, depth=2)[0]
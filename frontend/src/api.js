@@ -46,6 +46,19 @@ async function request(path, options = {}) {
   return response.json();
 }
 
+// Note listings are keyset-paginated (?limit=&cursor=). Follows next_cursor and
+// concatenates `key` across pages, so callers keep receiving the whole list.
+async function requestAllPages(path, key = "notes") {
+  const separator = path.includes("?") ? "&" : "?";
+  let data = await request(`${path}${separator}limit=200`);
+  const items = [...(data[key] || [])];
+  while (data.next_cursor) {
+    data = await request(`${path}${separator}limit=200&cursor=${encodeURIComponent(data.next_cursor)}`);
+    items.push(...(data[key] || []));
+  }
+  return { ...data, [key]: items, next_cursor: null };
+}
+
 export const api = {
   fetchVersions() {
     return request("/bible/versions");
@@ -57,7 +70,7 @@ export const api = {
     return request(`/backlinks/${encodeURIComponent(version)}/${encodeURIComponent(book)}/${chapter}/${verse}`);
   },
   fetchNotes(version, book, chapter) {
-    return request(`/notes/${encodeURIComponent(version)}/${encodeURIComponent(book)}/${chapter}`);
+    return requestAllPages(`/notes/${encodeURIComponent(version)}/${encodeURIComponent(book)}/${chapter}`);
   },
   fetchPublicAuthors(params = {}) {
     const query = new URLSearchParams();
@@ -83,7 +96,7 @@ export const api = {
   },
   fetchAuthorNotes(authorId, tag) {
     const suffix = tag ? `?tag=${encodeURIComponent(tag)}` : "";
-    return request(`/notes/authors/${authorId}${suffix}`);
+    return requestAllPages(`/notes/authors/${authorId}${suffix}`);
   },
   fetchNoteSubscriptions() {
     return request("/notes/subscriptions");
@@ -101,7 +114,7 @@ export const api = {
   fetchUserSubscriptions(userId) {
     return request(`/users/${userId}/subscriptions`);
   },
-  fetchSubscribedNotes(params = {}) {
+  async fetchSubscribedNotes(params = {}) {
     const query = new URLSearchParams();
     if (params.version) {
       query.set("version_code", params.version);
@@ -113,7 +126,18 @@ export const api = {
       query.set("chapter", params.chapter);
     }
     const suffix = query.toString() ? `?${query.toString()}` : "";
-    return request(`/notes/subscriptions/notes${suffix}`);
+    const data = await requestAllPages(`/notes/subscriptions/notes${suffix}`, "authors");
+    // An author's notes can span pages; merge their groups back together
+    const byAuthor = new Map();
+    for (const group of data.authors) {
+      const existing = byAuthor.get(group.author_id);
+      if (existing) {
+        existing.notes.push(...group.notes);
+      } else {
+        byAuthor.set(group.author_id, { ...group, notes: [...group.notes] });
+      }
+    }
+    return { ...data, authors: [...byAuthor.values()] };
   },
   signup(payload) {
     return request("/auth/signup", {
@@ -161,7 +185,7 @@ export const api = {
     });
   },
   fetchMyNotes() {
-    return request("/notes/me");
+    return requestAllPages("/notes/me");
   },
   deleteNote(noteId) {
     return request(`/notes/${noteId}`, {
@@ -170,7 +194,7 @@ export const api = {
   },
   fetchMyProfile(tag) {
     const suffix = tag ? `?tag=${encodeURIComponent(tag)}` : "";
-    return request(`/users/me/profile${suffix}`);
+    return requestAllPages(`/users/me/profile${suffix}`);
   },
   searchUsers(query) {
     const term = query?.trim();